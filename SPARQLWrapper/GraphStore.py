@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+
+"""
+Client of the `SPARQL 1.1 Graph Store HTTP Protocol <https://www.w3.org/TR/sparql11-http-rdf-update/>`_, to read,
+replace, add to or delete whole graphs with plain HTTP requests, without going through SPARQL queries and updates.
+
+Uploads are streamed from files or generators, with the chunked transfer encoding when their size is not known,
+and downloads are returned as :class:`SPARQLWrapper.Wrapper.QueryResult` instances, which can be streamed with
+:meth:`SPARQLWrapper.Wrapper.QueryResult.stream`.
+
+.. versionadded:: 2.0.1
+"""
+
+import urllib.parse
+import urllib.request
+from typing import IO, Any, Iterable, Optional, Union
+
+from .Wrapper import CONSTRUCT, TURTLE, QueryResult, SPARQLWrapper, _ACCEPT_HEADERS
+
+NTRIPLES = "application/n-triples"
+"""media type of N-Triples, the **default** media type of the uploads."""
+
+GraphData = Union[bytes, str, IO[bytes], Iterable[Union[bytes, str]]]
+
+
+class GraphStore(object):
+    """
+    Client of a Graph Store HTTP Protocol service. The graphs are identified by their IRI (indirect graph
+    identification, with the ``graph`` query parameter); ``None`` stands for the default graph.
+
+    The HTTP settings of a :class:`SPARQLWrapper.Wrapper.SPARQLWrapper` are used for the requests: user agent,
+    authentication, custom HTTP headers and timeout, as well as the keep-alive support if enabled.
+
+    :ivar endpoint: the URL of the graph store service.
+    :vartype endpoint: string
+    :ivar sparql: the wrapper whose HTTP settings are used.
+    :vartype sparql: :class:`SPARQLWrapper.Wrapper.SPARQLWrapper`
+    """
+
+    def __init__(self, endpoint: str, sparql: Optional[SPARQLWrapper] = None) -> None:
+        """
+        :param endpoint: the URL of the graph store service.
+        :type endpoint: string
+        :param sparql: the wrapper whose HTTP settings are used. The **default** value is a new wrapper of
+          ``endpoint``.
+        :type sparql: :class:`SPARQLWrapper.Wrapper.SPARQLWrapper`
+        """
+        self.endpoint = endpoint
+        self.sparql = sparql if sparql is not None else SPARQLWrapper(endpoint)
+
+    def _graphURL(self, graph: Optional[str]) -> str:
+        """Internal method returning the URL of a graph (``None`` for the default graph)."""
+        query = "default" if graph is None else urllib.parse.urlencode({"graph": graph})
+        return self.endpoint + ("&" if "?" in self.endpoint else "?") + query
+
+    def _request(
+        self,
+        method: str,
+        graph: Optional[str],
+        data: Any = None,
+        contentType: Optional[str] = None,
+        accept: Optional[str] = None,
+    ) -> Any:
+        """Internal method sending a request about a graph, with the HTTP settings of :attr:`sparql`."""
+        request = urllib.request.Request(self._graphURL(graph), data=data, method=method)
+        if contentType is not None:
+            request.add_header("Content-Type", contentType)
+        if accept is not None:
+            request.add_header("Accept", accept)
+        self.sparql._addRequestHeaders(request, self.endpoint)
+        return self.sparql._urlopen(request)
+
+    def get(self, graph: Optional[str] = None, format: str = TURTLE) -> QueryResult:
+        """Download a graph. The response is not read: the returned result can be converted, or streamed with
+        :meth:`SPARQLWrapper.Wrapper.QueryResult.stream`.
+
+        :param graph: the IRI of the graph; ``None`` (the **default** value) for the default graph.
+        :type graph: string
+        :param format: the format requested: :data:`SPARQLWrapper.Wrapper.TURTLE` (the **default** value),
+          :data:`SPARQLWrapper.Wrapper.N3` (which includes N-Triples), :data:`SPARQLWrapper.Wrapper.RDFXML` or
+          :data:`SPARQLWrapper.Wrapper.JSONLD`.
+        :type format: string
+        :return: the graph.
+        :rtype: :class:`SPARQLWrapper.Wrapper.QueryResult`
+        :raises ValueError: if the format is not an RDF format.
+        """
+        accept = _ACCEPT_HEADERS.get((CONSTRUCT, format))
+        if accept is None:
+            valid_types = ", ".join(f for (queryType, f) in _ACCEPT_HEADERS if queryType == CONSTRUCT)
+            raise ValueError("Value should be one of {0}".format(valid_types))
+        return QueryResult((self._request("GET", graph, accept=accept), format))
+
+    def put(self, data: GraphData, graph: Optional[str] = None, contentType: str = NTRIPLES) -> int:
+        """Replace the content of a graph, creating it if needed.
+
+        :param data: the RDF document: bytes, a string, a binary file, or an iterable of bytes or strings (like a
+          generator), which is sent with the chunked transfer encoding.
+        :param graph: the IRI of the graph; ``None`` (the **default** value) for the default graph.
+        :type graph: string
+        :param contentType: the media type of ``data``. The **default** value is N-Triples.
+        :type contentType: string
+        :return: the HTTP status code of the response.
+        :rtype: int
+        """
+        return self._send("PUT", data, graph, contentType)
+
+    def post(self, data: GraphData, graph: Optional[str] = None, contentType: str = NTRIPLES) -> int:
+        """Add triples to a graph, creating it if needed.
+
+        :param data: the RDF document: bytes, a string, a binary file, or an iterable of bytes or strings (like a
+          generator), which is sent with the chunked transfer encoding.
+        :param graph: the IRI of the graph; ``None`` (the **default** value) for the default graph.
+        :type graph: string
+        :param contentType: the media type of ``data``. The **default** value is N-Triples.
+        :type contentType: string
+        :return: the HTTP status code of the response.
+        :rtype: int
+        """
+        return self._send("POST", data, graph, contentType)
+
+    def delete(self, graph: Optional[str] = None) -> int:
+        """Delete a graph.
+
+        :param graph: the IRI of the graph; ``None`` (the **default** value) for the default graph.
+        :type graph: string
+        :return: the HTTP status code of the response.
+        :rtype: int
+        """
+        return self._close(self._request("DELETE", graph))
+
+    def _send(self, method: str, data: GraphData, graph: Optional[str], contentType: str) -> int:
+        body: Any
+        if isinstance(data, str):
+            body = data.encode("utf-8")
+        elif isinstance(data, (bytes, bytearray, memoryview)) or hasattr(data, "read"):
+            body = data
+        else:
+            body = (chunk.encode("utf-8") if isinstance(chunk, str) else chunk for chunk in data)
+        return self._close(self._request(method, graph, body, contentType))
+
+    @staticmethod
+    def _close(response: Any) -> int:
+        """Internal method reading and closing a response (so that its connection can be reused); return its HTTP
+        status code."""
+        try:
+            response.read()
+        finally:
+            response.close()
+        return int(getattr(response, "status", None) or response.getcode())
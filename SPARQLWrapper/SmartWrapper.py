@@ -109,6 +109,10 @@ class Bindings(object):
     :vartype bindings: list
     :ivar askResult: by default, set to **False**; in case of an ASK query, the result of the query.
     :vartype askResult: bool
+    :ivar memory: the memory profile of the query result (see
+      :meth:`SPARQLWrapper.Wrapper.SPARQLWrapper.setMemoryProfiling`), with the ``convert`` step of the JSON results
+      and the ``bindings`` step of the creation of the :class:`Value` instances; ``None`` if it is not enabled.
+    :vartype memory: :class:`SPARQLWrapper.memory.MemoryProfile`
     """
 
     def __init__(self, retval: QueryResult):
@@ -116,28 +120,32 @@ class Bindings(object):
         :param retval: the query result.
         :type retval: :class:`QueryResult<SPARQLWrapper.Wrapper.QueryResult>`
         """
-        self.fullResult = retval._convertJSON()
-        self.head = self.fullResult["head"]
-        self.variables: Optional[List[str]] = None
-        try:
-            self.variables = self.fullResult["head"]["vars"]
-        except:
-            pass
-
-        self.bindings: List[Dict[str, Value]] = []
-        try:
-            for b in self.fullResult["results"]["bindings"]:
-                # This is a single binding. It is a dictionary per variable; each value is a dictionary again
-                # that has to be converted into a Value instance
-                newBind = {}
-                # type error: Item "None" of "Union[List[str], Any, None]" has no attribute "__iter__" (not iterable)
-                for key in self.variables:  # type: ignore [union-attr]
-                    if key in b:
-                        # there is a real binding for this key
-                        newBind[key] = Value(key, b[key])
-                self.bindings.append(newBind)
-        except:
-            pass
+        self.memory = retval.memory
+        with retval._memoryProfile():
+            with retval._memoryStep("convert"):
+                self.fullResult = retval._convertJSON()
+            self.head = self.fullResult["head"]
+            self.variables: Optional[List[str]] = None
+            try:
+                self.variables = self.fullResult["head"]["vars"]
+            except:
+                pass
+
+            self.bindings: List[Dict[str, Value]] = []
+            with retval._memoryStep("bindings"):
+                try:
+                    for b in self.fullResult["results"]["bindings"]:
+                        # This is a single binding. It is a dictionary per variable; each value is a dictionary
+                        # again that has to be converted into a Value instance
+                        newBind = {}
+                        # type error: Item "None" of "Union[List[str], Any, None]" has no attribute "__iter__"
+                        for key in self.variables:  # type: ignore [union-attr]
+                            if key in b:
+                                # there is a real binding for this key
+                                newBind[key] = Value(key, b[key])
+                        self.bindings.append(newBind)
+                except:
+                    pass
 
         self.askResult = False
         try:
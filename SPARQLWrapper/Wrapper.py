@@ -23,27 +23,54 @@
 """
 
 import base64
+import codecs
+import contextlib
+import io
+import itertools
 import json
 import re
+import time
 import urllib.error
 import urllib.parse
 import urllib.request
 import warnings
 from http.client import HTTPResponse
-from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple, Union, cast
+from operator import methodcaller
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    ContextManager,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+    cast,
+)
 from urllib.request import (
     urlopen as urlopener,
 )  # don't change the name: tests override it
-from xml.dom.minidom import Document, parse
 
 from SPARQLWrapper import __agent__
 
 if TYPE_CHECKING:
+    import mmap
+    from xml.dom.minidom import Document
+
     from rdflib import Dataset, Graph
 
+    from .memory import MemoryProfile
+    from .middleware import Middleware
+
 
 
 from .KeyCaseInsensitiveDict import KeyCaseInsensitiveDict
+from .timing import QueryTiming, _countBytes, _state, _TimedResponse
 from .SPARQLExceptions import (
     EndPointInternalError,
     EndPointNotFound,
@@ -73,7 +100,16 @@ CSV = "csv"
 """to be used to set the return format to ``CSV``"""
 TSV = "tsv"
 """to be used to set the return format to ``TSV``"""
-_allowedFormats = [JSON, XML, TURTLE, N3, RDF, RDFXML, CSV, TSV, JSONLD]
+BINARY = "binary"
+"""to be used to set the return format to the RDF4J binary query results table (SELECT queries); smaller than
+``JSON``, but slower to convert (see :mod:`SPARQLWrapper.binary_results`)."""
+THRIFT = "thrift"
+"""to be used to set the return format to the Jena RDF Thrift result set (SELECT queries); smaller than
+``JSON``, but slower to convert (see :mod:`SPARQLWrapper.binary_results`)."""
+PROTOBUF = "protobuf"
+"""to be used to set the return format to the Jena RDF Protobuf result set (SELECT queries); smaller than
+``JSON``, but slower to convert (see :mod:`SPARQLWrapper.binary_results`)."""
+_allowedFormats = [JSON, XML, TURTLE, N3, RDF, RDFXML, CSV, TSV, JSONLD, BINARY, THRIFT, PROTOBUF]
 
 # Possible HTTP methods
 GET = "GET"
@@ -141,6 +177,17 @@ POSTDIRECTLY = "postdirectly"
 This is, usually, determined automatically."""
 _REQUEST_METHODS = [URLENCODED, POSTDIRECTLY]
 
+# Possible types of the converted SPARQL XML results
+DOM = "dom"
+"""to be used to convert SPARQL XML results into a :class:`xml.dom.minidom.Document`. **This is the default**."""
+ELEMENTTREE = "etree"
+"""to be used to convert SPARQL XML results into an ``ElementTree`` (from lxml if it is installed, otherwise from
+:mod:`xml.etree.ElementTree`)."""
+BINDINGS = "bindings"
+"""to be used to convert SPARQL XML results into a dictionary with the same structure as the converted JSON
+results."""
+_allowedXMLResultTypes = [DOM, ELEMENTTREE, BINDINGS]
+
 # Possible output format (mime types) that can be converted by the local script. Unfortunately,
 # it does not work by simply setting the return format, because there is still a certain level of confusion
 # among implementations.
@@ -170,12 +217,89 @@ _RDF_N3 = _RDF_TURTLE + [
 _RDF_JSONLD = ["application/ld+json", "application/x-json+ld"]
 _CSV = ["text/csv"]
 _TSV = ["text/tab-separated-values"]
+_SPARQL_BINARY = ["application/x-binary-rdf-results-table"]
+_SPARQL_THRIFT = ["application/sparql-results+thrift"]
+_SPARQL_PROTOBUF = ["application/sparql-results+protobuf"]
 _XML = ["application/xml"]
 _ALL = ["*/*"]
 _RDF_POSSIBLE = _RDF_XML + _RDF_N3 + _XML + _RDF_JSONLD
 
+# Response format of each media type, in the order they are checked when the Content-Type is not an exact match
+_RESPONSE_MEDIA_TYPES: List[Tuple[str, str]] = (
+    [(mime, XML) for mime in _SPARQL_XML + _XML]
+    + [(mime, JSON) for mime in _SPARQL_JSON]
+    + [(mime, RDFXML) for mime in _RDF_XML]
+    + [(mime, TURTLE) for mime in _RDF_TURTLE]
+    + [(mime, N3) for mime in _RDF_N3]
+    + [(mime, CSV) for mime in _CSV]
+    + [(mime, TSV) for mime in _TSV]
+    + [(mime, JSONLD) for mime in _RDF_JSONLD]
+    + [(mime, BINARY) for mime in _SPARQL_BINARY]
+    + [(mime, THRIFT) for mime in _SPARQL_THRIFT]
+    + [(mime, PROTOBUF) for mime in _SPARQL_PROTOBUF]
+)
+
+# Converter of each response format: the format name and the requested formats it matches (for the warning sent
+# when they differ), and the name of the QueryResult method
+_FORMAT_CONVERTERS: Dict[str, Tuple[str, List[str], str]] = {
+    XML: ("XML", [XML], "_convertXMLResults"),
+    JSON: ("JSON", [JSON], "_convertJSON"),
+    RDFXML: ("RDF/XML", [RDF, XML, RDFXML], "_convertRDF"),
+    TURTLE: ("N3", [N3, TURTLE], "_convertN3"),
+    N3: ("N3", [N3, TURTLE], "_convertN3"),
+    CSV: ("CSV", [CSV], "_convertCSV"),
+    TSV: ("TSV", [TSV], "_convertTSV"),
+    JSONLD: ("JSON(-LD)", [JSONLD, JSON], "_convertJSONLD"),
+    BINARY: ("BINARY", [BINARY], "_convertBinary"),
+    THRIFT: ("THRIFT", [THRIFT], "_convertThrift"),
+    PROTOBUF: ("PROTOBUF", [PROTOBUF], "_convertProtobuf"),
+}
+# Name of the QueryResult method streaming each response format
+_FORMAT_STREAMERS: Dict[str, str] = {
+    JSON: "_streamJSON",
+    XML: "_streamXML",
+    TURTLE: "_streamTriples",
+    N3: "_streamTriples",
+    BINARY: "_streamBinary",
+    THRIFT: "_streamThrift",
+    PROTOBUF: "_streamProtobuf",
+}
+# Name of the QueryResult method parsing each response format into a given graph
+_FORMAT_LOADERS: Dict[str, str] = {
+    RDFXML: "_loadRDF",
+    TURTLE: "_loadTriples",
+    N3: "_loadTriples",
+    JSONLD: "_loadJSONLD",
+}
+# Number of triples added at once to the graph given to QueryResult.convert
+_LOAD_BATCH_SIZE = 10000
+
 _SPARQL_PARAMS = ["query"]
 
+# Accept header for each (query type, return format). The other combinations fall back to "*/*".
+_ACCEPT_HEADERS: Dict[Tuple[Optional[str], str], str] = {}
+for _queryType in [SELECT, ASK]:
+    _ACCEPT_HEADERS[(_queryType, XML)] = ",".join(_SPARQL_XML)
+    _ACCEPT_HEADERS[(_queryType, JSON)] = ",".join(_SPARQL_JSON)
+    # Allowed for SELECT and ASK (https://www.w3.org/TR/2013/REC-sparql11-protocol-20130321/#query-success)
+    # but only described for SELECT (https://www.w3.org/TR/sparql11-results-csv-tsv/)
+    _ACCEPT_HEADERS[(_queryType, CSV)] = ",".join(_CSV)
+    _ACCEPT_HEADERS[(_queryType, TSV)] = ",".join(_TSV)
+# the binary result formats only encode solutions, not booleans
+_ACCEPT_HEADERS[(SELECT, BINARY)] = ",".join(_SPARQL_BINARY)
+_ACCEPT_HEADERS[(SELECT, THRIFT)] = ",".join(_SPARQL_THRIFT)
+_ACCEPT_HEADERS[(SELECT, PROTOBUF)] = ",".join(_SPARQL_PROTOBUF)
+for _queryType in [CONSTRUCT, DESCRIBE]:
+    _ACCEPT_HEADERS[(_queryType, TURTLE)] = ",".join(_RDF_TURTLE)
+    _ACCEPT_HEADERS[(_queryType, N3)] = ",".join(_RDF_N3)
+    _ACCEPT_HEADERS[(_queryType, XML)] = ",".join(_RDF_XML)
+    _ACCEPT_HEADERS[(_queryType, RDFXML)] = ",".join(_RDF_XML)
+    _ACCEPT_HEADERS[(_queryType, JSONLD)] = ",".join(_RDF_JSONLD)
+for _queryType in [INSERT, DELETE, CREATE, CLEAR, DROP, LOAD, COPY, MOVE, ADD]:
+    _ACCEPT_HEADERS[(_queryType, XML)] = ",".join(_SPARQL_XML)
+    _ACCEPT_HEADERS[(_queryType, JSON)] = ",".join(_SPARQL_JSON)
+del _queryType
+
 # This is very ugly. The fact is that the key for the choice of the output format is not defined.
 # Virtuoso uses 'format', joseki uses 'output', rasqual seems to use "results", etc. Lee Feigenbaum
 # told me that virtuoso also understand 'output' these days, so I removed 'format'. I do not have
@@ -184,6 +308,117 @@ _SPARQL_PARAMS = ["query"]
 # parameters they do not understand. So: just repeat all possibilities in the final URI. UGLY!!!!!!!
 _returnFormatSetting = ["format", "output", "results"]
 
+# Number of bytes read at once when spooling a response body
+_SPOOL_CHUNK_SIZE = 1024 * 1024
+
+# Number of bytes read from the beginning of a streamed query to detect its type
+_QUERY_PEEK_SIZE = 65536
+
+
+def _peekQuery(query: Any) -> Tuple[str, Iterator[bytes]]:
+    """Internal function reading the beginning of a query given as a file object or as an iterator over strings or
+    bytes (at least :data:`_QUERY_PEEK_SIZE` bytes, unless it is shorter).
+
+    :return: the beginning of the query, and an iterator over the whole query in UTF-8.
+    """
+    if hasattr(query, "read"):
+
+        def readChunks() -> Iterator[Union[str, bytes]]:
+            while True:
+                chunk = query.read(_QUERY_PEEK_SIZE)
+                if not chunk:
+                    return
+                yield chunk
+
+        chunks: Iterable[Union[str, bytes]] = readChunks()
+    else:
+        chunks = query
+    encoded = (chunk.encode("utf-8") if isinstance(chunk, str) else chunk for chunk in chunks)
+    head: List[bytes] = []
+    size = 0
+    for chunk in encoded:
+        head.append(chunk)
+        size += len(chunk)
+        if size >= _QUERY_PEEK_SIZE:
+            break
+    beginning = b"".join(head)
+    text = codecs.getincrementaldecoder("utf-8")().decode(beginning)
+    return text, itertools.chain([beginning], encoded)
+
+
+def _timingHook(
+    hook: Optional[Callable[[QueryTiming], None]], middlewares: Tuple["Middleware", ...]
+) -> Callable[[QueryTiming], None]:
+    """Internal function returning the hook of a timing record calling the ``on_complete`` hook of the middleware,
+    then ``hook``."""
+
+    def complete(timing: QueryTiming) -> None:
+        for middleware in reversed(middlewares):
+            middleware.on_complete(timing)
+        if hook is not None:
+            hook(timing)
+
+    return complete
+
+
+# Function parsing a JSON document from bytes, chosen on first use by _jsonLoads
+_jsonLoader: Optional[Callable[[bytes], Any]] = None
+
+
+def _findJSONLoader() -> Callable[[bytes], Any]:
+    """Internal function returning the fastest available function parsing a JSON document from bytes: the
+    ``loads`` of orjson, simdjson or ujson if one of them is installed (in this order), otherwise :func:`json.loads`.
+    """
+    try:
+        import orjson
+
+        return orjson.loads
+    except ImportError:
+        pass
+    try:
+        import simdjson
+
+        return cast(Callable[[bytes], Any], simdjson.loads)
+    except ImportError:
+        pass
+    try:
+        import ujson
+
+        return cast(Callable[[bytes], Any], ujson.loads)
+    except ImportError:
+        pass
+    return json.loads
+
+
+def _jsonLoads(data: Union[bytes, memoryview]) -> Any:
+    """Internal function parsing a JSON document from (UTF-8) bytes, without decoding them to a string first.
+
+    :param data: the JSON document, as bytes or as a memoryview over them (like the spooled response body), which is
+      not copied if the loader takes it (like orjson).
+    :type data: bytes or memoryview
+    :return: the parsed document.
+    """
+    global _jsonLoader
+    if _jsonLoader is None:
+        _jsonLoader = _findJSONLoader()
+    if _jsonLoader is not json.loads:
+        try:
+            try:
+                return _jsonLoader(data)  # type: ignore[arg-type]
+            except TypeError:
+                if isinstance(data, bytes):
+                    raise
+                # the loader only takes bytes
+                return _jsonLoader(bytes(data))
+        except ValueError:
+            # the faster libraries are stricter (eg, about huge numbers), so give the standard library a chance
+            pass
+    if isinstance(data, memoryview):
+        # the standard library decodes the document to a string anyway
+        return json.loads(str(data, "utf-8-sig"))
+    return json.loads(data)
+
+
 #######################################################################################################
 
 
@@ -225,7 +460,25 @@ class SPARQLWrapper(object):
     :vartype customHttpHeaders: dict
     :ivar timeout: The timeout (in seconds) to use for querying the endpoint.
     :vartype timeout: int
-    :ivar queryString: The SPARQL query text.
+    :ivar spoolThreshold: If set, the response body of each query is spooled (see :meth:`QueryResult.spool`) and
+    bodies larger than this number of bytes are kept in a memory-mapped temporary file. The default value is
+    ``None`` (no spooling).
+    :vartype spoolThreshold: int
+    :ivar resultFactory: The class (or callable) creating the result of :meth:`query` from the HTTP response and
+    the requested format. The default value is ``None`` (:class:`QueryResult`).
+    :vartype resultFactory: callable
+    :ivar xmlResultType: The type of the converted SPARQL XML results: :data:`DOM`, :data:`ELEMENTTREE` or
+    :data:`BINDINGS` (constants in this module). The default value is :data:`DOM`.
+    :vartype xmlResultType: string
+    :ivar timingHook: Called with the timing record (:class:`SPARQLWrapper.timing.QueryTiming`) of each query once
+    it is complete. The default value is ``None``.
+    :vartype timingHook: callable
+    :ivar memoryProfiling: Whether the memory allocated by the conversion of the results is measured (see
+    :meth:`setMemoryProfiling`). The default value is ``False``.
+    :vartype memoryProfiling: bool
+    :ivar middlewares: The middleware of this wrapper (see :meth:`addMiddleware`), called after the global ones.
+    :vartype middlewares: list
+    :ivar queryString: The SPARQL query text (only its beginning, for a query streamed from a file or a generator).
     :vartype queryString: string
     :ivar queryType: The type of SPARQL query (aka SPARQL query form), like :data:`CONSTRUCT`, :data:`SELECT`,
     :data:`ASK`, :data:`DESCRIBE`, :data:`INSERT`, :data:`DELETE`, :data:`CREATE`, :data:`CLEAR`, :data:`DROP`,
@@ -259,8 +512,15 @@ class SPARQLWrapper(object):
     :cvar comments_pattern: regular expression used to remove comments from a query.
     :vartype comments_pattern: :class:`re.RegexObject`, a compiled regular expression. See the :mod:`re` module of
     Python
+    :cvar tokens_pattern: regular expression used, in a single left-to-right pass, to determine the query type: it
+    skips whitespace, comments, IRIs, string literals, variables, prefixed names and the ``BASE``/``PREFIX``
+    keywords, and matches the next bare word.
+    :vartype tokens_pattern: :class:`re.RegexObject`, a compiled regular expression. See the :mod:`re` module of
+    Python
     """
 
+    _middlewares: Tuple["Middleware", ...] = ()
+
     prefix_pattern = re.compile(
         r"((?P<base>(\s*BASE\s*<.*?>)\s*)|(?P<prefixes>(\s*PREFIX\s+.+:\s*<.*?>)\s*))*"
     )
@@ -270,6 +530,27 @@ class SPARQLWrapper(object):
         re.VERBOSE | re.IGNORECASE,
     )
     comments_pattern = re.compile(r"(^|\n)\s*#.*?\n")
+    # None of the alternatives can match the same text in more than one way, so there is no backtracking and
+    # the scan is linear in the length of the query
+    tokens_pattern = re.compile(
+        r"""
+        (?:
+            \s+
+          | \#[^\n]*                                    # comment
+          | <[^<>"{}|^`\\\x00-\x20]*>                   # IRI
+          | \"\"\"(?:[^"\\]|\\.|"(?!""))*\"\"\"           # long string literals
+          | '''(?:[^'\\]|\\.|'(?!''))*'''
+          | "(?:[^"\\\n]|\\.)*"                          # string literals
+          | '(?:[^'\\\n]|\\.)*'
+          | [?$]\w*                                     # variable
+          | [^\W\d][\w.-]*:[\w.:%-]* | :[\w.:%-]*        # prefixed name
+          | (?:BASE|PREFIX)\b                            # prologue keywords
+        )+
+        | (?P<word>[^\W\d]\w*)
+        | .
+        """,
+        re.VERBOSE | re.IGNORECASE | re.DOTALL,
+    )
 
     def __init__(
         self,
@@ -312,6 +593,12 @@ class SPARQLWrapper(object):
         self.onlyConneg = False  # Only Content Negotiation
         self.customHttpHeaders: Dict[str, str] = {}
         self.timeout: Optional[int]
+        self.spoolThreshold: Optional[int] = None
+        self.resultFactory: Optional[Callable[[Tuple[HTTPResponse, str]], "QueryResult"]] = None
+        self.xmlResultType = DOM
+        self.timingHook: Optional[Callable[[QueryTiming], None]] = None
+        self.memoryProfiling = False
+        self.middlewares: List["Middleware"] = []
 
         if returnFormat in _allowedFormats:
             self._defaultReturnFormat = returnFormat
@@ -326,6 +613,9 @@ class SPARQLWrapper(object):
         requestMethod.
         """
         self.parameters: Dict[str, List[str]] = {}
+        self._encodedParameters: Dict[Tuple[Optional[str], Optional[str], str, bool], Tuple[str, str]] = {}
+        # the parameters encoded in the cache, to tell when they are changed through the dictionary
+        self._encodedParametersItems: Tuple[Tuple[str, Tuple[str, ...]], ...] = ()
         if self._defaultGraph:
             self.addParameter("default-graph-uri", self._defaultGraph)
         self.returnFormat = self._defaultReturnFormat
@@ -338,8 +628,8 @@ class SPARQLWrapper(object):
         """Set the return format. If the one set is not an allowed value, the setting is ignored.
 
         :param format: Possible values are :data:`JSON`, :data:`XML`, :data:`TURTLE`, :data:`N3`, :data:`RDF`,
-        :data:`RDFXML`, :data:`CSV`, :data:`TSV`, :data:`JSONLD` (constants in this module). All other cases
-        are ignored.
+        :data:`RDFXML`, :data:`CSV`, :data:`TSV`, :data:`JSONLD`, :data:`BINARY`, :data:`THRIFT`, :data:`PROTOBUF`
+        (constants in this module). All other cases are ignored.
         :type format: string
         :raises ValueError: If :data:`JSONLD` is tried to set and the current instance does not support ``JSON-LD``.
         """
@@ -356,8 +646,8 @@ class SPARQLWrapper(object):
         """Check if a return format is supported.
 
         :param format: Possible values are :data:`JSON`, :data:`XML`, :data:`TURTLE`, :data:`N3`, :data:`RDF`,
-        :data:`RDFXML`, :data:`CSV`, :data:`TSV`, :data:`JSONLD` (constants in this module). All other cases
-        are ignored.
+        :data:`RDFXML`, :data:`CSV`, :data:`TSV`, :data:`JSONLD`, :data:`BINARY`, :data:`THRIFT`, :data:`PROTOBUF`
+        (constants in this module). All other cases are ignored.
         :type format: string
         :return: Returns ``True`` if the return format is supported, otherwise ``False``.
         :rtype: bool
@@ -372,6 +662,129 @@ class SPARQLWrapper(object):
         """
         self.timeout = int(timeout)
 
+    def setSpoolThreshold(self, threshold: Optional[int]) -> None:
+        """Set the size (in bytes) above which response bodies are spooled to a memory-mapped temporary file
+        instead of being kept in memory. Spooled results can be converted (or iterated) more than once.
+
+        .. versionadded:: 2.0.1
+
+        :param threshold: the threshold in bytes, or ``None`` to disable spooling (the default).
+        :type threshold: int
+        """
+        self.spoolThreshold = None if threshold is None else int(threshold)
+
+    def setXMLResultType(self, xmlResultType: str) -> None:
+        """Set the type of the converted SPARQL XML results. The default :data:`DOM` (a
+        :class:`xml.dom.minidom.Document`) is kept for backward compatibility; :data:`ELEMENTTREE` and
+        :data:`BINDINGS` are much faster, especially when lxml is installed.
+
+        .. versionadded:: 2.0.1
+
+        :param xmlResultType: :data:`DOM`, :data:`ELEMENTTREE` or :data:`BINDINGS`.
+        :type xmlResultType: string
+        :raises ValueError: If ``xmlResultType`` is not one of the allowed values.
+        """
+        if xmlResultType not in _allowedXMLResultTypes:
+            valid_types = ", ".join(_allowedXMLResultTypes)
+            raise ValueError("Value should be one of {0}".format(valid_types))
+        self.xmlResultType = xmlResultType
+
+    def setResultFactory(
+        self, factory: Optional[Callable[[Tuple[HTTPResponse, str]], "QueryResult"]]
+    ) -> None:
+        """Set the class (or callable) creating the result of :meth:`query`, typically a subclass of
+        :class:`QueryResult` with its own converters (see :meth:`QueryResult.registerConverter`).
+
+        .. versionadded:: 2.0.1
+
+        :param factory: called with a tuple (HTTP response, requested format) to return the result, or ``None``
+          to use :class:`QueryResult` (the default).
+        :type factory: callable
+        """
+        self.resultFactory = factory
+
+    def setTimingHook(self, hook: Optional[Callable[[QueryTiming], None]]) -> None:
+        """Set the function exporting the timing records of the queries (for instance to a log or to a metrics
+        system). Each result of :meth:`query` holds its timing record in its ``timing`` attribute; the hook is
+        called with this record once it is complete: when :meth:`QueryResult.convert` returns, or when the response
+        body has been read to its end if the result is not converted. It is also called when the request fails.
+
+        .. versionadded:: 2.0.1
+
+        :param hook: called with the :class:`SPARQLWrapper.timing.QueryTiming` record, or ``None`` to remove it
+          (the default).
+        :type hook: callable
+        """
+        self.timingHook = hook
+
+    def setMemoryProfiling(self, enabled: bool = True) -> None:
+        """Measure the memory allocated by the conversion of the results of :meth:`query`, with :mod:`tracemalloc`:
+        each result then holds a :class:`SPARQLWrapper.memory.MemoryProfile` record in its ``memory`` attribute,
+        filled by :meth:`QueryResult.convert` (and by :class:`SPARQLWrapper.SmartWrapper.Bindings`) with the peak
+        and the retained memory of each step (reading the body, converting it). Tracing the allocations slows the
+        conversions down (and so inflates their times in the timing records), see :mod:`SPARQLWrapper.memory`.
+
+        .. versionadded:: 2.0.1
+
+        :param enabled: whether the memory is measured. The **default** value is ``True``.
+        :type enabled: bool
+        """
+        self.memoryProfiling = enabled
+
+    @classmethod
+    def registerMiddleware(cls, middleware: "Middleware") -> None:
+        """Register a middleware for all the wrappers (see :mod:`SPARQLWrapper.middleware`). Registering on a subclass
+        of :class:`SPARQLWrapper` does not affect its parent class.
+
+        .. versionadded:: 2.0.1
+
+        :param middleware: the middleware.
+        :type middleware: :class:`SPARQLWrapper.middleware.Middleware`
+        """
+        cls._middlewares = cls._middlewares + (middleware,)
+
+    @classmethod
+    def unregisterMiddleware(cls, middleware: "Middleware") -> bool:
+        """Unregister a middleware registered with :meth:`registerMiddleware`.
+
+        .. versionadded:: 2.0.1
+
+        :param middleware: the middleware.
+        :type middleware: :class:`SPARQLWrapper.middleware.Middleware`
+        :return: Returns ``True`` if the middleware was registered. Otherwise, ``False``.
+        :rtype: bool
+        """
+        if middleware not in cls._middlewares:
+            return False
+        cls._middlewares = tuple(m for m in cls._middlewares if m is not middleware)
+        return True
+
+    def addMiddleware(self, middleware: "Middleware") -> None:
+        """Add a middleware to this wrapper (see :mod:`SPARQLWrapper.middleware`), called after the global ones and
+        those added before.
+
+        .. versionadded:: 2.0.1
+
+        :param middleware: the middleware.
+        :type middleware: :class:`SPARQLWrapper.middleware.Middleware`
+        """
+        self.middlewares.append(middleware)
+
+    def removeMiddleware(self, middleware: "Middleware") -> bool:
+        """Remove a middleware added with :meth:`addMiddleware`.
+
+        .. versionadded:: 2.0.1
+
+        :param middleware: the middleware.
+        :type middleware: :class:`SPARQLWrapper.middleware.Middleware`
+        :return: Returns ``True`` if the middleware was added. Otherwise, ``False``.
+        :rtype: bool
+        """
+        if middleware not in self.middlewares:
+            return False
+        self.middlewares.remove(middleware)
+        return True
+
     def setOnlyConneg(self, onlyConneg: bool) -> None:
         """Set this option for allowing (or not) only HTTP Content Negotiation (so dismiss the use of HTTP parameters).
 
@@ -570,7 +983,7 @@ class SPARQLWrapper(object):
             valid_types = ", ".join(_allowedAuth)
             raise ValueError("Value should be one of {0}".format(valid_types))
 
-    def setQuery(self, query: Union[str, bytes]) -> None:
+    def setQuery(self, query: Union[str, bytes, IO[Any], Iterator[Union[str, bytes]]]) -> None:
         """
         Set the SPARQL query text.
 
@@ -579,22 +992,47 @@ class SPARQLWrapper(object):
           (syntax or otherwise) by this module, except for testing the query type (SELECT,
           ASK, etc). Syntax and validity checking is done by the SPARQL service itself.
 
+        Large queries and updates can be given as a file object (binary or text) or as an iterator (like a generator)
+        of strings or utf-8 encoded byte-strings: only the beginning is read to detect the query type, and the query
+        is streamed in the body of the request (with the chunked transfer encoding) when it is sent, so it must be
+        sent directly (:data:`POSTDIRECTLY`, with :data:`POST` for the queries) and only once.
+
         :param query: query text.
         :type query: string
-        :raises TypeError: If the :attr:`query` parameter is not an unicode-string or utf-8 encoded byte-string.
+        :raises TypeError: If the :attr:`query` parameter is not an unicode-string, an utf-8 encoded byte-string, a
+          file object or an iterator.
         """
+        self._queryBody: Optional[Iterator[bytes]] = None
+        self._queryBodySent = False
         if isinstance(query, str):
             pass
         elif isinstance(query, bytes):
             query = query.decode("utf-8")
+        elif hasattr(query, "read") or isinstance(query, Iterator):
+            query, self._queryBody = _peekQuery(query)
         else:
             raise TypeError(
-                "setQuery takes either unicode-strings or utf-8 encoded byte-strings"
+                "setQuery takes either unicode-strings, utf-8 encoded byte-strings, file objects or iterators"
             )
 
         self.queryString = query
         self.queryType = self._parseQueryType(query)
 
+    def _getQueryData(self) -> Union[bytes, Iterator[bytes]]:
+        """Internal method returning the body of a request sending the query directly: the query in UTF-8, or an
+        iterator over it if it is streamed.
+
+        .. versionadded:: 2.0.1
+
+        :raises ValueError: If the streamed query has already been sent.
+        """
+        if self._queryBody is None:
+            return self.queryString.encode("UTF-8")
+        if self._queryBodySent:
+            raise ValueError("a streamed query can only be sent once")
+        self._queryBodySent = True
+        return self._queryBody
+
     def _parseQueryType(self, query: str) -> Optional[str]:
         """
         Internal method for parsing the SPARQL query and return its type (ie, :data:`SELECT`, :data:`ASK`, etc).
@@ -610,22 +1048,17 @@ class SPARQLWrapper(object):
         :return: the type of SPARQL query (aka SPARQL query form).
         :rtype: string
         """
-        try:
-            query = (
-                query if (isinstance(query, str)) else query.encode("ascii", "ignore")
-            )
-            query = self._cleanComments(query)
-            query_for_queryType = re.sub(self.prefix_pattern, "", query.strip())
-            # type error: Item "None" of "Optional[Match[str]]" has no attribute "group"
-            r_queryType = (
-                self.pattern.search(query_for_queryType).group("queryType").upper()  # type: ignore[union-attr]
-            )
-        except AttributeError:
+        r_queryType = None
+        for token in self.tokens_pattern.finditer(query):
+            word = token.group("word")
+            if word is not None and word.upper() in _allowedQueryTypes:
+                r_queryType = word.upper()
+                break
+        if r_queryType is None:
             warnings.warn(
                 "not detected query type for query '%r'" % query.replace("\n", " "),
                 RuntimeWarning,
             )
-            r_queryType = None
 
         if r_queryType in _allowedQueryTypes:
             return r_queryType
@@ -665,6 +1098,22 @@ class SPARQLWrapper(object):
                 "keepalive support not available, so the execution of this method has no effect"
             )
 
+    def setUseDetailedTiming(self) -> None:
+        """Make :mod:`urllib` measure the DNS resolution, the TCP connection and the TLS handshake of the requests,
+        in the ``dns``, ``connect`` and ``tls`` phases of the timing records (see :meth:`setTimingHook`). Like
+        :meth:`setUseKeepAlive`, this installs a global opener, which replaces the previous one.
+
+        .. versionadded:: 2.0.1
+        """
+        from .timing import TimingHTTPHandler, TimingHTTPSHandler
+
+        if urllib.request._opener and any(  # type: ignore[attr-defined]
+            isinstance(h, TimingHTTPHandler) for h in urllib.request._opener.handlers  # type: ignore[attr-defined]
+        ):
+            # already installed
+            return
+        urllib.request.install_opener(urllib.request.build_opener(TimingHTTPHandler, TimingHTTPSHandler))
+
     def isSparqlUpdateRequest(self) -> bool:
         """Returns ``True`` if SPARQLWrapper is configured for executing SPARQL Update request.
 
@@ -715,11 +1164,46 @@ class SPARQLWrapper(object):
         :return: the request encoded parameters.
         :rtype: string
         """
-        query_parameters = self.parameters.copy()
-
+        queryName: Optional[str] = None
+        queryText = ""
         # in case of query = tuple("query"/"update", queryString)
         if query and isinstance(query, tuple) and len(query) == 2:
-            query_parameters[query[0]] = [query[1]]
+            queryName, queryText = query
+
+        # everything but the query text only depends on a few settings, so it is encoded once and reused
+        items = tuple((name, tuple(values)) for name, values in self.parameters.items())
+        if items != self._encodedParametersItems:
+            self._encodedParameters.clear()
+            self._encodedParametersItems = items
+        key = (queryName, self.queryType, self.returnFormat, self.onlyConneg)
+        encoded = self._encodedParameters.get(key)
+        if encoded is None:
+            encoded = self._encodeParameters(queryName)
+            self._encodedParameters[key] = encoded
+
+        before, after = encoded
+        if queryName is None:
+            return before
+        pair = "%s=%s" % (
+            urllib.parse.quote_plus(queryName.encode("UTF-8"), safe="/"),
+            urllib.parse.quote_plus(queryText.encode("UTF-8"), safe="/"),
+        )
+        return "&".join(part for part in (before, pair, after) if part)
+
+    def _encodeParameters(self, queryName: Optional[str]) -> Tuple[str, str]:
+        """Internal method for encoding the request parameters, except the query text itself.
+
+        :param queryName: the name of the parameter carrying the query text (``query`` or ``update``), or ``None``
+          if the query text is not sent as a parameter.
+        :type queryName: string
+        :return: the encoded parameters which go before and after the query text.
+        :rtype: tuple
+        """
+        query_parameters: Dict[str, List[str]] = self.parameters.copy()
+
+        # placeholder, keeping the position of the query text among the parameters
+        if queryName is not None:
+            query_parameters[queryName] = []
 
         if not self.isSparqlUpdateRequest():
             # This is very ugly. The fact is that the key for the choice of the output format is not defined.
@@ -727,31 +1211,38 @@ class SPARQLWrapper(object):
             # However, these processors are (hopefully) oblivious to the parameters they do not understand.
             # So: just repeat all possibilities in the final URI. UGLY!!!!!!!
             if not self.onlyConneg:
+                formatValues = [self.returnFormat]
+                # Virtuoso is not supporting a correct Accept header and an unexpected "output"/"format" parameter
+                # value. It returns a 406.
+                # "tsv", "rdf+xml" and "json-ld" are not supported as a correct "output"/"format" parameter value
+                # but "text/tab-separated-values" or "application/rdf+xml" are a valid values,
+                # and there is no problem to send both (4store does not support unexpected values).
+                if self.returnFormat in [TSV, JSONLD, RDFXML]:
+                    acceptHeader = (
+                        self._getAcceptHeader()
+                    )  # to obtain the mime-type "text/tab-separated-values" or "application/rdf+xml"
+                    if "*/*" in acceptHeader:
+                        acceptHeader = ""  # clear the value in case of "*/*"
+                    formatValues.append(acceptHeader)
                 for f in _returnFormatSetting:
-                    query_parameters[f] = [self.returnFormat]
-                    # Virtuoso is not supporting a correct Accept header and an unexpected "output"/"format" parameter
-                    # value. It returns a 406.
-                    # "tsv", "rdf+xml" and "json-ld" are not supported as a correct "output"/"format" parameter value
-                    # but "text/tab-separated-values" or "application/rdf+xml" are a valid values,
-                    # and there is no problem to send both (4store does not support unexpected values).
-                    if self.returnFormat in [TSV, JSONLD, RDFXML]:
-                        acceptHeader = (
-                            self._getAcceptHeader()
-                        )  # to obtain the mime-type "text/tab-separated-values" or "application/rdf+xml"
-                        if "*/*" in acceptHeader:
-                            acceptHeader = ""  # clear the value in case of "*/*"
-                        query_parameters[f] += [acceptHeader]
-
-        pairs = (
-            "%s=%s"
-            % (
-                urllib.parse.quote_plus(param.encode("UTF-8"), safe="/"),
-                urllib.parse.quote_plus(value.encode("UTF-8"), safe="/"),
+                    query_parameters[f] = formatValues
+
+        pieces: List[List[str]] = [[]]
+        for param, values in query_parameters.items():
+            if param == queryName:
+                pieces.append([])
+                continue
+            pieces[-1].extend(
+                "%s=%s"
+                % (
+                    urllib.parse.quote_plus(param.encode("UTF-8"), safe="/"),
+                    urllib.parse.quote_plus(value.encode("UTF-8"), safe="/"),
+                )
+                for value in values
             )
-            for param, values in query_parameters.items()
-            for value in values
-        )
-        return "&".join(pairs)
+        before = "&".join(pieces[0])
+        after = "&".join(pieces[1]) if len(pieces) > 1 else ""
+        return before, after
 
     def _getAcceptHeader(self) -> str:
         """Internal method for getting the HTTP Accept Header.
@@ -759,63 +1250,15 @@ class SPARQLWrapper(object):
         .. seealso:: `Hypertext Transfer Protocol -- HTTP/1.1 - Header Field Definitions
         <https://www.w3.org/Protocols/rfc2616/rfc2616-sec14.html#sec14.1>`_
         """
-        if self.queryType in [SELECT, ASK]:
-            if self.returnFormat == XML:
-                acceptHeader = ",".join(_SPARQL_XML)
-            elif self.returnFormat == JSON:
-                acceptHeader = ",".join(_SPARQL_JSON)
-            elif (
-                self.returnFormat == CSV
-            ):  # Allowed for SELECT and ASK (https://www.w3.org/TR/2013/REC-sparql11-protocol-20130321/#query-success)
-                # but only described for SELECT (https://www.w3.org/TR/sparql11-results-csv-tsv/)
-                acceptHeader = ",".join(_CSV)
-            elif (
-                self.returnFormat == TSV
-            ):  # Allowed for SELECT and ASK (https://www.w3.org/TR/2013/REC-sparql11-protocol-20130321/#query-success)
-                # but only described for SELECT (https://www.w3.org/TR/sparql11-results-csv-tsv/)
-                acceptHeader = ",".join(_TSV)
-            else:
-                acceptHeader = ",".join(_ALL)
+        acceptHeader = _ACCEPT_HEADERS.get((self.queryType, self.returnFormat))
+        if acceptHeader is None:
+            acceptHeader = ",".join(_ALL)
+            if self.queryType in [SELECT, ASK, CONSTRUCT, DESCRIBE]:
                 warnings.warn(
                     "Sending Accept header '*/*' because unexpected returned format '%s' in a '%s' SPARQL query form"
                     % (self.returnFormat, self.queryType),
                     RuntimeWarning,
                 )
-        elif self.queryType in [CONSTRUCT, DESCRIBE]:
-            if self.returnFormat == TURTLE:
-                acceptHeader = ",".join(_RDF_TURTLE)
-            elif self.returnFormat == N3:
-                acceptHeader = ",".join(_RDF_N3)
-            elif self.returnFormat == XML or self.returnFormat == RDFXML:
-                acceptHeader = ",".join(_RDF_XML)
-            elif self.returnFormat == JSONLD and JSONLD in _allowedFormats:
-                acceptHeader = ",".join(_RDF_JSONLD)
-            else:
-                acceptHeader = ",".join(_ALL)
-                warnings.warn(
-                    "Sending Accept header '*/*' because unexpected returned format '%s' in a '%s' SPARQL query form"
-                    % (self.returnFormat, self.queryType),
-                    RuntimeWarning,
-                )
-        elif self.queryType in [
-            INSERT,
-            DELETE,
-            CREATE,
-            CLEAR,
-            DROP,
-            LOAD,
-            COPY,
-            MOVE,
-            ADD,
-        ]:
-            if self.returnFormat == XML:
-                acceptHeader = ",".join(_SPARQL_XML)
-            elif self.returnFormat == JSON:
-                acceptHeader = ",".join(_SPARQL_JSON)
-            else:
-                acceptHeader = ",".join(_ALL)
-        else:
-            acceptHeader = "*/*"
         return acceptHeader
 
     def _createRequest(self) -> urllib.request.Request:
@@ -828,6 +1271,12 @@ class SPARQLWrapper(object):
         """
         request = None
 
+        if self._queryBody is not None and (
+            self.requestMethod != POSTDIRECTLY
+            or (self.method != POST and not self.isSparqlUpdateRequest())
+        ):
+            raise ValueError("a streamed query must be sent with POST and POSTDIRECTLY")
+
         if self.isSparqlUpdateRequest():
             # protocol details at http://www.w3.org/TR/sparql11-protocol/#update-operation
             uri = self.updateEndpoint
@@ -840,7 +1289,7 @@ class SPARQLWrapper(object):
                     uri + "?" + self._getRequestEncodedParameters()
                 )
                 request.add_header("Content-Type", "application/sparql-update")
-                request.data = self.queryString.encode("UTF-8")
+                request.data = self._getQueryData()
             else:  # URL-encoded
                 request = urllib.request.Request(uri)
                 request.add_header("Content-Type", "application/x-www-form-urlencoded")
@@ -857,7 +1306,7 @@ class SPARQLWrapper(object):
                         uri + "?" + self._getRequestEncodedParameters()
                     )
                     request.add_header("Content-Type", "application/sparql-query")
-                    request.data = self.queryString.encode("UTF-8")
+                    request.data = self._getQueryData()
                 else:  # URL-encoded
                     request = urllib.request.Request(uri)
                     request.add_header(
@@ -873,8 +1322,21 @@ class SPARQLWrapper(object):
                     + self._getRequestEncodedParameters(("query", self.queryString))
                 )
 
-        request.add_header("User-Agent", self.agent)
         request.add_header("Accept", self._getAcceptHeader())
+        self._addRequestHeaders(request, uri)
+        return request
+
+    def _addRequestHeaders(self, request: urllib.request.Request, uri: str) -> None:
+        """Internal method adding the ``User-Agent``, the authentication and the custom HTTP headers to a request.
+
+        .. versionadded:: 2.0.1
+
+        :param request: the request.
+        :param uri: the endpoint URI, for the ``DIGEST`` authentication.
+        :raises NotImplementedError: If the HTTP authentification method is not one of the valid values: :data:`BASIC`
+        or :data:`DIGEST`.
+        """
+        request.add_header("User-Agent", self.agent)
         if self.user and self.passwd:
             if self.http_auth == BASIC:
                 credentials = "%s:%s" % (self.user, self.passwd)
@@ -904,12 +1366,16 @@ class SPARQLWrapper(object):
                 customHttpHeader, self.customHttpHeaders[customHttpHeader]
             )
 
-        return request
-
-    def _query(self) -> Tuple[HTTPResponse, str]:
+    def _query(self, timing: Optional[QueryTiming] = None) -> Tuple[HTTPResponse, str]:
         """Internal method to execute the query. Returns the output of the
         :func:`urllib2.urlopen` method of the :mod:`urllib2` Python library
 
+        .. versionchanged:: 2.0.1
+           The request is built with :meth:`_createRequest` and sent with :meth:`_urlopen` (so through the
+           middleware). :meth:`query` calls this method with ``timing``, which gets the time spent building the
+           request, the HTTP method and the request sent.
+
+        :param timing: the timing record to fill in, if any.
         :return: tuples with the raw request plus the expected format.
         :raises QueryBadFormed: If the HTTP return code is ``400``.
         :raises Unauthorized: If the HTTP return code is ``401``.
@@ -918,15 +1384,83 @@ class SPARQLWrapper(object):
         :raises EndPointInternalError: If the HTTP return code is ``500``.
         :raises urllib2.HTTPError: If the HTTP return code is different to ``400``, ``401``, ``404``, ``414``, ``500``.
         """
+        if timing is None:
+            return self._urlopen(self._createRequest()), self.returnFormat
+        start = time.perf_counter()
         request = self._createRequest()
+        timing.build = time.perf_counter() - start
+        timing.method = request.get_method()
+        timing._request = request
+        return self._urlopen(request, timing), self.returnFormat
 
+    def _urlopen(self, request: urllib.request.Request, timing: Optional[QueryTiming] = None) -> HTTPResponse:
+        """Internal method sending a request through the middleware (see :meth:`addMiddleware`), with the timeout
+        set, and raising the SPARQLWrapper exceptions for the HTTP errors.
+
+        .. versionadded:: 2.0.1
+
+        :param request: the request.
+        :param timing: the timing record to fill in (request size, connection phases, time to first byte and
+          status), if any.
+        :return: the response.
+        :raises QueryBadFormed: If the HTTP return code is ``400``.
+        :raises Unauthorized: If the HTTP return code is ``401``.
+        :raises EndPointNotFound: If the HTTP return code is ``404``.
+        :raises URITooLong: If the HTTP return code is ``414``.
+        :raises EndPointInternalError: If the HTTP return code is ``500``.
+        :raises urllib2.HTTPError: If the HTTP return code is different to ``400``, ``401``, ``404``, ``414``, ``500``.
+        """
+        middlewares = self._middlewares + tuple(self.middlewares) if self.middlewares else self._middlewares
+        if not middlewares:
+            return self._send(request, timing)
+        response = None
+        for index, middleware in enumerate(middlewares):
+            response = middleware.before_request(self, request)
+            if response is not None:
+                # the next middleware are skipped
+                middlewares = middlewares[: index + 1]
+                break
+        if response is None:
+            try:
+                response = self._send(request, timing)
+            except Exception as e:
+                for middleware in reversed(middlewares):
+                    response = middleware.on_error(self, request, e)
+                    if response is not None:
+                        break
+                else:
+                    raise
+        for middleware in reversed(middlewares):
+            response = middleware.after_response(self, request, response)
+        return response
+
+    def _send(self, request: urllib.request.Request, timing: Optional[QueryTiming] = None) -> HTTPResponse:
+        """Internal method sending a request, without the middleware, see :meth:`_urlopen`.
+
+        .. versionadded:: 2.0.1
+        """
+        if timing is not None:
+            data = request.data
+            if data is None:
+                timing.requestBytes = len(urllib.parse.urlsplit(request.full_url).query)
+            elif isinstance(data, (bytes, bytearray)):
+                timing.requestBytes = len(data)
+            elif not hasattr(data, "read"):
+                request.data = _countBytes(timing, cast(Iterable[bytes], data))
+            previous = getattr(_state, "timing", None)
+            _state.timing = timing
+            start = time.perf_counter()
         try:
             if self.timeout:
                 response = urlopener(request, timeout=self.timeout)
             else:
                 response = urlopener(request)
-            return response, self.returnFormat
+            if timing is not None:
+                timing.status = getattr(response, "status", None)
+            return cast(HTTPResponse, response)
         except urllib.error.HTTPError as e:
+            if timing is not None:
+                timing.status = e.code
             if e.code == 400:
                 raise QueryBadFormed(e.read())
             elif e.code == 404:
@@ -939,6 +1473,10 @@ class SPARQLWrapper(object):
                 raise EndPointInternalError(e.read())
             else:
                 raise e
+        finally:
+            if timing is not None:
+                timing.ttfb = time.perf_counter() - start
+                _state.timing = previous
 
     def query(self) -> "QueryResult":
         """
@@ -955,19 +1493,73 @@ class SPARQLWrapper(object):
         back to one of the "meaningful" formats, but it is up to the specific implementation to choose which
         one that is.)
 
+        The result holds the timing record of the query in its ``timing`` attribute, see :meth:`setTimingHook`, and
+        its memory profile in its ``memory`` attribute, see :meth:`setMemoryProfiling`.
+
         :return: query result
         :rtype: :class:`QueryResult` instance
         """
-        return QueryResult(self._query())
-
-    def queryAndConvert(self) -> "QueryResult.ConvertResult":
+        factory = self.resultFactory if self.resultFactory is not None else QueryResult
+        middlewares = self._middlewares + tuple(self.middlewares) if self.middlewares else self._middlewares
+        timing = QueryTiming(
+            self.updateEndpoint if self.isSparqlUpdateRequest() else self.endpoint,
+            self.queryType,
+            self.method,
+            self.returnFormat,
+            _timingHook(self.timingHook, middlewares) if middlewares else self.timingHook,
+            self.queryString,
+        )
+        try:
+            response, returnFormat = self._query(timing)
+        except BaseException as e:
+            timing.error = type(e).__name__
+            timing._finish()
+            raise
+        result = factory((cast(HTTPResponse, _TimedResponse(response, timing)), returnFormat))
+        result.timing = timing
+        result.request = timing._request
+        if middlewares:
+            result._middlewares = middlewares
+        if self.xmlResultType != DOM:
+            result.xmlResultType = self.xmlResultType
+        if self.memoryProfiling:
+            from .memory import MemoryProfile
+
+            result.memory = MemoryProfile()
+        if self.spoolThreshold is not None:
+            result.spool(self.spoolThreshold)
+        return result
+
+    def queryAndConvert(self, graph: Optional["Graph"] = None) -> "QueryResult.ConvertResult":
         """Macro like method: issue a query and return the converted results.
 
+        :param graph: for CONSTRUCT and DESCRIBE queries, the RDFLib ``Graph`` or ``Dataset`` (over any store) to
+          parse the results into, see :meth:`QueryResult.convert`. The **default** value is ``None``.
+        :type graph: :class:`rdflib.graph.Graph`
         :return: the converted query result. See the conversion methods for more details.
         """
         res = self.query()
+        if graph is not None:
+            return res.convert(graph=graph)
         return res.convert()
 
+    def __copy__(self) -> "SPARQLWrapper":
+        """Return a copy of this object with its own parameters, custom HTTP headers and middleware, so that the copy
+        can be changed and used (for instance in another thread) without affecting this object.
+
+        .. versionadded:: 2.0.1
+
+        :return: the copy.
+        :rtype: :class:`SPARQLWrapper`
+        """
+        clone = self.__class__.__new__(self.__class__)
+        clone.__dict__.update(self.__dict__)
+        clone.parameters = {name: list(values) for name, values in self.parameters.items()}
+        clone.customHttpHeaders = dict(self.customHttpHeaders)
+        clone.middlewares = list(self.middlewares)
+        clone._encodedParameters = {}
+        return clone
+
     def __str__(self) -> str:
         """This method returns the string representation of a :class:`SPARQLWrapper` object.
 
@@ -985,6 +1577,506 @@ class SPARQLWrapper(object):
 #######################################################################################################
 
 
+class _BufferReader(io.RawIOBase):
+    """Read-only, seekable raw stream over a buffer (like ``bytes`` or an ``mmap``), without copying it."""
+
+    def __init__(self, buffer: Union[bytes, "mmap.mmap"]) -> None:
+        self._buffer = buffer
+        self._view = memoryview(buffer)
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, b: Any) -> int:
+        n = max(0, min(len(b), len(self._view) - self._pos))
+        b[:n] = self._view[self._pos : self._pos + n]
+        self._pos += n
+        return n
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        if offset < 0:
+            raise ValueError("negative seek position %d" % offset)
+        self._pos = offset
+        return self._pos
+
+    def tell(self) -> int:
+        return self._pos
+
+
+class _JSONResultsReader(object):
+    """
+    Incremental reader for the `SPARQL 1.1 Query Results JSON Format <https://www.w3.org/TR/sparql11-results-json/>`_.
+
+    The members of the ``results`` object are decoded one solution at a time while the response is read, so that
+    only the current chunk of the response is kept in memory. :meth:`start` must be called before iterating; it reads
+    the response up to the first solution, so that :attr:`head` is available as soon as possible (in the unusual case
+    of the ``head`` member being sent after the ``results`` member, the solutions have to be buffered).
+
+    :ivar head: the ``head`` member of the results, or an empty dictionary if not found (yet).
+    :vartype head: dict
+    :ivar boolean: the ``boolean`` member of the results (ASK queries), ``None`` if not found (yet).
+    :vartype boolean: bool
+    """
+
+    _WHITESPACE = " \t\n\r"
+
+    def __init__(self, stream: Any, chunkSize: int = 65536) -> None:
+        """
+        :param stream: a binary file-like object, like the HTTP response.
+        :param chunkSize: number of bytes to read from the stream at once.
+        :type chunkSize: int
+        """
+        self.stream = stream
+        self.chunkSize = chunkSize
+        self.head: Dict[str, Any] = {}
+        self.boolean: Optional[bool] = None
+        self._decoder = json.JSONDecoder()
+        self._textDecoder = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+        self._bindings: Optional[Iterator[Dict[str, Dict[str, str]]]] = None
+
+    def start(self) -> "_JSONResultsReader":
+        """Read the response up to the first solution (or to the end, if there are none).
+
+        :return: the reader itself.
+        """
+        if self._bindings is None:
+            bindings = self._parse()
+            first = next(bindings, None)
+            self._bindings = itertools.chain([first] if first is not None else [], bindings)
+        return self
+
+    def __iter__(self) -> Iterator[Dict[str, Dict[str, str]]]:
+        return self.start()._bindings  # type: ignore[return-value]
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        chunk = self.stream.read(self.chunkSize)
+        if self._pos:
+            self._buffer = self._buffer[self._pos :]
+            self._pos = 0
+        if not chunk:
+            self._eof = True
+            self._buffer += self._textDecoder.decode(b"", True)
+        else:
+            self._buffer += self._textDecoder.decode(chunk)
+        return True
+
+    def _peek(self) -> str:
+        """Skip whitespace and return the next character (empty string at the end of the stream)."""
+        while True:
+            while self._pos < len(self._buffer):
+                if self._buffer[self._pos] not in self._WHITESPACE:
+                    return self._buffer[self._pos]
+                self._pos += 1
+            if not self._fill():
+                return ""
+
+    def _expect(self, characters: str) -> str:
+        c = self._peek()
+        if not c or c not in characters:
+            raise ValueError(
+                "Malformed JSON results: expected one of %r at offset %d, found %r"
+                % (characters, self._pos, c)
+            )
+        self._pos += 1
+        return c
+
+    def _value(self) -> Any:
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+                # a number could continue in the next chunk
+                if end < len(self._buffer) or self._eof:
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            self._fill()
+
+    def _members(self) -> Iterator[str]:
+        """Iterate over the keys of the object starting at the current position. The caller must consume the value
+        of each key before asking for the next one."""
+        self._expect("{")
+        if self._peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self._value()
+            self._expect(":")
+            yield key
+            if self._expect(",}") == "}":
+                return
+
+    def _results(self) -> Iterator[Dict[str, Dict[str, str]]]:
+        """Iterate over the solutions of the ``results`` object starting at the current position, decoding them one
+        at a time."""
+        for resultsKey in self._members():
+            if resultsKey != "bindings":
+                self._value()
+                continue
+            self._expect("[")
+            if self._peek() == "]":
+                self._pos += 1
+                continue
+            while True:
+                yield self._value()
+                if self._expect(",]") == "]":
+                    break
+
+    def _parse(self) -> Iterator[Dict[str, Dict[str, str]]]:
+        pending: List[Dict[str, Dict[str, str]]] = []
+        for key in self._members():
+            if key == "head":
+                self.head = self._value()
+            elif key == "boolean":
+                self.boolean = self._value()
+            elif key == "results" and not self.head:
+                # the variables are not known yet: keep the solutions until the head is found (still decoding them
+                # one at a time, as decoding the whole object would start again from its beginning after each read)
+                pending.extend(self._results())
+            elif key == "results":
+                yield from self._results()
+            else:
+                self._value()
+        yield from pending
+
+
+#######################################################################################################
+
+
+_SPARQL_RESULTS_NS = "{http://www.w3.org/2005/sparql-results#}"
+_XML_LANG = "{http://www.w3.org/XML/1998/namespace}lang"
+
+
+def _getElementTree() -> Any:
+    """Internal function returning ``lxml.etree`` if lxml is installed, otherwise :mod:`xml.etree.ElementTree`."""
+    try:
+        from lxml import etree
+
+        return etree
+    except ImportError:
+        import xml.etree.ElementTree
+
+        return xml.etree.ElementTree
+
+
+def _xmlTerm(element: Any) -> Dict[str, Any]:
+    """Internal function converting an RDF term of the SPARQL XML results (``uri``, ``literal``, ``bnode`` or
+    ``triple`` element) into its form in the JSON results."""
+    kind = element.tag[len(_SPARQL_RESULTS_NS) :]
+    if kind == "triple":
+        return {
+            "type": "triple",
+            "value": {
+                part.tag[len(_SPARQL_RESULTS_NS) :]: _xmlTerm(part[0]) for part in element
+            },
+        }
+    term = {"type": kind, "value": element.text or ""}
+    if kind == "literal":
+        if element.get(_XML_LANG) is not None:
+            term["xml:lang"] = element.get(_XML_LANG)
+        elif element.get("datatype") is not None:
+            term["datatype"] = element.get("datatype")
+    return term
+
+
+class _XMLResultsReader(object):
+    """
+    Incremental reader for the `SPARQL Query Results XML Format <https://www.w3.org/TR/rdf-sparql-XMLres/>`_, based
+    on ``iterparse`` (from lxml if it is installed, otherwise from :mod:`xml.etree.ElementTree`).
+
+    Iterating yields the solutions one at a time, with the same structure as the items of ``results/bindings`` of the
+    converted JSON results; each ``result`` element is discarded once converted. As for :class:`_JSONResultsReader`,
+    :meth:`start` reads the response up to the first solution, so that :attr:`head` is available.
+
+    :ivar head: the ``head`` of the results (``vars`` and ``link``), or an empty dictionary if not found (yet).
+    :vartype head: dict
+    :ivar boolean: the ``boolean`` of the results (ASK queries), ``None`` if not found (yet).
+    :vartype boolean: bool
+    """
+
+    def __init__(self, stream: Any) -> None:
+        """
+        :param stream: a binary file-like object, like the HTTP response.
+        """
+        self.stream = stream
+        self.head: Dict[str, Any] = {}
+        self.boolean: Optional[bool] = None
+        self._results: Optional[Iterator[Dict[str, Dict[str, Any]]]] = None
+
+    def start(self) -> "_XMLResultsReader":
+        """Read the response up to the first solution (or to the end, if there are none).
+
+        :return: the reader itself.
+        """
+        if self._results is None:
+            results = self._parse()
+            first = next(results, None)
+            self._results = itertools.chain([first] if first is not None else [], results)
+        return self
+
+    def __iter__(self) -> Iterator[Dict[str, Dict[str, Any]]]:
+        return self.start()._results  # type: ignore[return-value]
+
+    def _parse(self) -> Iterator[Dict[str, Dict[str, Any]]]:
+        etree = _getElementTree()
+        if hasattr(etree, "XMLParser") and hasattr(etree, "XSLT"):  # lxml
+            events = etree.iterparse(
+                self.stream, events=("end",), resolve_entities=False, no_network=True
+            )
+        else:
+            events = etree.iterparse(self.stream, events=("end",))
+        for _, element in events:
+            tag = element.tag
+            if tag == _SPARQL_RESULTS_NS + "result":
+                yield {
+                    binding.get("name"): _xmlTerm(binding[0])
+                    for binding in element
+                    if len(binding)
+                }
+                element.clear()
+                if hasattr(element, "getprevious"):  # lxml keeps the cleared elements around
+                    while element.getprevious() is not None:
+                        del element.getparent()[0]
+            elif tag == _SPARQL_RESULTS_NS + "head":
+                self.head = {
+                    "vars": [
+                        child.get("name")
+                        for child in element
+                        if child.tag == _SPARQL_RESULTS_NS + "variable"
+                    ]
+                }
+                links = [
+                    child.get("href")
+                    for child in element
+                    if child.tag == _SPARQL_RESULTS_NS + "link"
+                ]
+                if links:
+                    self.head["link"] = links
+            elif tag == _SPARQL_RESULTS_NS + "boolean":
+                self.boolean = (element.text or "").strip() == "true"
+
+
+# Tokens of Turtle/N3, as far as needed to find the end of the statements. "open" is the start of a string or IRI
+# which is not complete (yet).
+_TURTLE_TOKENS = re.compile(
+    r"""
+    (?P<skip>\s+|\#[^\n]*)
+  | (?P<long>\"\"\"(?:[^"\\]|\\.|"(?!""))*\"\"\"|'''(?:[^'\\]|\\.|'(?!''))*''')
+  | (?P<string>(?!\"\"\"|''')(?:"(?:[^"\\\n]|\\.)*"|'(?:[^'\\\n]|\\.)*'))
+  | (?P<iri><[^<>"{}|^`\\\x00-\x20]*>)
+  | (?P<open>["'<])
+  | (?P<word>(?:[^\s\#<>"'.\[\](){},;]|\.(?=[^\s\#<>"'.\[\](){},;]))+)
+  | (?P<end>\.)
+  | (?P<punct>.)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+# How the strings and IRIs left open at the end of a read are continued, by their opening delimiter: the pattern
+# of their content up to the next quote (or the end of the buffer), their closing delimiter and their kind of token
+_TURTLE_OPEN_TOKENS = {
+    '"""': (re.compile(r'(?:[^"\\]|\\.)*', re.DOTALL), '"""', "long"),
+    "'''": (re.compile(r"(?:[^'\\]|\\.)*", re.DOTALL), "'''", "long"),
+    '"': (re.compile(r'(?:[^"\\\n]|\\.)*', re.DOTALL), '"', "string"),
+    "'": (re.compile(r"(?:[^'\\\n]|\\.)*", re.DOTALL), "'", "string"),
+    "<": (re.compile(r'[^<>"{}|^`\\\x00-\x20]*'), ">", "iri"),
+}
+# Blank node labels are rewritten into IRIs with this prefix while splitting, so that they keep their identity
+# across the chunks (each chunk is parsed separately)
+_BNODE_IRI = "urn:x-sparqlwrapper:bnode:"
+
+
+def _splitTurtle(stream: Any, chunkSize: int = 2**20, readSize: int = 65536) -> Iterator[Tuple[str, str]]:
+    """Internal function splitting a Turtle (or N3) document into chunks of whole statements, read incrementally.
+
+    The scanner keeps its state (the current statement, the nesting depth, and the string or IRI left open by
+    the previous read) across the reads, so that each character is scanned once, whatever the size of the
+    statements and literals.
+
+    :param stream: a binary file-like object, like the HTTP response.
+    :param chunkSize: the size, in characters, above which a chunk is returned.
+    :type chunkSize: int
+    :param readSize: number of bytes to read from the stream at once.
+    :type readSize: int
+    :return: tuples with the prefix and base declarations read so far, and a chunk of statements (where labeled
+      blank nodes are IRIs starting with ``_BNODE_IRI``).
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    prologue = ""
+    chunk: List[str] = []
+    chunkLength = 0
+    buffer = ""
+    eof = False
+    # the tokens of the current statement, and the string or IRI being read: the text read so far, and how it
+    # is continued (see _TURTLE_OPEN_TOKENS)
+    pieces: List[str] = []
+    depth = 0
+    directive: Optional[str] = None
+    first = True
+    openToken: Optional[Tuple[List[str], "re.Pattern[str]", str, str]] = None
+    while not eof:
+        data = stream.read(readSize)
+        eof = not data
+        # only the token cut at the end of the previous read is left in the buffer
+        buffer += decoder.decode(data, final=eof)
+        pos = 0
+        while True:
+            if openToken is not None:
+                parts, content, closing, kind = openToken
+                while True:
+                    end = content.match(buffer, pos).end()  # type: ignore[union-attr]
+                    parts.append(buffer[pos:end])
+                    pos = end
+                    # a quote of a long string which does not close it
+                    if (
+                        kind == "long"
+                        and buffer.startswith(closing[0], pos)
+                        and not buffer.startswith(closing, pos)
+                        and (eof or len(buffer) - pos >= len(closing))
+                    ):
+                        parts.append(closing[0])
+                        pos += 1
+                    else:
+                        break
+                if buffer.startswith(closing, pos):
+                    parts.append(closing)
+                    pos += len(closing)
+                    text = "".join(parts)
+                    openToken = None
+                elif not eof and len(buffer) - pos < len(closing) + 1:
+                    # cut by the end of the buffer, maybe within an escape sequence or a closing delimiter
+                    break
+                else:
+                    # not a string or IRI after all (like the N3 "<=" operator): its opening character is a
+                    # punctuation character, and what follows is scanned again
+                    buffer = "".join(parts)[1:] + buffer[pos:]
+                    pos = 0
+                    kind, text = "punct", parts[0][0]
+                    openToken = None
+            else:
+                if pos >= len(buffer):
+                    break
+                match = _TURTLE_TOKENS.match(buffer, pos)
+                assert match is not None  # the "punct" alternative matches any character
+                kind, text = cast(str, match.lastgroup), match.group()
+                if not eof and kind == "open":
+                    if len(buffer) - pos < 3:
+                        # too short to tell whether it starts a long string
+                        break
+                    opening = buffer[pos : pos + 3] if buffer.startswith(('"""', "'''"), pos) else text
+                    openToken = ([opening],) + _TURTLE_OPEN_TOKENS[opening]
+                    pos += len(opening)
+                    continue
+                if not eof and match.end() == len(buffer):
+                    break
+                pos = match.end()
+
+            if kind == "skip":
+                pieces.append(text)
+                continue
+            if kind == "word":
+                if first:
+                    if text.lower() in ("@prefix", "@base"):
+                        directive = "@"
+                    elif text.lower() in ("prefix", "base"):
+                        directive = "sparql"
+                if text.startswith("_:"):
+                    text = "<%s%s>" % (_BNODE_IRI, text[2:])
+            elif kind == "punct":
+                if text in "[({":
+                    depth += 1
+                elif text in "])}":
+                    depth -= 1
+            pieces.append(text)
+            first = False
+
+            if (kind == "end" and depth == 0) or (kind == "iri" and directive == "sparql"):
+                statement = "".join(pieces)
+                if directive is not None:
+                    if chunk:
+                        yield prologue, "".join(chunk)
+                        chunk, chunkLength = [], 0
+                    prologue += statement.strip() + "\n"
+                else:
+                    chunk.append(statement)
+                    chunkLength += len(statement)
+                    if chunkLength >= chunkSize:
+                        yield prologue, "".join(chunk)
+                        chunk, chunkLength = [], 0
+                pieces = []
+                directive = None
+                first = True
+        buffer = buffer[pos:]
+
+    # what is left is either blank or an incomplete statement, for the parser to report
+    chunk.extend(pieces)
+    if "".join(chunk).strip():
+        yield prologue, "".join(chunk)
+
+
+class _TripleSink(object):
+    """Internal sink collecting the triples of the rdflib N-Triples parser."""
+
+    def __init__(self) -> None:
+        self.triples: List[Tuple[Any, Any, Any]] = []
+
+    def triple(self, s: Any, p: Any, o: Any) -> None:
+        self.triples.append((s, p, o))
+
+
+class Converter(NamedTuple):
+    """A converter of query results, as registered with :meth:`QueryResult.registerConverter`.
+
+    .. versionadded:: 2.0.1
+    """
+
+    format: str
+    """the format of the results, like :data:`JSON` or :data:`XML`."""
+    convert: Callable[["QueryResult"], Any]
+    """called with the :class:`QueryResult` to return the converted result (by :meth:`QueryResult.convert`)."""
+    stream: Optional[Callable[["QueryResult"], Iterable[Any]]] = None
+    """called with the :class:`QueryResult` to return an iterable over the converted result, read incrementally
+    (by :meth:`QueryResult.stream`); ``None`` if the format cannot be streamed."""
+    load: Optional[Callable[["QueryResult", Any], Any]] = None
+    """called with the :class:`QueryResult` and an RDFLib graph to parse the result into this graph and return it
+    (by :meth:`QueryResult.convert`); ``None`` if the format is not RDF."""
+
+
+def _callMethod(name: str) -> Callable[..., Any]:
+    """Internal function returning a function calling the method ``name`` of its first argument with the other
+    arguments (unlike :func:`operator.methodcaller`, which binds the arguments in advance)."""
+    return lambda obj, *args: getattr(obj, name)(*args)
+
+
+def _defaultConverters() -> Dict[str, Converter]:
+    """Internal function returning the built-in converters, keyed by media type. They call the ``_convert*``
+    methods, so that these can still be overridden in a subclass of :class:`QueryResult`."""
+    converters = {}
+    for mime, format in _RESPONSE_MEDIA_TYPES:
+        if mime not in converters:
+            converters[mime] = Converter(
+                format,
+                methodcaller(_FORMAT_CONVERTERS[format][2]),
+                methodcaller(_FORMAT_STREAMERS[format]) if format in _FORMAT_STREAMERS else None,
+                _callMethod(_FORMAT_LOADERS[format]) if format in _FORMAT_LOADERS else None,
+            )
+    return converters
+
+
 class QueryResult(object):
     """
     Wrapper around an a query result. Users should not create instances of this class, it is
@@ -1007,10 +2099,66 @@ class QueryResult(object):
     :ivar requestedFormat: The requested format. The possible values are: :data:`JSON`, :data:`XML`, :data:`RDFXML`,
     :data:`TURTLE`, :data:`N3`, :data:`RDF`, :data:`CSV`, :data:`TSV`, :data:`JSONLD`.
     :type requestedFormat: string
+    :ivar timing: The timing record of the query, for the results of :meth:`SPARQLWrapper.query`; otherwise
+    ``None``.
+    :type timing: :class:`SPARQLWrapper.timing.QueryTiming`
+    :ivar request: The HTTP request of the query, for the results of :meth:`SPARQLWrapper.query`; otherwise
+    ``None``.
+    :type request: :class:`urllib.request.Request`
+    :ivar memory: The memory profile of the conversions of the result, when it is enabled (see
+    :meth:`SPARQLWrapper.setMemoryProfiling`); otherwise ``None``. It can also be set to a new
+    :class:`SPARQLWrapper.memory.MemoryProfile` before converting any result.
+    :type memory: :class:`SPARQLWrapper.memory.MemoryProfile`
 
     """
 
-    ConvertResult = Union[bytes, str, Dict[Any, Any], "Graph", Document, None]
+    ConvertResult = Union[bytes, str, Dict[Any, Any], "Graph", "Document", None]
+
+    _converters: Dict[str, Converter] = _defaultConverters()
+
+    _middlewares: Tuple["Middleware", ...] = ()
+
+    xmlResultType = DOM
+    """the type of the converted SPARQL XML results: :data:`DOM`, :data:`ELEMENTTREE` or :data:`BINDINGS`.
+    The **default** value is :data:`DOM`."""
+
+    @classmethod
+    def registerConverter(
+        cls,
+        mediaType: Union[str, List[str]],
+        format: str,
+        convert: Callable[["QueryResult"], Any],
+        stream: Optional[Callable[["QueryResult"], Iterable[Any]]] = None,
+        load: Optional[Callable[["QueryResult", Any], Any]] = None,
+    ) -> None:
+        """Register a converter for the results sent with the given media type(s), replacing the previous one
+        if any. Registering on a subclass of :class:`QueryResult` does not affect its parent class.
+
+        For instance, to convert the JSON results with a faster parser::
+
+            QueryResult.registerConverter(
+                ["application/sparql-results+json", "application/json"],
+                JSON,
+                lambda result: orjson.loads(result.response.read()),
+            )
+
+        .. versionadded:: 2.0.1
+
+        :param mediaType: the media type(s) (like ``application/sparql-results+json``) of the results.
+        :type mediaType: string or list
+        :param format: the format of the results, like :data:`JSON` or :data:`XML`; returned by
+          :meth:`_get_responseFormat` and compared to the requested format.
+        :type format: string
+        :param convert: called with the :class:`QueryResult` to return the converted result.
+        :param stream: called with the :class:`QueryResult` to return an iterable over the converted result, read
+          incrementally. The **default** value is ``None`` (:meth:`stream` is not supported).
+        :param load: called with the :class:`QueryResult` and an RDFLib graph to parse the result into this graph.
+          The **default** value is ``None`` (:meth:`convert` does not accept a ``graph``).
+        """
+        if "_converters" not in cls.__dict__:
+            cls._converters = dict(cls._converters)
+        for mime in [mediaType] if isinstance(mediaType, str) else mediaType:
+            cls._converters[mime.strip().lower()] = Converter(format, convert, stream, load)
 
     def __init__(self, result: Union[HTTPResponse, Tuple[HTTPResponse, str]]) -> None:
         """
@@ -1022,6 +2170,12 @@ class QueryResult(object):
             self.requestedFormat = result[1]
         else:
             self.response = result
+        self._spool: Optional[io.BufferedReader] = None
+        self._info: Optional[KeyCaseInsensitiveDict[str]] = None
+        self._contentType: Optional[Tuple[str, str, Dict[str, str]]] = None
+        self.timing: Optional[QueryTiming] = None
+        self.request: Optional[urllib.request.Request] = None
+        self.memory: Optional["MemoryProfile"] = None
 
     def geturl(self) -> str:
         """Return the URL of the original call.
@@ -1037,33 +2191,167 @@ class QueryResult(object):
         :return: meta-information of the HTTP result.
         :rtype: dict
         """
-        return KeyCaseInsensitiveDict(dict(self.response.info()))
+        if self._info is None:
+            self._info = KeyCaseInsensitiveDict(dict(self.response.info()))
+        return self._info
+
+    def _getContentType(self) -> Optional[Tuple[str, str, Dict[str, str]]]:
+        """Internal method returning the Content-Type of the response, parsed once.
+
+        :return: the raw Content-Type value, its media type (in lower case) and its parameters; or ``None`` if
+          there is no Content-Type.
+        :rtype: tuple
+        """
+        if self._contentType is None:
+            info = self.info()
+            if "content-type" not in info:
+                return None
+            ct = info["content-type"]
+            mediaType, _, rest = ct.partition(";")
+            parameters = {}
+            for parameter in rest.split(";"):
+                name, sep, value = parameter.partition("=")
+                if sep:
+                    parameters[name.strip().lower()] = value.strip().strip('"')
+            self._contentType = (ct, mediaType.strip().lower(), parameters)
+        return self._contentType
+
+    def _getConverter(self) -> Optional[Converter]:
+        """Internal method returning the registered converter for the Content-Type of the response; or ``None``
+        if there is no Content-Type or it is unknown.
+        """
+        contentType = self._getContentType()
+        if contentType is None:
+            return None
+        ct, mediaType, _ = contentType
+        converter = self._converters.get(mediaType)
+        if converter is None:
+            # lenient matching, for endpoints sending unusual Content-Type values
+            for mime, _ in _RESPONSE_MEDIA_TYPES:
+                if mime in ct:
+                    return self._converters.get(mime)
+        return converter
 
     def __iter__(self) -> Iterator[bytes]:
         """Return an iterator object. This method is expected for the inclusion
         of the object in a standard ``for`` loop.
         """
-        return self.response.__iter__()
+        return self._getBody().__iter__()
 
     def __next__(self) -> bytes:
         """Method for the standard iterator."""
-        return next(self.response)
+        return next(self._spool if self._spool is not None else self.response)
+
+    def spool(self, threshold: int = 0) -> None:
+        """Read the whole response body now and keep it, so that the result can be converted (or iterated) several
+        times. Bodies up to ``threshold`` bytes are kept in memory; larger ones are written to a temporary file
+        which is then memory-mapped, so that they are not held in the Python heap.
+
+        .. versionadded:: 2.0.1
+
+        :param threshold: the maximum size, in bytes, of a body kept in memory. The **default** value is ``0``
+          (always use a temporary file).
+        :type threshold: int
+        """
+        if self._spool is not None:
+            return
+        import mmap
+        import tempfile
+
+        if self.timing is not None:
+            # the timing record is complete once the spooled body is converted, not once it is read
+            self.timing._busy += 1
+
+        with self._memoryProfile(), self._memoryStep("read"):
+            chunks: List[bytes] = []
+            size = 0
+            spoolFile = None
+            while True:
+                chunk = self.response.read(_SPOOL_CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if spoolFile is None and size > threshold:
+                    spoolFile = tempfile.TemporaryFile()
+                    spoolFile.writelines(chunks)
+                    chunks = []
+                if spoolFile is not None:
+                    spoolFile.write(chunk)
+                else:
+                    chunks.append(chunk)
+
+            buffer: Union[bytes, mmap.mmap]
+            if spoolFile is not None:
+                spoolFile.flush()
+                buffer = mmap.mmap(spoolFile.fileno(), 0, access=mmap.ACCESS_READ)
+                spoolFile.close()  # the mapping stays valid
+            else:
+                buffer = b"".join(chunks)
+            self._spool = io.BufferedReader(_BufferReader(buffer))
+        if self.timing is not None:
+            self.timing._busy -= 1
+
+    def _getBody(self) -> Union[io.BufferedReader, HTTPResponse]:
+        """Return the file-like object to read the response body from: the spooled body, rewound, if
+        :meth:`spool` has been called, otherwise the HTTP response itself (behind a proxy measuring the memory
+        allocated by its reads, when the memory is profiled).
+        """
+        body: Union[io.BufferedReader, HTTPResponse]
+        if self._spool is not None:
+            self._spool.seek(0)
+            body = self._spool
+        else:
+            body = self.response
+        if self.memory is not None:
+            from .memory import _ProfiledBody
+
+            return cast(HTTPResponse, _ProfiledBody(body, self.memory))
+        return body
+
+    def _readBody(self) -> Union[bytes, memoryview]:
+        """Return the whole response body: a view over the spooled body, which is not copied, if :meth:`spool` has
+        been called, otherwise the bytes read from the HTTP response."""
+        if self._spool is not None:
+            return cast(_BufferReader, self._spool.raw)._view
+        return self._getBody().read()
+
+    def _memoryProfile(self) -> ContextManager[None]:
+        """Internal method returning a context manager profiling the memory of a conversion, if it is enabled."""
+        return self.memory._profile() if self.memory is not None else contextlib.nullcontext()
+
+    def _memoryStep(self, name: str) -> ContextManager[None]:
+        """Internal method returning a context manager measuring the memory of a step of a conversion, if the
+        memory is profiled."""
+        return self.memory._step(name) if self.memory is not None else contextlib.nullcontext()
 
     def _convertJSON(self) -> Dict[Any, Any]:
         """
         Convert a JSON result into a Python dict. This method can be overwritten in a subclass
         for a different conversion method.
 
+        .. versionchanged:: 2.0.1
+           The result is parsed with orjson, simdjson or ujson if one of them is installed.
+
         :return: converted result.
         :rtype: dict
         """
-        json_str = json.loads(self.response.read().decode("utf-8"))
+        json_str = _jsonLoads(self._readBody())
         if isinstance(json_str, dict):
             return json_str
         else:
             raise TypeError(type(json_str))
 
-    def _convertXML(self) -> Document:
+    def _streamJSON(self) -> _JSONResultsReader:
+        """
+        Start reading a JSON result incrementally. The ``head`` of the result is available right away and iterating
+        over the returned reader yields the solutions one at a time (each one like the items of
+        ``results/bindings`` returned by :meth:`_convertJSON`), so that the whole result is never held in memory.
+
+        :return: a reader of the JSON result.
+        """
+        return _JSONResultsReader(self._getBody()).start()
+
+    def _convertXML(self) -> "Document":
         """
         Convert an XML result into a Python dom tree. This method can be overwritten in a
         subclass for a different conversion method.
@@ -1071,10 +2359,149 @@ class QueryResult(object):
         :return: converted result.
         :rtype: :class:`xml.dom.minidom.Document`
         """
-        doc: Any = parse(self.response)
+        from xml.dom.minidom import Document, parse
+
+        doc: Any = parse(self._getBody())
         rdoc = cast(Document, doc)
         return rdoc
 
+    def _convertXMLResults(self) -> "QueryResult.ConvertResult":
+        """
+        Convert an XML result according to :attr:`xmlResultType`: with :meth:`_convertXML` (the default),
+        :meth:`_convertXMLTree` or :meth:`_convertXMLBindings`.
+
+        .. versionadded:: 2.0.1
+
+        :return: converted result.
+        """
+        if self.xmlResultType == ELEMENTTREE:
+            return cast(QueryResult.ConvertResult, self._convertXMLTree())
+        elif self.xmlResultType == BINDINGS:
+            return self._convertXMLBindings()
+        return self._convertXML()
+
+    def _convertXMLTree(self) -> Any:
+        """
+        Convert an XML result into an ``ElementTree``, with lxml if it is installed (entities are not resolved and
+        nothing is fetched from the network), otherwise with :mod:`xml.etree.ElementTree`.
+
+        .. versionadded:: 2.0.1
+
+        :return: converted result.
+        """
+        etree = _getElementTree()
+        if hasattr(etree, "XSLT"):  # lxml
+            parser = etree.XMLParser(resolve_entities=False, no_network=True)
+            return etree.parse(self._getBody(), parser)
+        return etree.parse(self._getBody())
+
+    def _convertXMLBindings(self) -> Dict[str, Any]:
+        """
+        Convert a SPARQL XML result into a dictionary with the same structure as the converted JSON results
+        (``head``, and ``results/bindings`` or ``boolean``), without building a document tree.
+
+        .. versionadded:: 2.0.1
+
+        :return: converted result.
+        :rtype: dict
+        """
+        return self._collectResults(self._streamXML())
+
+    @staticmethod
+    def _collectResults(reader: Any) -> Dict[str, Any]:
+        """Internal method reading the solutions of a streaming reader into the same structure as the converted
+        JSON results."""
+        bindings = list(reader)
+        result: Dict[str, Any] = {"head": reader.head}
+        if reader.boolean is not None:
+            result["boolean"] = reader.boolean
+        else:
+            result["results"] = {"bindings": bindings}
+        return result
+
+    def _streamXML(self) -> _XMLResultsReader:
+        """
+        Start reading a SPARQL XML result incrementally. The ``head`` of the result is available right away and
+        iterating over the returned reader yields the solutions one at a time, like :meth:`_streamJSON`.
+
+        .. versionadded:: 2.0.1
+
+        :return: a reader of the XML result.
+        """
+        return _XMLResultsReader(self._getBody()).start()
+
+    def _convertBinary(self) -> Dict[str, Any]:
+        """
+        Convert an RDF4J binary query results table into a dictionary with the same structure as the converted JSON
+        results.
+
+        .. versionadded:: 2.0.1
+
+        :return: converted result.
+        :rtype: dict
+        """
+        return self._collectResults(self._streamBinary())
+
+    def _streamBinary(self) -> Any:
+        """
+        Start reading an RDF4J binary query results table incrementally, like :meth:`_streamJSON`.
+
+        .. versionadded:: 2.0.1
+
+        :return: a :class:`SPARQLWrapper.binary_results.RDF4JBinaryResultsReader`.
+        """
+        from .binary_results import RDF4JBinaryResultsReader
+
+        return RDF4JBinaryResultsReader(self._getBody()).start()
+
+    def _convertThrift(self) -> Dict[str, Any]:
+        """
+        Convert a Jena RDF Thrift result set into a dictionary with the same structure as the converted JSON
+        results.
+
+        .. versionadded:: 2.0.1
+
+        :return: converted result.
+        :rtype: dict
+        """
+        return self._collectResults(self._streamThrift())
+
+    def _streamThrift(self) -> Any:
+        """
+        Start reading a Jena RDF Thrift result set incrementally, like :meth:`_streamJSON`.
+
+        .. versionadded:: 2.0.1
+
+        :return: a :class:`SPARQLWrapper.binary_results.ThriftResultsReader`.
+        """
+        from .binary_results import ThriftResultsReader
+
+        return ThriftResultsReader(self._getBody()).start()
+
+    def _convertProtobuf(self) -> Dict[str, Any]:
+        """
+        Convert a Jena RDF Protobuf result set into a dictionary with the same structure as the converted JSON
+        results.
+
+        .. versionadded:: 2.0.1
+
+        :return: converted result.
+        :rtype: dict
+        """
+        return self._collectResults(self._streamProtobuf())
+
+    def _streamProtobuf(self) -> Any:
+        """
+        Start reading a Jena RDF Protobuf result set incrementally, like :meth:`_streamJSON`.
+
+        .. versionadded:: 2.0.1
+
+        :return: a :class:`SPARQLWrapper.binary_results.ProtobufResultsReader`.
+        """
+        from .binary_results import ProtobufResultsReader
+
+        return ProtobufResultsReader(self._getBody()).start()
+
     def _convertRDF(self) -> "Dataset":
         """
         Convert a RDF/XML result into an RDFLib Graph. This method can be overwritten
@@ -1084,10 +2511,25 @@ class QueryResult(object):
         :rtype: :class:`rdflib.graph.Graph`
         """
         from rdflib import Dataset
+
         retval = Dataset()
-        retval.parse(self.response, format="xml")
+        self._loadRDF(retval)
         return retval
 
+    def _loadRDF(self, graph: "Graph") -> "Graph":
+        """
+        Parse a RDF/XML result into the given graph.
+
+        .. versionadded:: 2.0.1
+
+        :param graph: the RDFLib ``Graph`` or ``Dataset`` to parse the result into.
+        :type graph: :class:`rdflib.graph.Graph`
+        :return: the graph.
+        :rtype: :class:`rdflib.graph.Graph`
+        """
+        graph.parse(self._getBody(), format="xml")
+        return graph
+
     def _convertN3(self) -> bytes:
         """
         Convert a RDF Turtle/N3 result into a string. This method can be overwritten in a subclass
@@ -1096,7 +2538,106 @@ class QueryResult(object):
         :return: converted result.
         :rtype: string
         """
-        return self.response.read()
+        return self._getBody().read()
+
+    def _streamTriples(self) -> Iterator[Tuple[Any, Any, Any]]:
+        """
+        Read a CONSTRUCT or DESCRIBE result incrementally, with :meth:`_streamNTriples` for N-Triples and with
+        :meth:`_streamTurtle` for Turtle and N3.
+
+        .. versionadded:: 2.0.1
+
+        :return: an iterator over the ``(subject, predicate, object)`` triples, as RDFLib terms.
+        """
+        contentType = self._getContentType()
+        mediaType = contentType[1] if contentType else ""
+        if mediaType == "application/n-triples":
+            return self._streamNTriples()
+        elif mediaType in ("text/n3", "text/rdf+n3", "application/n3"):
+            return self._streamTurtle(format="n3")
+        return self._streamTurtle()
+
+    def _streamNTriples(self, chunkLines: int = 10000) -> Iterator[Tuple[Any, Any, Any]]:
+        """
+        Read an N-Triples result incrementally, parsing ``chunkLines`` lines at a time, so that the whole result (or
+        a graph of it) is never held in memory. Blank nodes with the same label are the same across the chunks.
+
+        .. versionadded:: 2.0.1
+
+        :param chunkLines: number of lines parsed at once.
+        :type chunkLines: int
+        :return: an iterator over the ``(subject, predicate, object)`` triples, as RDFLib terms.
+        """
+        from rdflib.plugins.parsers.ntriples import W3CNTriplesParser
+
+        sink = _TripleSink()
+        parser = W3CNTriplesParser(cast(Any, sink))
+        bnodes: Dict[str, Any] = {}
+        body = self._getBody()
+        while True:
+            lines = list(itertools.islice(body, chunkLines))
+            if not lines:
+                break
+            parser.parsestring(b"".join(lines), bnode_context=bnodes)
+            yield from sink.triples
+            sink.triples = []
+
+    def _streamTurtle(self, chunkSize: int = 2**20, format: str = "turtle") -> Iterator[Tuple[Any, Any, Any]]:
+        """
+        Read a Turtle (or N3) result incrementally: the result is split into chunks of about ``chunkSize``
+        characters of whole statements, each one parsed by RDFLib with the prefixes declared before it. Blank nodes
+        with the same label are the same across the chunks, and new ones for each result (as with RDFLib's own
+        parsers, the labels of two results do not name the same nodes).
+
+        .. versionadded:: 2.0.1
+
+        :param chunkSize: size, in characters, of the chunks parsed at once.
+        :type chunkSize: int
+        :param format: the RDFLib parser, ``turtle`` or ``n3``.
+        :type format: string
+        :return: an iterator over the ``(subject, predicate, object)`` triples, as RDFLib terms.
+        """
+        from rdflib import BNode, Graph, URIRef
+
+        bnodes: Dict[str, Any] = {}
+
+        def term(node: Any) -> Any:
+            if isinstance(node, URIRef) and node.startswith(_BNODE_IRI):
+                label = node[len(_BNODE_IRI) :]
+                bnode = bnodes.get(label)
+                if bnode is None:
+                    bnode = bnodes[label] = BNode()
+                return bnode
+            return node
+
+        for prologue, chunk in _splitTurtle(self._getBody(), chunkSize):
+            graph = Graph().parse(data=prologue + chunk, format=format)
+            for s, p, o in graph:
+                yield term(s), term(p), term(o)
+
+    def _loadTriples(self, graph: "Graph", batchSize: int = _LOAD_BATCH_SIZE) -> "Graph":
+        """
+        Parse a Turtle, N3 or N-Triples result into the given graph: the triples read by :meth:`_streamTriples`
+        are added ``batchSize`` at a time (with ``addN``), without building an intermediate graph. The triples
+        of a ``Dataset`` go to its default graph.
+
+        .. versionadded:: 2.0.1
+
+        :param graph: the RDFLib ``Graph`` or ``Dataset`` to parse the result into.
+        :type graph: :class:`rdflib.graph.Graph`
+        :param batchSize: number of triples added at once.
+        :type batchSize: int
+        :return: the graph.
+        :rtype: :class:`rdflib.graph.Graph`
+        """
+        context = getattr(graph, "default_context", graph)
+        triples = self._streamTriples()
+        while True:
+            batch = list(itertools.islice(triples, batchSize))
+            if not batch:
+                break
+            graph.addN((s, p, o, context) for s, p, o in batch)
+        return graph
 
     def _convertCSV(self) -> bytes:
         """
@@ -1106,7 +2647,7 @@ class QueryResult(object):
         :return: converted result.
         :rtype: string
         """
-        return self.response.read()
+        return self._getBody().read()
 
     def _convertTSV(self) -> bytes:
         """
@@ -1116,7 +2657,7 @@ class QueryResult(object):
         :return: converted result.
         :rtype: string
         """
-        return self.response.read()
+        return self._getBody().read()
 
     def _convertJSONLD(self) -> "Dataset":
         """
@@ -1129,10 +2670,24 @@ class QueryResult(object):
         from rdflib import Dataset
 
         retval = Dataset()
-        retval.parse(self.response, format="json-ld")
+        self._loadJSONLD(retval)
         return retval
 
-    def convert(self) -> ConvertResult:
+    def _loadJSONLD(self, graph: "Graph") -> "Graph":
+        """
+        Parse a RDF JSON-LD result into the given graph.
+
+        .. versionadded:: 2.0.1
+
+        :param graph: the RDFLib ``Graph`` or ``Dataset`` to parse the result into.
+        :type graph: :class:`rdflib.graph.Graph`
+        :return: the graph.
+        :rtype: :class:`rdflib.graph.Graph`
+        """
+        graph.parse(self._getBody(), format="json-ld")
+        return graph
+
+    def convert(self, graph: Optional["Graph"] = None) -> ConvertResult:
         """
         Encode the return value depending on the return format:
 
@@ -1142,24 +2697,43 @@ class QueryResult(object):
             * in the case of :data:`JSON-LD<JSONLD>`, the value is converted via RDFLib into a ``RDFLib Graph`` instance
             * in the case of RDF :data:`Turtle<TURTLE>`/:data:`N3`, a string is returned
             * in the case of :data:`CSV`/:data:`TSV`, a string is returned
+            * in the case of :data:`BINARY`/:data:`THRIFT`/:data:`PROTOBUF`, a dictionary like the converted JSON
+              results is returned
             * In all other cases the input simply returned.
 
+        When a ``graph`` is given, the RDF results (:data:`RDF/XML<RDFXML>`, :data:`JSON-LD<JSONLD>`,
+        :data:`Turtle<TURTLE>`/:data:`N3` and N-Triples) are parsed directly into it instead, for instance into a
+        graph backed by a persistent store, and the graph is returned.
+
+        :param graph: the RDFLib ``Graph`` or ``Dataset`` (over any store) to parse the results into. The
+          **default** value is ``None``.
+        :type graph: :class:`rdflib.graph.Graph`
         :return: the converted query result. See the conversion methods for more details.
+        :raises ValueError: if a ``graph`` is given but the results are not RDF.
         """
-
-        def _content_type_in_list(real: str, expected: List[str]) -> bool:
-            """Internal method for checking if the content-type header received matches any of the content types of
-            the expected list.
-
-            :param real: The content-type header received.
-            :type real: string
-            :param expected: A list of expected content types.
-            :type expected: list
-            :return: Returns a boolean after checking if the content-type header received matches any of the content
-            types of the expected list.
-            :rtype: boolean
-            """
-            return True in [real.find(mime) != -1 for mime in expected]
+        timing = self.timing
+        if timing is None:
+            with self._memoryProfile(), self._memoryStep("convert"):
+                converted = self._convert(graph)
+        else:
+            timing._busy += 1
+            downloaded = timing.download or 0.0
+            start = time.perf_counter()
+            try:
+                with self._memoryProfile(), self._memoryStep("convert"):
+                    converted = self._convert(graph)
+            finally:
+                # the time spent reading the body is counted in the download phase
+                elapsed = time.perf_counter() - start - ((timing.download or 0.0) - downloaded)
+                timing.convert = (timing.convert or 0.0) + elapsed
+                timing._busy -= 1
+                timing._finish()
+        for middleware in reversed(self._middlewares):
+            converted = middleware.on_convert(self, converted)
+        return converted
+
+    def _convert(self, graph: Optional["Graph"]) -> ConvertResult:
+        """Internal method converting the result, see :meth:`convert`."""
 
         def _validate_format(
             format_name: str, allowed: List[str], mime: str, requested: str
@@ -1183,42 +2757,50 @@ class QueryResult(object):
 
         # TODO. In order to compare properly, the requested QueryType (SPARQL Query Form) is needed. For instance,
         # the unexpected N3 requested for a SELECT would return XML
-        if "content-type" in self.info():
-            ct = self.info()["content-type"]  # returned Content-Type value
-
-            if _content_type_in_list(ct, _SPARQL_XML):
-                _validate_format("XML", [XML], ct, self.requestedFormat)
-                return self._convertXML()
-            elif _content_type_in_list(ct, _XML):
-                _validate_format("XML", [XML], ct, self.requestedFormat)
-                return self._convertXML()
-            elif _content_type_in_list(ct, _SPARQL_JSON):
-                _validate_format("JSON", [JSON], ct, self.requestedFormat)
-                return self._convertJSON()
-            elif _content_type_in_list(ct, _RDF_XML):
-                _validate_format(
-                    "RDF/XML", [RDF, XML, RDFXML], ct, self.requestedFormat
+        contentType = self._getContentType()
+        converter = self._getConverter()
+        if graph is not None and (converter is None or converter.load is None):
+            raise ValueError(
+                "results of content type '%s' cannot be parsed into a graph"
+                % (contentType[0] if contentType else None)
+            )
+        if contentType is not None:
+            ct = contentType[0]  # returned Content-Type value
+            if converter is not None:
+                format_name, allowed, _ = _FORMAT_CONVERTERS.get(
+                    converter.format, (converter.format.upper(), [converter.format], "")
                 )
-                return self._convertRDF()
-            elif _content_type_in_list(ct, _RDF_N3):
-                _validate_format("N3", [N3, TURTLE], ct, self.requestedFormat)
-                return self._convertN3()
-            elif _content_type_in_list(ct, _CSV):
-                _validate_format("CSV", [CSV], ct, self.requestedFormat)
-                return self._convertCSV()
-            elif _content_type_in_list(ct, _TSV):
-                _validate_format("TSV", [TSV], ct, self.requestedFormat)
-                return self._convertTSV()
-            elif _content_type_in_list(ct, _RDF_JSONLD):
-                _validate_format("JSON(-LD)", [JSONLD, JSON], ct, self.requestedFormat)
-                return self._convertJSONLD()
+                _validate_format(format_name, allowed, ct, self.requestedFormat)
+                if graph is not None and converter.load is not None:
+                    return cast(QueryResult.ConvertResult, converter.load(self, graph))
+                return cast(QueryResult.ConvertResult, converter.convert(self))
             else:
                 warnings.warn(
                     "unknown response content type '%s' returning raw response..."
                     % (ct),
                     RuntimeWarning,
                 )
-        return self.response.read()
+        return self._getBody().read()
+
+    def stream(self) -> Iterable[Any]:
+        """Convert the result incrementally, with the streaming variant of the registered converter (see
+        :meth:`registerConverter`). For :data:`JSON` and :data:`XML` results, this is an iterator over the solutions,
+        whose ``head`` and ``boolean`` attributes hold the rest of the result; for :data:`TURTLE` and :data:`N3`
+        results (including N-Triples), an iterator over the triples.
+
+        .. versionadded:: 2.0.1
+
+        :return: an iterable over the converted result.
+        :raises ValueError: if there is no streaming converter for the Content-Type of the response.
+        """
+        converter = self._getConverter()
+        if converter is None or converter.stream is None:
+            contentType = self._getContentType()
+            raise ValueError(
+                "no streaming converter for content type '%s'"
+                % (contentType[0] if contentType else None)
+            )
+        return converter.stream(self)
 
     def _get_responseFormat(self) -> Optional[str]:
         """
@@ -1233,48 +2815,18 @@ class QueryResult(object):
         :rtype: string
         """
 
-        def _content_type_in_list(real: str, expected: List[str]) -> bool:
-            """Internal method for checking if the content-type header received matches any of the content types of
-            the expected list.
-
-            :param real: The content-type header received.
-            :type real: string
-            :param expected: A list of expected content types.
-            :type expected: list
-            :return: Returns a boolean after checking if the content-type header received matches any of the content
-            types of the expected list.
-            :rtype: boolean
-            """
-            return True in [real.find(mime) != -1 for mime in expected]
-
-        if "content-type" in self.info():
-            ct = self.info()["content-type"]  # returned Content-Type value
-
-            if _content_type_in_list(ct, _SPARQL_XML):
-                return XML
-            elif _content_type_in_list(ct, _XML):
-                return XML
-            elif _content_type_in_list(ct, _SPARQL_JSON):
-                return JSON
-            elif _content_type_in_list(ct, _RDF_XML):
-                return RDFXML
-            elif _content_type_in_list(ct, _RDF_TURTLE):
-                return TURTLE
-            elif _content_type_in_list(ct, _RDF_N3):
-                return N3
-            elif _content_type_in_list(ct, _CSV):
-                return CSV
-            elif _content_type_in_list(ct, _TSV):
-                return TSV
-            elif _content_type_in_list(ct, _RDF_JSONLD):
-                return JSONLD
-            else:
-                warnings.warn(
-                    "Unknown response content type. Returning raw content-type ('%s')."
-                    % (ct),
-                    RuntimeWarning,
-                )
-                return ct
+        contentType = self._getContentType()
+        if contentType is not None:
+            converter = self._getConverter()
+            if converter is not None:
+                return converter.format
+            ct = contentType[0]  # returned Content-Type value
+            warnings.warn(
+                "Unknown response content type. Returning raw content-type ('%s')."
+                % (ct),
+                RuntimeWarning,
+            )
+            return ct
         return None
 
     def print_results(self, minWidth: Optional[int] = None) -> None:
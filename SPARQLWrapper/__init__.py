@@ -15,11 +15,12 @@ __version__ = "2.0.1a0"
 __agent__: str = f"sparqlwrapper {__version__} (rdflib.github.io/sparqlwrapper)"
 
 
-from .SmartWrapper import SPARQLWrapper2
-from .sparql_dataframe import get_sparql_dataframe
+from typing import TYPE_CHECKING, Any, List
+
 from .Wrapper import (
     ASK,
     BASIC,
+    BINARY,
     CONSTRUCT,
     CSV,
     DELETE,
@@ -32,9 +33,11 @@ from .Wrapper import (
     N3,
     POST,
     POSTDIRECTLY,
+    PROTOBUF,
     RDF,
     RDFXML,
     SELECT,
+    THRIFT,
     TSV,
     TURTLE,
     URLENCODED,
@@ -48,6 +51,7 @@ __all__ = [
     "get_sparql_dataframe",
     "ASK",
     "BASIC",
+    "BINARY",
     "CONSTRUCT",
     "CSV",
     "DELETE",
@@ -60,9 +64,11 @@ __all__ = [
     "N3",
     "POST",
     "POSTDIRECTLY",
+    "PROTOBUF",
     "RDF",
     "RDFXML",
     "SELECT",
+    "THRIFT",
     "TSV",
     "TURTLE",
     "URLENCODED",
@@ -70,3 +76,28 @@ __all__ = [
     "QueryResult",
     "SPARQLWrapper",
 ]
+
+if TYPE_CHECKING:
+    from .SmartWrapper import SPARQLWrapper2
+    from .sparql_dataframe import get_sparql_dataframe
+
+# names loaded on first access, so that ``import SPARQLWrapper`` does not pay for them
+_lazy_attributes = {
+    "SPARQLWrapper2": "SmartWrapper",
+    "get_sparql_dataframe": "sparql_dataframe",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name in _lazy_attributes:
+        import importlib
+
+        module = importlib.import_module("." + _lazy_attributes[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+
+def __dir__() -> List[str]:
+    return sorted(list(globals()) + list(_lazy_attributes))
@@ -0,0 +1,564 @@
+# -*- coding: utf-8 -*-
+
+"""
+Incremental readers for binary SPARQL SELECT result formats, which encode the terms in fewer bytes than the
+SPARQL XML and JSON formats:
+
+* the `RDF4J binary query results table <https://rdf4j.org/documentation/reference/rdf4j-binary/>`_ format
+  (``application/x-binary-rdf-results-table``), with IRIs split into dictionary-encoded namespaces and local names;
+* the `Apache Jena <https://jena.apache.org/documentation/io/rdf-binary.html>`_ RDF Thrift
+  (``application/sparql-results+thrift``) and RDF Protobuf (``application/sparql-results+protobuf``) result set
+  formats.
+
+As for the SPARQL JSON and XML readers of :mod:`SPARQLWrapper.Wrapper`, iterating over a reader yields the solutions
+one at a time, with the same structure as the items of ``results/bindings`` of the converted JSON results, and
+:meth:`start` reads the response up to the first solution, so that :attr:`head` is available. Only the current chunk
+of the response is kept in memory. The readers are used by :meth:`SPARQLWrapper.Wrapper.QueryResult.stream` and
+:meth:`SPARQLWrapper.Wrapper.QueryResult.convert` for the :data:`~SPARQLWrapper.Wrapper.BINARY`,
+:data:`~SPARQLWrapper.Wrapper.THRIFT` and :data:`~SPARQLWrapper.Wrapper.PROTOBUF` return formats.
+
+.. note::
+  The readers are written in pure Python, so that these formats need no dependency (nor the schemas of Jena
+  compiled for the Thrift and Protocol Buffers libraries). They decode the results several times slower than the
+  JSON results are parsed by the C parsers (about 3 times for the RDF4J format, and up to 20 times for the Jena
+  formats, see the ``convert/select-*`` benchmarks of ``benchmarks/bench_suite.py``): they save bandwidth and
+  memory on the endpoint and on the network, not parse time. Prefer :data:`~SPARQLWrapper.Wrapper.JSON` when the
+  conversion time matters more than the size of the response.
+
+.. versionadded:: 2.0.1
+"""
+
+import decimal
+import math
+import struct
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+_XSD = "http://www.w3.org/2001/XMLSchema#"
+
+# Record markers of the RDF4J binary format (org.eclipse.rdf4j.query.resultio.binary.BinaryQueryResultConstants)
+_BRTR_MAGIC_NUMBER = b"BRTR"
+_BRTR_NULL = 0
+_BRTR_REPEAT = 1
+_BRTR_NAMESPACE = 2
+_BRTR_QNAME = 3
+_BRTR_URI = 4
+_BRTR_BNODE = 5
+_BRTR_PLAIN_LITERAL = 6
+_BRTR_LANG_LITERAL = 7
+_BRTR_DATATYPE_LITERAL = 8
+_BRTR_EMPTY_ROW = 9
+_BRTR_TRIPLE = 10
+_BRTR_ERROR = 126
+_BRTR_TABLE_END = 127
+_BRTR_INT = struct.Struct(">i").unpack_from
+
+# Types of the Thrift compact protocol
+_THRIFT_STOP = 0
+_THRIFT_TRUE = 1
+_THRIFT_FALSE = 2
+_THRIFT_BYTE = 3
+_THRIFT_I16 = 4
+_THRIFT_I32 = 5
+_THRIFT_I64 = 6
+_THRIFT_DOUBLE = 7
+_THRIFT_BINARY = 8
+_THRIFT_LIST = 9
+_THRIFT_SET = 10
+_THRIFT_MAP = 11
+_THRIFT_STRUCT = 12
+
+# Wire types of Protocol Buffers
+_PROTOBUF_VARINT = 0
+_PROTOBUF_FIXED64 = 1
+_PROTOBUF_LENGTH_DELIMITED = 2
+_PROTOBUF_FIXED32 = 5
+
+# Field numbers of the RDF_Term union of the Jena schemas (BinaryRDF.thrift and binary-rdf.proto), which differ
+_THRIFT_TERM_FIELDS = {
+    1: "iri",
+    2: "bnode",
+    3: "literal",
+    4: "prefixName",
+    5: "variable",
+    6: "any",
+    7: "undefined",
+    8: "repeat",
+    9: "tripleTerm",
+    10: "valInteger",
+    11: "valDouble",
+    12: "valDecimal",
+}
+_PROTOBUF_TERM_FIELDS = {
+    1: "iri",
+    2: "bnode",
+    3: "literal",
+    4: "prefixName",
+    5: "variable",
+    6: "tripleTerm",
+    7: "any",
+    8: "undefined",
+    9: "repeat",
+    20: "valInteger",
+    21: "valDouble",
+    22: "valDecimal",
+}
+
+
+def _zigzag(n: int) -> int:
+    return (n >> 1) ^ -(n & 1)
+
+
+def _doubleLexical(value: float) -> str:
+    if math.isnan(value):
+        return "NaN"
+    elif math.isinf(value):
+        return "INF" if value > 0 else "-INF"
+    return repr(value)
+
+
+def _decimalLexical(value: int, scale: int) -> str:
+    return format(decimal.Decimal(value).scaleb(-scale), "f")
+
+
+class _BinaryResultsReader(ABC):
+    """
+    Base class of the readers, buffering the response. Subclasses implement :meth:`_readHead` and :meth:`_readRows`.
+
+    :ivar head: the ``head`` of the results (``vars``), or an empty dictionary if not read (yet).
+    :vartype head: dict
+    :ivar boolean: always ``None``, as these formats are only used for SELECT results.
+    :vartype boolean: bool
+    """
+
+    _formatName = "binary"
+
+    def __init__(self, stream: Any, chunkSize: int = 65536) -> None:
+        """
+        :param stream: a binary file-like object, like the HTTP response.
+        :param chunkSize: number of bytes to read from the stream at once.
+        :type chunkSize: int
+        """
+        self.stream = stream
+        self.chunkSize = chunkSize
+        self.head: Dict[str, Any] = {}
+        self.boolean: Optional[bool] = None
+        self._buffer = b""
+        self._pos = 0
+        self._rows: Optional[Iterator[Dict[str, Dict[str, Any]]]] = None
+
+    def start(self) -> "_BinaryResultsReader":
+        """Read the response up to the first solution.
+
+        :return: the reader itself.
+        """
+        if self._rows is None:
+            self._readHead()
+            self._rows = self._readRows()
+        return self
+
+    def __iter__(self) -> Iterator[Dict[str, Dict[str, Any]]]:
+        return self.start()._rows  # type: ignore[return-value]
+
+    @abstractmethod
+    def _readHead(self) -> None:
+        """Read the response up to the first solution, filling :attr:`head`."""
+
+    @abstractmethod
+    def _readRows(self) -> Iterator[Dict[str, Dict[str, Any]]]:
+        """Read the solutions, after the head."""
+
+    def _fill(self, size: int) -> bool:
+        """Read the stream until ``size`` bytes are buffered; return ``False`` if it ends before."""
+        if len(self._buffer) - self._pos >= size:
+            return True
+        chunks = [self._buffer[self._pos :]]
+        available = len(chunks[0])
+        while available < size:
+            chunk = self.stream.read(max(self.chunkSize, size - available))
+            if not chunk:
+                break
+            chunks.append(chunk)
+            available += len(chunk)
+        self._buffer = b"".join(chunks)
+        self._pos = 0
+        return available >= size
+
+    def _read(self, size: int) -> bytes:
+        if not self._fill(size):
+            raise ValueError("truncated %s results" % self._formatName)
+        data = self._buffer[self._pos : self._pos + size]
+        self._pos += size
+        return data
+
+    def _byte(self) -> int:
+        if self._pos >= len(self._buffer) and not self._fill(1):
+            raise ValueError("truncated %s results" % self._formatName)
+        self._pos += 1
+        return self._buffer[self._pos - 1]
+
+    def _atEnd(self) -> bool:
+        return not self._fill(1)
+
+    def _varint(self) -> int:
+        result = shift = 0
+        while True:
+            byte = self._byte()
+            result |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return result
+            shift += 7
+
+
+class RDF4JBinaryResultsReader(_BinaryResultsReader):
+    """
+    Incremental reader for the RDF4J binary query results table format (``application/x-binary-rdf-results-table``,
+    format version 2 or later).
+    """
+
+    _formatName = "RDF4J binary"
+
+    def _int(self) -> int:
+        return int(struct.unpack(">i", self._read(4))[0])
+
+    def _string(self) -> str:
+        return self._read(self._int()).decode("utf-8")
+
+    def _readHead(self) -> None:
+        if self._read(4) != _BRTR_MAGIC_NUMBER:
+            raise ValueError("not an RDF4J binary results table")
+        version = self._int()
+        if version < 2:
+            raise ValueError("unsupported RDF4J binary results table version %d" % version)
+        self.head = {"vars": [self._string() for _ in range(self._int())]}
+
+    def _readRows(self) -> Iterator[Dict[str, Dict[str, Any]]]:
+        # the records are decoded from the buffer; when one is cut at its end, more is read and it is decoded again
+        variables = self.head["vars"]
+        width = len(variables)
+        namespaces: Dict[int, str] = {}
+        previous: List[Optional[Dict[str, Any]]] = [None] * width
+        row: List[Optional[Dict[str, Any]]] = []
+        decode = self._decode
+        while True:
+            buffer, pos = self._buffer, self._pos
+            try:
+                marker = buffer[pos]
+                if marker == _BRTR_TABLE_END:
+                    self._pos = pos + 1
+                    return
+                elif marker == _BRTR_NAMESPACE:
+                    nsID = _BRTR_INT(buffer, pos + 1)[0]
+                    namespace, pos = _brtrString(buffer, pos + 5)
+                    namespaces[nsID] = namespace
+                    # not a value: the row is not complete (nor started) after it
+                    self._pos = pos
+                    continue
+                elif marker == _BRTR_ERROR:
+                    message, pos = _brtrString(buffer, pos + 2)  # after the error type
+                    raise ValueError("error in the RDF4J binary results: %s" % message)
+                elif marker == _BRTR_EMPTY_ROW:
+                    self._pos = pos + 1
+                    yield {}
+                    continue
+                elif marker == _BRTR_REPEAT:
+                    row.append(previous[len(row)])
+                    pos += 1
+                else:
+                    term, pos = decode(buffer, pos, namespaces)
+                    row.append(term)
+            except (IndexError, struct.error):
+                if not self._fill(len(self._buffer) - self._pos + 1):
+                    raise ValueError("truncated %s results" % self._formatName)
+                continue
+            self._pos = pos
+            if len(row) == width:
+                yield {var: term for var, term in zip(variables, row) if term is not None}
+                previous, row = row, []
+
+    def _decode(self, buffer: bytes, pos: int, namespaces: Dict[int, str]) -> Tuple[Optional[Dict[str, Any]], int]:
+        """Decode the value starting at ``pos`` in ``buffer``; return it and the position after it."""
+        marker = buffer[pos]
+        pos += 1
+        while marker == _BRTR_NAMESPACE:
+            nsID = _BRTR_INT(buffer, pos)[0]
+            namespaces[nsID], pos = _brtrString(buffer, pos + 4)
+            marker = buffer[pos]
+            pos += 1
+        if marker == _BRTR_QNAME:
+            nsID = _BRTR_INT(buffer, pos)[0]
+            localName, pos = _brtrString(buffer, pos + 4)
+            return {"type": "uri", "value": namespaces[nsID] + localName}, pos
+        elif marker == _BRTR_NULL:
+            return None, pos
+        elif marker == _BRTR_URI:
+            value, pos = _brtrString(buffer, pos)
+            return {"type": "uri", "value": value}, pos
+        elif marker == _BRTR_BNODE:
+            value, pos = _brtrString(buffer, pos)
+            return {"type": "bnode", "value": value}, pos
+        elif marker == _BRTR_PLAIN_LITERAL:
+            value, pos = _brtrString(buffer, pos)
+            return {"type": "literal", "value": value}, pos
+        elif marker == _BRTR_LANG_LITERAL:
+            value, pos = _brtrString(buffer, pos)
+            language, pos = _brtrString(buffer, pos)
+            return {"type": "literal", "value": value, "xml:lang": language}, pos
+        elif marker == _BRTR_DATATYPE_LITERAL:
+            value, pos = _brtrString(buffer, pos)
+            datatype, pos = self._decode(buffer, pos, namespaces)
+            if datatype is None or datatype["type"] != "uri":
+                raise ValueError("invalid datatype in the RDF4J binary results")
+            return {"type": "literal", "value": value, "datatype": datatype["value"]}, pos
+        elif marker == _BRTR_TRIPLE:
+            subject, pos = self._decode(buffer, pos, namespaces)
+            predicate, pos = self._decode(buffer, pos, namespaces)
+            object, pos = self._decode(buffer, pos, namespaces)
+            return {"type": "triple", "value": {"subject": subject, "predicate": predicate, "object": object}}, pos
+        raise ValueError("unknown record type %d in the RDF4J binary results" % marker)
+
+
+def _brtrString(buffer: bytes, pos: int) -> Tuple[str, int]:
+    """Decode the string starting at ``pos`` in ``buffer`` (its length, then its UTF-8 bytes); return it and the
+    position after it."""
+    end = pos + 4 + _BRTR_INT(buffer, pos)[0]
+    if end > len(buffer):
+        raise IndexError(end)
+    return buffer[pos + 4 : end].decode("utf-8"), end
+
+
+class _JenaResultsReader(_BinaryResultsReader):
+    """
+    Base class of the readers of the Jena binary result sets: a ``RDF_VarTuple`` with the variables, then a
+    ``RDF_DataTuple`` for each solution. Subclasses decode the messages into dictionaries keyed by field name.
+    """
+
+    _termFields: Dict[int, str] = {}
+
+    @abstractmethod
+    def _readVarTuple(self) -> Optional[Dict[int, Any]]:
+        """Read the ``RDF_VarTuple`` message; return ``None`` at the end of the response."""
+
+    @abstractmethod
+    def _readDataTuple(self) -> Optional[Dict[int, Any]]:
+        """Read the next ``RDF_DataTuple`` message; return ``None`` at the end of the response."""
+
+    def _readHead(self) -> None:
+        message = self._readVarTuple()
+        variables = message.get(1, []) if message is not None else []
+        self.head = {"vars": [self._text(var.get(1, b"")) for var in variables]}
+
+    def _readRows(self) -> Iterator[Dict[str, Dict[str, Any]]]:
+        variables = self.head["vars"]
+        previous: List[Optional[Dict[str, Any]]] = [None] * len(variables)
+        while True:
+            message = self._readDataTuple()
+            if message is None:
+                return
+            row: List[Optional[Dict[str, Any]]] = []
+            for term in message.get(1, []):
+                if term and self._termFields.get(min(term)) == "repeat":
+                    row.append(previous[len(row)])
+                else:
+                    row.append(self._term(term))
+            yield {var: term for var, term in zip(variables, row) if term is not None}
+            previous = row
+
+    @staticmethod
+    def _text(value: Any) -> str:
+        return value.decode("utf-8") if isinstance(value, bytes) else str(value)
+
+    def _term(self, term: Dict[int, Any]) -> Optional[Dict[str, Any]]:
+        if not term:
+            raise ValueError("empty term in the %s results" % self._formatName)
+        field = min(term)
+        kind = self._termFields.get(field)
+        value = term[field]
+        if kind == "iri":
+            return {"type": "uri", "value": self._text(value.get(1, b""))}
+        elif kind == "bnode":
+            return {"type": "bnode", "value": self._text(value.get(1, b""))}
+        elif kind == "literal":
+            literal = {"type": "literal", "value": self._text(value.get(1, b""))}
+            if value.get(2):
+                literal["xml:lang"] = self._text(value[2])
+            elif value.get(3):
+                literal["datatype"] = self._text(value[3])
+            elif 4 in value:
+                raise ValueError("prefixed names are not supported in the %s results" % self._formatName)
+            return literal
+        elif kind == "undefined":
+            return None
+        elif kind == "tripleTerm":
+            subject, predicate, object = [self._term(value.get(i, {})) for i in (1, 2, 3)]
+            return {"type": "triple", "value": {"subject": subject, "predicate": predicate, "object": object}}
+        elif kind == "valInteger":
+            return {"type": "literal", "value": str(value), "datatype": _XSD + "integer"}
+        elif kind == "valDouble":
+            return {"type": "literal", "value": _doubleLexical(value), "datatype": _XSD + "double"}
+        elif kind == "valDecimal":
+            lexical = _decimalLexical(value.get(1, 0), value.get(2, 0))
+            return {"type": "literal", "value": lexical, "datatype": _XSD + "decimal"}
+        raise ValueError("unexpected %s term in the %s results" % (kind or field, self._formatName))
+
+
+class ThriftResultsReader(_JenaResultsReader):
+    """
+    Incremental reader for the Jena RDF Thrift result set format (``application/sparql-results+thrift``), encoded with
+    the Thrift compact protocol.
+    """
+
+    _formatName = "Thrift"
+    _termFields = _THRIFT_TERM_FIELDS
+
+    def _readVarTuple(self) -> Optional[Dict[int, Any]]:
+        return None if self._atEnd() else self._struct()
+
+    _readDataTuple = _readVarTuple
+
+    def _struct(self) -> Dict[int, Any]:
+        fields: Dict[int, Any] = {}
+        fieldID = 0
+        while True:
+            header = self._byte()
+            fieldType = header & 0x0F
+            if fieldType == _THRIFT_STOP:
+                return fields
+            delta = header >> 4
+            fieldID = fieldID + delta if delta else _zigzag(self._varint())
+            if fieldType == _THRIFT_TRUE:
+                fields[fieldID] = True
+            elif fieldType == _THRIFT_FALSE:
+                fields[fieldID] = False
+            else:
+                fields[fieldID] = self._value(fieldType)
+
+    def _value(self, valueType: int) -> Any:
+        if valueType == _THRIFT_BINARY:
+            return self._read(self._varint())
+        elif valueType == _THRIFT_STRUCT:
+            return self._struct()
+        elif valueType in (_THRIFT_I16, _THRIFT_I32, _THRIFT_I64):
+            return _zigzag(self._varint())
+        elif valueType == _THRIFT_DOUBLE:
+            return struct.unpack("<d", self._read(8))[0]
+        elif valueType in (_THRIFT_LIST, _THRIFT_SET):
+            header = self._byte()
+            size = header >> 4
+            if size == 15:
+                size = self._varint()
+            return [self._value(header & 0x0F) for _ in range(size)]
+        elif valueType == _THRIFT_MAP:
+            size = self._varint()
+            if not size:
+                return {}
+            types = self._byte()
+            return {self._value(types >> 4): self._value(types & 0x0F) for _ in range(size)}
+        elif valueType == _THRIFT_BYTE:
+            return struct.unpack("b", self._read(1))[0]
+        elif valueType in (_THRIFT_TRUE, _THRIFT_FALSE):  # in lists, booleans are one byte each
+            return self._byte() == _THRIFT_TRUE
+        raise ValueError("unknown Thrift type %d" % valueType)
+
+
+class ProtobufResultsReader(_JenaResultsReader):
+    """
+    Incremental reader for the Jena RDF Protobuf result set format (``application/sparql-results+protobuf``), where each
+    message is preceded by its length.
+    """
+
+    _formatName = "Protobuf"
+    _termFields = _PROTOBUF_TERM_FIELDS
+
+    def _readVarTuple(self) -> Optional[Dict[int, Any]]:
+        if self._atEnd():
+            return None
+        message = _parseProtobuf(self._read(self._varint()))
+        return {1: [_first(_parseProtobuf(var)) for var in message.get(1, [])]}
+
+    def _readDataTuple(self) -> Optional[Dict[int, Any]]:
+        if self._atEnd():
+            return None
+        message = _parseProtobuf(self._read(self._varint()))
+        return {1: [self._decodeTerm(term) for term in message.get(1, [])]}
+
+    def _decodeTerm(self, data: bytes) -> Dict[int, Any]:
+        fields = _parseProtobuf(data)
+        if not fields:
+            return {}
+        field = min(fields)
+        value = fields[field][-1]
+        kind = self._termFields.get(field)
+        if kind == "tripleTerm":
+            triple = _parseProtobuf(value)
+            return {field: {i: self._decodeTerm(triple[i][-1]) for i in (1, 2, 3) if i in triple}}
+        elif kind == "valInteger":
+            return {field: _zigzag(value)}
+        elif kind == "valDouble":
+            return {field: struct.unpack("<d", value)[0]}
+        elif kind == "valDecimal":
+            decimalFields = _first(_parseProtobuf(value))
+            return {field: {i: _zigzag(decimalFields.get(i, 0)) for i in (1, 2)}}
+        return {field: _first(_parseProtobuf(value))}
+
+
+def _first(fields: Dict[int, List[Any]]) -> Dict[int, Any]:
+    """Keep the last value of each field of a parsed Protocol Buffers message (as the repeated ones are not used)."""
+    return {field: values[-1] for field, values in fields.items()}
+
+
+def _parseProtobuf(data: bytes) -> Dict[int, List[Any]]:
+    """Parse a Protocol Buffers message into its fields: lists of integers (varint), bytes (length-delimited and
+    fixed64) and integers (fixed32), by field number."""
+    try:
+        return _parseProtobufFields(data)
+    except (IndexError, struct.error):
+        raise ValueError("truncated Protobuf results")
+
+
+def _parseProtobufFields(data: bytes) -> Dict[int, List[Any]]:
+    fields: Dict[int, List[Any]] = {}
+    pos = 0
+    end = len(data)
+    while pos < end:
+        key = shift = 0
+        while True:
+            byte = data[pos]
+            pos += 1
+            key |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                break
+            shift += 7
+        wireType = key & 0x07
+        if wireType == _PROTOBUF_VARINT:
+            value = shift = 0
+            while True:
+                byte = data[pos]
+                pos += 1
+                value |= (byte & 0x7F) << shift
+                if byte < 0x80:
+                    break
+                shift += 7
+            fields.setdefault(key >> 3, []).append(value)
+        elif wireType == _PROTOBUF_LENGTH_DELIMITED:
+            size = shift = 0
+            while True:
+                byte = data[pos]
+                pos += 1
+                size |= (byte & 0x7F) << shift
+                if byte < 0x80:
+                    break
+                shift += 7
+            fields.setdefault(key >> 3, []).append(data[pos : pos + size])
+            pos += size
+        elif wireType == _PROTOBUF_FIXED64:
+            fields.setdefault(key >> 3, []).append(data[pos : pos + 8])
+            pos += 8
+        elif wireType == _PROTOBUF_FIXED32:
+            fields.setdefault(key >> 3, []).append(struct.unpack("<i", data[pos : pos + 4])[0])
+            pos += 4
+        else:
+            raise ValueError("unsupported Protocol Buffers wire type %d" % wireType)
+    if pos != end:
+        raise IndexError(pos)
+    return fields
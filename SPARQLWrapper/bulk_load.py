@@ -0,0 +1,191 @@
+"""
+Load large amounts of triples into a SPARQL endpoint with SPARQL Update ``INSERT DATA`` requests of bounded size,
+sent in parallel.
+
+.. versionadded:: 2.0.1
+"""
+import copy
+import socket
+import time
+import urllib.error
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from SPARQLWrapper.SPARQLExceptions import EndPointInternalError
+from SPARQLWrapper.Wrapper import POST, POSTDIRECTLY, SPARQLWrapper
+
+# identifier of the default graph of an RDFLib Dataset (rdflib.graph.DATASET_DEFAULT_GRAPH_ID)
+_RDFLIB_DEFAULT_GRAPH = "urn:x-rdflib:default"
+
+# HTTP status codes of the errors worth retrying (500 is raised as EndPointInternalError)
+_RETRY_HTTP_CODES = (408, 429, 502, 503, 504)
+
+
+class BulkLoadResult(NamedTuple):
+    """Statistics of a bulk load, returned by :func:`insert_data` and passed to its ``progress`` callback."""
+
+    chunks: int
+    """number of ``INSERT DATA`` requests done."""
+    statements: int
+    """number of triples and quads loaded."""
+    size: int
+    """number of bytes of the ``INSERT DATA`` requests done."""
+    retries: int
+    """number of requests retried."""
+
+
+def _graph_name(context: Any) -> Optional[str]:
+    """The N-Triples form of the graph of a quad (an RDFLib term or graph), ``None`` for the default graph."""
+    if context is None:
+        return None
+    identifier = getattr(context, "identifier", context)
+    if str(identifier) == _RDFLIB_DEFAULT_GRAPH:
+        return None
+    return identifier.n3() if hasattr(identifier, "n3") else "<%s>" % identifier
+
+
+def _is_dataset(data: Any) -> bool:
+    """Whether ``data`` is an RDFLib graph with named graphs (a ``ConjunctiveGraph`` or a ``Dataset``)."""
+    try:
+        from rdflib import ConjunctiveGraph, Dataset
+    except ImportError:
+        return False
+    return isinstance(data, (ConjunctiveGraph, Dataset))
+
+
+def _statements(data: Any, graph: Optional[str]) -> Iterator[Tuple[Optional[str], str]]:
+    """The statements of ``data``, as their graph (or ``None``) and their triple in N-Triples syntax."""
+    target = "<%s>" % graph if graph else None
+    if _is_dataset(data):
+        data = data.quads()
+    elif callable(getattr(data, "triples", None)):
+        # the triples of a graph go to the default graph (or ``graph``), whatever its identifier
+        data = data.triples((None, None, None))
+    for statement in data:
+        name = _graph_name(statement[3]) if len(statement) > 3 else None
+        triple = "%s %s %s ." % (statement[0].n3(), statement[1].n3(), statement[2].n3())
+        yield name or target, triple
+
+
+def _insert_data(groups: Dict[Optional[str], List[str]]) -> str:
+    lines = ["INSERT DATA {"]
+    for name, triples in groups.items():
+        if name is None:
+            lines.extend(triples)
+        else:
+            lines.append("GRAPH %s {" % name)
+            lines.extend(triples)
+            lines.append("}")
+    lines.append("}")
+    return "\n".join(lines)
+
+
+def _update_chunks(data: Any, graph: Optional[str], chunk_size: int) -> Iterator[Tuple[str, int]]:
+    """The ``INSERT DATA`` requests loading ``data``, of about ``chunk_size`` bytes, with their number of statements."""
+    groups: Dict[Optional[str], List[str]] = {}
+    size = count = 0
+    for name, triple in _statements(data, graph):
+        groups.setdefault(name, []).append(triple)
+        size += len(triple.encode("utf-8")) + 1
+        count += 1
+        if size >= chunk_size:
+            yield _insert_data(groups), count
+            groups = {}
+            size = count = 0
+    if count:
+        yield _insert_data(groups), count
+
+
+def _retryable(error: Exception) -> bool:
+    if isinstance(error, urllib.error.HTTPError):
+        return error.code in _RETRY_HTTP_CODES
+    return isinstance(
+        error, (EndPointInternalError, urllib.error.URLError, socket.timeout, ConnectionError)
+    )
+
+
+def _send(sparql: SPARQLWrapper, update: str, retries: int, retry_delay: float) -> int:
+    """Send an update with a copy of ``sparql``; return the number of retries needed."""
+    worker = copy.copy(sparql)
+    worker.setMethod(POST)
+    worker.setRequestMethod(POSTDIRECTLY)
+    worker.setQuery(update)
+    attempt = 0
+    while True:
+        try:
+            worker.query().response.read()
+            return attempt
+        except Exception as e:
+            if attempt >= retries or not _retryable(e):
+                raise
+            time.sleep(retry_delay * 2**attempt)
+            attempt += 1
+
+
+def insert_data(
+    sparql: SPARQLWrapper,
+    data: Iterable[Any],
+    graph: Optional[str] = None,
+    chunk_size: int = 2**20,
+    max_workers: int = 4,
+    retries: int = 3,
+    retry_delay: float = 1.0,
+    progress: Optional[Callable[[BulkLoadResult], None]] = None,
+) -> BulkLoadResult:
+    """
+    Load triples or quads into the update endpoint of ``sparql``, with ``INSERT DATA`` requests (sent directly in
+    the body of POST requests) of about ``chunk_size`` bytes each, ``max_workers`` at a time. The statements are
+    serialized in N-Triples syntax as they are read, so that at most ``2 * max_workers`` requests are held in memory.
+
+    Requests failing with a connection error, a timeout or an HTTP status code meaning that the endpoint is busy or
+    unavailable (408, 429, 500, 502, 503, 504) are retried up to ``retries`` times, waiting ``retry_delay`` seconds,
+    then twice as long each time. Any other error, or the last one, stops the load and is raised; the requests
+    already done are not rolled back.
+
+    Note that blank nodes with the same label sent in different requests are different nodes for the endpoint.
+
+    :param sparql: the wrapper of the endpoint; it is copied for each request, and is not changed.
+    :param data: RDFLib triples ``(s, p, o)`` or quads ``(s, p, o, g)`` (where ``g`` is a graph or its name), or an
+      RDFLib graph or dataset.
+    :param graph: the IRI of the graph to load the triples into, instead of the default graph.
+    :param chunk_size: the size, in bytes, of the statements of each request.
+    :param max_workers: the maximum number of requests sent at once.
+    :param retries: the maximum number of times each request is retried.
+    :param retry_delay: the number of seconds to wait before retrying a request the first time.
+    :param progress: called with the statistics of the load (a :class:`BulkLoadResult`) after each request.
+    :return: the statistics of the load.
+    """
+    result = BulkLoadResult(0, 0, 0, 0)
+    pending: Set["Future[int]"] = set()
+    sizes: Dict["Future[int]", Tuple[int, int]] = {}
+
+    def collect(done: Iterable["Future[int]"]) -> None:
+        nonlocal result
+        for future in done:
+            statements, size = sizes.pop(future)
+            result = BulkLoadResult(
+                result.chunks + 1,
+                result.statements + statements,
+                result.size + size,
+                result.retries + future.result(),
+            )
+            if progress is not None:
+                progress(result)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        try:
+            for update, statements in _update_chunks(data, graph, chunk_size):
+                if len(pending) >= 2 * max_workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(done)
+                future = executor.submit(_send, sparql, update, retries, retry_delay)
+                sizes[future] = (statements, len(update.encode("utf-8")))
+                pending.add(future)
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+        except BaseException:
+            for future in pending:
+                future.cancel()
+            raise
+    return result
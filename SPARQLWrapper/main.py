@@ -7,11 +7,8 @@ import json
 import os
 import shutil
 import sys
-import xml
 from typing import List, Optional
 
-import rdflib
-
 from . import __version__
 from .Wrapper import SPARQLWrapper, _allowedAuth, _allowedFormats, _allowedRequests
 
@@ -137,20 +134,26 @@ def main(test: Optional[List[str]] = None) -> None:
     results = sparql.query().convert()
 
     if isinstance(results, dict):
-        # "json"
+        # "json", "binary", "thrift", "protobuf"
         print(json.dumps(results, indent=4))
-    elif isinstance(results, xml.dom.minidom.Document):
-        # "xml"
-        print(results.toxml())
     elif isinstance(results, bytes):
         # "csv", "tsv", "turtle", "n3"
         print(results.decode("utf-8"))
-    elif isinstance(results, rdflib.graph.Dataset):
-        # "rdf"
-        print(results.serialize())
     else:
-        # unknown type
-        raise TypeError(f"Unsupported result of type {type(results)}: {results!r}")
+        # imported here, so that the json/csv/tsv/turtle/n3 paths do not load them
+        from xml.dom.minidom import Document
+
+        import rdflib
+
+        if isinstance(results, Document):
+            # "xml"
+            print(results.toxml())
+        elif isinstance(results, rdflib.graph.Dataset):
+            # "rdf"
+            print(results.serialize())
+        else:
+            # unknown type
+            raise TypeError(f"Unsupported result of type {type(results)}: {results!r}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,248 @@
+# -*- coding: utf-8 -*-
+
+"""
+Memory profiling of the conversion of the results, to tell how much memory a query costs: when it is enabled (see
+:meth:`SPARQLWrapper.Wrapper.SPARQLWrapper.setMemoryProfiling`), each :class:`SPARQLWrapper.Wrapper.QueryResult`
+returned by :meth:`SPARQLWrapper.Wrapper.SPARQLWrapper.query` holds a :class:`MemoryProfile` record (its ``memory``
+attribute), filled with the memory allocated, as traced by :mod:`tracemalloc`, in each step of
+:meth:`SPARQLWrapper.Wrapper.QueryResult.convert` and of :class:`SPARQLWrapper.SmartWrapper.Bindings`:
+
+* ``read``: reading the response body;
+* ``convert``: the conversion of the body (the parsing), without reading it;
+* ``bindings``: the creation of the :class:`SPARQLWrapper.SmartWrapper.Value` objects of ``Bindings``.
+
+Tracing the allocations slows the conversions down (often by a factor of 2 or more), and it is global to the
+process: the allocations of the other threads during a conversion are counted too. This mode is meant to size the
+workers and to investigate results, not to stay enabled in production. :mod:`tracemalloc` is started when a
+conversion is profiled while no other one is (and stopped when the last one ends), unless it is already tracing.
+The conversions profiled at the same time, in several threads, count the memory allocated and freed by each other
+(so that what they retain can even be negative), and their peaks are not reset between their steps, so that they are
+over-estimated: a warning is issued when it happens. Profile the conversions one at a time to size them.
+
+.. versionadded:: 2.0.1
+"""
+
+import sys
+import threading
+import warnings
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List
+
+# the profiles converting, in all the threads, as tracemalloc is global to the process
+_lock = threading.Lock()
+_active = 0
+_started = False
+
+
+def _allocatedBlocks() -> int:
+    getallocatedblocks = getattr(sys, "getallocatedblocks", None)
+    return getallocatedblocks() if getallocatedblocks is not None else 0
+
+
+class MemoryStep(object):
+    """
+    Memory allocated in one step of the conversions of a result. The sizes are in bytes.
+
+    :ivar peak: the highest memory allocated during the step, above the memory allocated when the conversion started
+      (so including what the previous steps still hold). With Python 3.7 and 3.8, whose :mod:`tracemalloc` cannot
+      reset its peak, this is the peak since the conversion started.
+    :vartype peak: int
+    :ivar retained: the memory allocated by the step and not freed at its end (negative when it frees more than it
+      allocates): the data read by the ``read`` step, for instance, is retained by this step and freed by the
+      ``convert`` step.
+    :vartype retained: int
+    :ivar blocks: the number of memory blocks allocated by the step and not freed at its end, as counted by
+      :func:`sys.getallocatedblocks` (the blocks of the allocator of the small objects, so roughly the number of
+      Python objects).
+    :vartype blocks: int
+    :ivar calls: the number of times the step ran (like the number of reads of the body).
+    :vartype calls: int
+    """
+
+    def __init__(self) -> None:
+        self.peak = 0
+        self.retained = 0
+        self.blocks = 0
+        self.calls = 0
+
+    def toDict(self) -> Dict[str, int]:
+        """Return the step as a dictionary.
+
+        :rtype: dict
+        """
+        return dict(self.__dict__)
+
+    def __repr__(self) -> str:
+        return "<MemoryStep peak=%d retained=%d blocks=%d calls=%d>" % (
+            self.peak,
+            self.retained,
+            self.blocks,
+            self.calls,
+        )
+
+
+class MemoryProfile(object):
+    """
+    Memory profile of the conversions of a result. The steps are measured without the steps run inside them (like
+    the reads of the body during the parsing), and accumulated over the conversions of the result (when it is
+    spooled, see :meth:`SPARQLWrapper.Wrapper.QueryResult.spool`).
+
+    :ivar steps: the steps, by name (``read``, ``convert``, ``bindings``), in the order they first ran.
+    :vartype steps: dict
+    """
+
+    def __init__(self) -> None:
+        self.steps: Dict[str, MemoryStep] = {}
+        self._depth = 0
+        self._stack: List[MemoryStep] = []
+        self._base = 0
+        self._current = 0
+        self._blocks = 0
+
+    @property
+    def peak(self) -> int:
+        """The highest memory allocated during the conversions, in bytes: the highest :attr:`MemoryStep.peak`."""
+        return max([step.peak for step in self.steps.values()], default=0)
+
+    @property
+    def retained(self) -> int:
+        """The memory allocated by the conversions and not freed, in bytes (roughly the size of the converted
+        result): the sum of the :attr:`MemoryStep.retained`."""
+        return sum(step.retained for step in self.steps.values())
+
+    def toDict(self) -> Dict[str, Any]:
+        """Return the profile as a dictionary (of JSON serializable values), for instance to export it.
+
+        :rtype: dict
+        """
+        return {
+            "peak": self.peak,
+            "retained": self.retained,
+            "steps": {name: step.toDict() for name, step in self.steps.items()},
+        }
+
+    def _switch(self) -> None:
+        """Internal method called when a step starts or ends: add the memory allocated since the last call to the
+        step running."""
+        import tracemalloc
+
+        current, peak = tracemalloc.get_traced_memory()
+        blocks = _allocatedBlocks()
+        if self._stack:
+            step = self._stack[-1]
+            step.peak = max(step.peak, peak - self._base)
+            step.retained += current - self._current
+            step.blocks += blocks - self._blocks
+        self._current = current
+        self._blocks = blocks
+        if hasattr(tracemalloc, "reset_peak"):
+            with _lock:
+                # the peak of another profile converting would be lost
+                if _active == 1:
+                    tracemalloc.reset_peak()
+
+    @contextmanager
+    def _profile(self) -> Iterator[None]:
+        """Internal context manager profiling a conversion: the steps are only measured inside it."""
+        global _active, _started
+
+        if not self._depth:
+            import tracemalloc
+
+            with _lock:
+                if not _active and not tracemalloc.is_tracing():
+                    tracemalloc.start()
+                    _started = True
+                _active += 1
+                concurrent = _active > 1
+            if concurrent:
+                warnings.warn(
+                    "conversions profiled at the same time count the memory allocated and freed by each other",
+                    RuntimeWarning,
+                )
+            self._base = tracemalloc.get_traced_memory()[0]
+            self._switch()
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            if not self._depth:
+                import tracemalloc
+
+                with _lock:
+                    _active -= 1
+                    if not _active and _started:
+                        tracemalloc.stop()
+                        _started = False
+
+    @contextmanager
+    def _step(self, name: str) -> Iterator[None]:
+        """Internal context manager measuring a step, when a conversion is profiled."""
+        if not self._depth:
+            yield
+            return
+        self._switch()
+        step = self.steps.get(name)
+        if step is None:
+            step = self.steps[name] = MemoryStep()
+        step.calls += 1
+        self._stack.append(step)
+        try:
+            yield
+        finally:
+            self._switch()
+            self._stack.pop()
+
+    def __repr__(self) -> str:
+        steps = "".join(" %s.peak=%d" % (name, step.peak) for name, step in self.steps.items())
+        return "<MemoryProfile peak=%d retained=%d%s>" % (self.peak, self.retained, steps)
+
+
+class _ProfiledBody(object):
+    """Proxy of a response body, measuring its reads in the ``read`` step of a memory profile."""
+
+    def __init__(self, body: Any, profile: MemoryProfile) -> None:
+        self._body = body
+        self._profile = profile
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._body, name)
+
+    def read(self, *args: Any) -> bytes:
+        with self._profile._step("read"):
+            data: bytes = self._body.read(*args)
+        return data
+
+    def read1(self, *args: Any) -> bytes:
+        with self._profile._step("read"):
+            data: bytes = self._body.read1(*args)
+        return data
+
+    def readinto(self, buffer: Any) -> int:
+        with self._profile._step("read"):
+            size: int = self._body.readinto(buffer)
+        return size
+
+    def readline(self, *args: Any) -> bytes:
+        with self._profile._step("read"):
+            line: bytes = self._body.readline(*args)
+        return line
+
+    def readlines(self, hint: int = -1) -> List[bytes]:
+        return list(iter(self.readline, b""))
+
+    def __iter__(self) -> "_ProfiledBody":
+        return self
+
+    def __next__(self) -> bytes:
+        line = self.readline()
+        if not line:
+            raise StopIteration
+        return line
+
+    def __enter__(self) -> "_ProfiledBody":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self._body.close()
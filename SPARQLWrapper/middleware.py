@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+
+"""
+Middleware: hooks called around the HTTP requests of a :class:`SPARQLWrapper.Wrapper.SPARQLWrapper` and the
+conversion of their results, to add caching, tracing, metrics, request signing or retries without subclassing.
+
+A middleware is registered either on one wrapper, with :meth:`SPARQLWrapper.Wrapper.SPARQLWrapper.addMiddleware`, or
+for all the wrappers, with :meth:`SPARQLWrapper.Wrapper.SPARQLWrapper.registerMiddleware`. The global middleware come
+first; :meth:`Middleware.before_request` is called in the order of registration, and the other hooks in the reverse
+order, so that the first middleware wraps all the others. When no middleware is registered, the requests are sent
+directly.
+
+For instance, to sign the requests::
+
+    class Signer(Middleware):
+        def before_request(self, sparql, request):
+            request.add_header("Authorization", sign(request))
+            return None
+
+    sparql.addMiddleware(Signer())
+
+.. versionadded:: 2.0.1
+"""
+
+from typing import TYPE_CHECKING, Any, Optional
+
+if TYPE_CHECKING:
+    import urllib.request
+    from http.client import HTTPResponse
+
+    from .timing import QueryTiming
+    from .Wrapper import QueryResult, SPARQLWrapper
+
+
+class Middleware(object):
+    """Base class of the middleware, whose hooks do nothing: subclasses override the hooks they need."""
+
+    def before_request(self, sparql: "SPARQLWrapper", request: "urllib.request.Request") -> Optional["HTTPResponse"]:
+        """Called before sending a request, which can be changed.
+
+        :param sparql: the wrapper sending the request.
+        :param request: the request.
+        :return: ``None`` to send the request, or a response (like a cached one) to use instead of sending it, in
+          which case the next middleware are skipped.
+        """
+        return None
+
+    def after_response(
+        self, sparql: "SPARQLWrapper", request: "urllib.request.Request", response: "HTTPResponse"
+    ) -> "HTTPResponse":
+        """Called with the response to a request (before its body is read).
+
+        :param sparql: the wrapper which sent the request.
+        :param request: the request.
+        :param response: the response.
+        :return: the response, or another one (like a wrapper of the response).
+        """
+        return response
+
+    def on_error(
+        self, sparql: "SPARQLWrapper", request: "urllib.request.Request", error: Exception
+    ) -> Optional["HTTPResponse"]:
+        """Called when sending a request fails, with the exception raised (the HTTP errors are mapped to the
+        exceptions of :mod:`SPARQLWrapper.SPARQLExceptions` as usual).
+
+        :param sparql: the wrapper which sent the request.
+        :param request: the request.
+        :param error: the exception.
+        :return: ``None`` to raise the exception, or a response to use instead (like a cached one, or the response
+          of the request sent again), which is then passed to :meth:`after_response`.
+        """
+        return None
+
+    def on_convert(self, result: "QueryResult", converted: Any) -> Any:
+        """Called when :meth:`SPARQLWrapper.Wrapper.QueryResult.convert` returns, for the results of
+        :meth:`SPARQLWrapper.Wrapper.SPARQLWrapper.query`; also for the middleware skipped by a
+        :meth:`before_request` returning a response.
+
+        :param result: the result; its ``request`` and ``timing`` attributes hold the request and the timing record
+          of the query.
+        :param converted: the converted result.
+        :return: the converted result, or another value to return instead.
+        """
+        return converted
+
+    def on_complete(self, timing: "QueryTiming") -> None:
+        """Called with the timing record of a query of :meth:`SPARQLWrapper.Wrapper.SPARQLWrapper.query` once it is
+        complete, like the hook set with :meth:`SPARQLWrapper.Wrapper.SPARQLWrapper.setTimingHook` (also when the
+        request fails).
+
+        :param timing: the timing record.
+        """
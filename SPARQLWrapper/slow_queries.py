@@ -0,0 +1,266 @@
+# -*- coding: utf-8 -*-
+
+"""
+Slow-query log: a middleware (see :mod:`SPARQLWrapper.middleware`) aggregating the timing records of the queries
+(see :mod:`SPARQLWrapper.timing`) by query fingerprint, so that structurally identical queries, which only differ by
+their IRIs, literals or ``VALUES`` data, are counted together, and logging the queries slower or larger than a
+threshold::
+
+    from SPARQLWrapper import slow_queries
+
+    log = slow_queries.enable(latency=2.0)
+    ...
+    for stats in log.stats()[:10]:
+        print(stats.calls, stats.p95, stats.query)
+
+.. versionadded:: 2.0.1
+"""
+
+import hashlib
+import logging
+import re
+import threading
+from collections import deque
+from typing import Deque, Dict, List, NamedTuple, Optional
+
+from SPARQLWrapper.middleware import Middleware
+from SPARQLWrapper.timing import QueryTiming
+from SPARQLWrapper.Wrapper import SPARQLWrapper
+
+logger = logging.getLogger(__name__)
+
+_TOKENS = re.compile(
+    r"""
+      (?P<space>\s+)
+    | (?P<comment>\#[^\n]*)
+    | (?P<iri><[^<>"{}|^`\\\x00-\x20]*>)
+    | (?P<literal>(?:\"\"\"(?:[^"\\]|\\.|"(?!""))*\"\"\"
+        | '''(?:[^'\\]|\\.|'(?!''))*'''
+        | "(?:[^"\\\n]|\\.)*"
+        | '(?:[^'\\\n]|\\.)*')
+        (?:@[a-zA-Z]+(?:-[a-zA-Z0-9]+)*
+          | \^\^(?:<[^<>"{}|^`\\\x00-\x20]*> | (?:[^\W\d](?:[\w-]|\.(?=[\w-]))*)?:(?:[\w:%-]|\.(?=[\w:%-]))*))?)
+    | (?P<variable>[?$]\w+)
+    | (?P<name>(?:[^\W\d](?:[\w-]|\.(?=[\w-]))*)?:(?:[\w:%-]|\.(?=[\w:%-]))* | [^\W\d]\w*)
+    | (?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+    | (?P<other>.)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+
+def normalize(query: str) -> str:
+    """Normalize a query into the text of its fingerprint: the comments are removed, the whitespace collapsed, the
+    IRIs written in full are replaced by ``<?>``, the literals (strings, with their language tag or datatype, and
+    numbers) by ``?``, and the data of the ``VALUES`` blocks by ``...``. Prefixed names, usually terms of a vocabulary,
+    are kept.
+
+    :param query: the query.
+    :return: the normalized query.
+    """
+    tokens: List[str] = []
+    values = False
+    depth = 0
+    for match in _TOKENS.finditer(query):
+        kind = match.lastgroup
+        text = match.group()
+        if kind in ("space", "comment"):
+            continue
+        if depth:
+            # inside a VALUES block
+            if text == "{":
+                depth += 1
+            elif text == "}":
+                depth -= 1
+                if not depth:
+                    tokens.append("... }")
+            continue
+        if kind == "iri":
+            text = "<?>"
+        elif kind in ("literal", "number"):
+            text = "?"
+        elif kind == "name" and text.upper() == "VALUES":
+            values = True
+        elif values and text == "{":
+            values = False
+            depth = 1
+        tokens.append(text)
+    return " ".join(tokens)
+
+
+def _hash(normalized: str) -> str:
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:16]
+
+
+def fingerprint(query: str) -> str:
+    """Return the fingerprint of a query: a short hash of the :func:`normalized <normalize>` query.
+
+    :param query: the query.
+    :return: the fingerprint, 16 hexadecimal digits.
+    """
+    return _hash(normalize(query))
+
+
+class QueryStats(NamedTuple):
+    """Aggregated timings of the queries with the same fingerprint, returned by :meth:`SlowQueryLog.stats`. The
+    durations (the :attr:`SPARQLWrapper.timing.QueryTiming.total` of the queries) are in seconds, and the percentiles
+    are computed over the last ``samples`` queries."""
+
+    fingerprint: str
+    """the fingerprint of the queries."""
+    query: str
+    """the normalized query."""
+    calls: int
+    """the number of queries."""
+    slow: int
+    """the number of queries above one of the thresholds of the log."""
+    errors: int
+    """the number of failed queries."""
+    total: float
+    """the total duration of the queries."""
+    p50: float
+    """the median duration."""
+    p95: float
+    """the 95th percentile of the duration."""
+    p99: float
+    """the 99th percentile of the duration."""
+    bytes: int
+    """the total size of the responses read."""
+
+
+def _percentile(samples: List[float], percent: int) -> float:
+    """The percentile of sorted samples, by the nearest-rank method."""
+    if not samples:
+        return 0.0
+    return samples[max(0, -(-len(samples) * percent // 100) - 1)]
+
+
+class _Aggregate(object):
+    def __init__(self, query: str, samples: int) -> None:
+        self.query = query
+        self.count = self.slow = self.errors = self.bytes = 0
+        self.total = 0.0
+        self.samples: Deque[float] = deque(maxlen=samples)
+
+
+class SlowQueryLog(Middleware):
+    """Middleware aggregating the timings of the queries by fingerprint, and logging the slow ones with the
+    :mod:`logging` logger of this module (at the ``WARNING`` level).
+
+    :ivar latency: the duration (in seconds) above which a query is slow, or ``None``.
+    :vartype latency: float
+    :ivar size: the response size (in bytes) above which a query is slow, or ``None``.
+    :vartype size: int
+    """
+
+    def __init__(self, latency: Optional[float] = 1.0, size: Optional[int] = None, samples: int = 1000) -> None:
+        """
+        :param latency: the duration (in seconds) above which a query is slow; ``None`` for no limit.
+        :param size: the response size (in bytes) above which a query is slow; ``None`` (the **default** value)
+          for no limit.
+        :param samples: the number of durations kept per fingerprint to compute the percentiles.
+        """
+        self.latency = latency
+        self.size = size
+        self._samples = samples
+        self._aggregates: Dict[str, _Aggregate] = {}
+        self._lock = threading.Lock()
+
+    def on_complete(self, timing: QueryTiming) -> None:
+        query = normalize(timing.query or "")
+        key = _hash(query)
+        duration = timing.total
+        slow = (self.latency is not None and duration > self.latency) or (
+            self.size is not None and timing.responseBytes > self.size
+        )
+        failed = timing.error is not None
+        with self._lock:
+            aggregate = self._aggregates.get(key)
+            if aggregate is None:
+                aggregate = self._aggregates[key] = _Aggregate(query, self._samples)
+            aggregate.count += 1
+            aggregate.slow += slow
+            aggregate.errors += failed
+            aggregate.total += duration
+            aggregate.bytes += timing.responseBytes
+            aggregate.samples.append(duration)
+        if slow:
+            logger.warning(
+                "slow query %s: %.3f s, %d bytes, %s on %s: %s",
+                key,
+                duration,
+                timing.responseBytes,
+                timing.status,
+                timing.endpoint,
+                timing.query,
+                extra={"fingerprint": key, "timing": timing.toDict()},
+            )
+
+    def stats(self) -> List[QueryStats]:
+        """Return the aggregated timings, by fingerprint, the queries with the highest total duration first.
+
+        :rtype: list
+        """
+        with self._lock:
+            aggregates = [(key, a, sorted(a.samples)) for key, a in self._aggregates.items()]
+        stats = [
+            QueryStats(
+                key,
+                a.query,
+                a.count,
+                a.slow,
+                a.errors,
+                a.total,
+                _percentile(samples, 50),
+                _percentile(samples, 95),
+                _percentile(samples, 99),
+                a.bytes,
+            )
+            for key, a, samples in aggregates
+        ]
+        return sorted(stats, key=lambda s: s.total, reverse=True)
+
+    def reset(self) -> None:
+        """Forget the aggregated timings."""
+        with self._lock:
+            self._aggregates.clear()
+
+
+_log: Optional[SlowQueryLog] = None
+
+
+def enable(latency: Optional[float] = 1.0, size: Optional[int] = None, samples: int = 1000) -> SlowQueryLog:
+    """Enable the slow-query log of the process, for all the wrappers (see
+    :meth:`SPARQLWrapper.Wrapper.SPARQLWrapper.registerMiddleware`). If it is already enabled, its thresholds are
+    updated.
+
+    :param latency: the duration (in seconds) above which a query is slow; ``None`` for no limit.
+    :param size: the response size (in bytes) above which a query is slow; ``None`` (the **default** value) for no
+      limit.
+    :param samples: the number of durations kept per fingerprint to compute the percentiles.
+    :return: the slow-query log.
+    """
+    global _log
+    if _log is None:
+        _log = SlowQueryLog(latency, size, samples)
+        SPARQLWrapper.registerMiddleware(_log)
+    else:
+        _log.latency = latency
+        _log.size = size
+    return _log
+
+
+def disable() -> None:
+    """Disable the slow-query log of the process enabled with :func:`enable`, and forget its timings."""
+    global _log
+    if _log is not None:
+        SPARQLWrapper.unregisterMiddleware(_log)
+        _log = None
+
+
+def get_log() -> Optional[SlowQueryLog]:
+    """Return the slow-query log of the process, if it is enabled with :func:`enable`.
+
+    :rtype: :class:`SlowQueryLog`
+    """
+    return _log
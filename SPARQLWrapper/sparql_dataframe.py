@@ -1,24 +1,370 @@
 """
 Query a SPARQL endpoint and return results as a Pandas dataframe.
 """
+import datetime
+import decimal
 import io
-from typing import TYPE_CHECKING, Dict, List, Union
+import warnings
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
-from SPARQLWrapper.SmartWrapper import Bindings, SPARQLWrapper2, Value
-from SPARQLWrapper.Wrapper import CSV, SELECT, SPARQLWrapper
+from SPARQLWrapper.Wrapper import CSV, JSON, SELECT, SPARQLWrapper
 
 if TYPE_CHECKING:
+    import duckdb
     import pandas as pd
+    import polars as pl
+    import pyarrow as pa
 
 
 class QueryException(Exception):
     pass
 
 
-def get_sparql_dataframe_orig(
+_XSD = "http://www.w3.org/2001/XMLSchema#"
+_RDF_LANGSTRING = "http://www.w3.org/1999/02/22-rdf-syntax-ns#langString"
+
+
+def _parse_boolean(lexical: str) -> bool:
+    if lexical in ("true", "1"):
+        return True
+    elif lexical in ("false", "0"):
+        return False
+    raise ValueError(lexical)
+
+
+def _parse_datetime(lexical: str) -> datetime.datetime:
+    if "T" not in lexical:
+        raise ValueError(lexical)
+    # datetime.fromisoformat only understands "Z" from Python 3.11 onwards
+    if lexical.endswith("Z"):
+        lexical = lexical[:-1] + "+00:00"
+    return datetime.datetime.fromisoformat(lexical)
+
+
+_INTEGER_TYPES = [
+    "integer",
+    "int",
+    "long",
+    "short",
+    "byte",
+    "nonNegativeInteger",
+    "nonPositiveInteger",
+    "negativeInteger",
+    "positiveInteger",
+    "unsignedLong",
+    "unsignedInt",
+    "unsignedShort",
+    "unsignedByte",
+]
+
+# Converters for the most common datatypes. They mirror the lexical-to-value mapping done by
+# rdflib.term.Literal.toPython(); anything they reject is handed over to rdflib.
+_FAST_CONVERTERS: Dict[str, Callable[[str], Any]] = {
+    _XSD + "decimal": decimal.Decimal,
+    _XSD + "double": float,
+    _XSD + "float": float,
+    _XSD + "boolean": _parse_boolean,
+    _XSD + "dateTime": _parse_datetime,
+    _XSD + "date": datetime.date.fromisoformat,
+}
+_FAST_CONVERTERS.update((_XSD + t, int) for t in _INTEGER_TYPES)
+
+_STRING_TYPES = [None, _XSD + "string", _RDF_LANGSTRING]
+
+
+def _convert_lexicals(lexicals: List[str], datatype: Optional[str]) -> List[Any]:
+    """Convert lexical forms sharing the same datatype into Python values."""
+    if datatype in _STRING_TYPES:
+        return lexicals
+    fast = _FAST_CONVERTERS.get(datatype) if datatype else None
+    if fast is not None:
+        try:
+            return list(map(fast, lexicals))
+        except (ValueError, ArithmeticError):
+            # at least one ill-typed or unusual lexical form: go through them one by one
+            pass
+
+    # rdflib in here because there is some meta stuff in the setup.py and Travis fails because rdflib is installed later
+    import rdflib.term
+
+    values = []
+    for lexical in lexicals:
+        if fast is not None:
+            try:
+                values.append(fast(lexical))
+                continue
+            except (ValueError, ArithmeticError):
+                pass
+        values.append(rdflib.term.Literal(lexical, datatype=datatype).toPython())
+    return values
+
+
+def _convert_column(cells: List[Optional[Dict[str, str]]]) -> List[Any]:
+    """Convert the RDF terms bound to one variable (``None`` when unbound) into Python values.
+
+    The cells are grouped by datatype so that each group is converted in one go. IRIs and blank
+    nodes are returned as plain strings.
+    """
+    values: List[Any] = [None] * len(cells)
+    groups: Dict[Optional[str], Tuple[List[int], List[str]]] = {}
+    for i, cell in enumerate(cells):
+        if cell is None:
+            continue
+        # the datatype of IRIs or blank nodes is not set, so they are handled as strings
+        rows, lexicals = groups.setdefault(cell.get("datatype"), ([], []))
+        rows.append(i)
+        lexicals.append(cell["value"])
+
+    for datatype, (rows, lexicals) in groups.items():
+        for i, value in zip(rows, _convert_lexicals(lexicals, datatype)):
+            values[i] = value
+    return values
+
+
+def _typed_columns(
+    variables: List[str], bindings: List[Dict[str, Dict[str, str]]]
+) -> Dict[str, List[Any]]:
+    """Build one list of Python values per variable out of SPARQL JSON bindings."""
+    return {
+        var: _convert_column([b.get(var) for b in bindings]) for var in variables
+    }
+
+
+def _select_json(endpoint: str, query: Union[str, bytes]) -> Dict[str, Any]:
+    sparql = SPARQLWrapper(endpoint)
+    sparql.setQuery(query)
+    if sparql.queryType != SELECT:
+        raise QueryException("Only SPARQL SELECT queries are supported.")
+    sparql.setReturnFormat(JSON)
+    results = sparql.query().convert()
+    if not isinstance(results, dict):
+        raise TypeError(type(results))
+    return results
+
+
+def _get_sparql_typed_columns(
+    endpoint: str, query: Union[str, bytes]
+) -> Tuple[List[str], Dict[str, List[Any]]]:
+    results = _select_json(endpoint, query)
+    variables: List[str] = results["head"]["vars"]
+    return variables, _typed_columns(variables, results["results"]["bindings"])
+
+
+_SOLUTION_MODIFIERS = ("LIMIT", "OFFSET")
+
+
+def _paging_position(query: str) -> int:
+    """Find where LIMIT/OFFSET go in a query: at its end, or before its trailing VALUES clause (which follows the
+    solution modifiers). The words in variables, IRIs, prefixed names, literals and comments are ignored.
+
+    :raises QueryException: if the query already uses LIMIT or OFFSET.
+    """
+    depth = 0
+    for token in SPARQLWrapper.tokens_pattern.finditer(query):
+        word = token.group("word")
+        if word is None:
+            if token.group() == "{":
+                depth += 1
+            elif token.group() == "}":
+                depth -= 1
+        elif word.upper() in _SOLUTION_MODIFIERS:
+            raise QueryException(
+                "The query already uses LIMIT or OFFSET, so it cannot be paged."
+            )
+        elif depth == 0 and word.upper() == "VALUES":
+            return token.start()
+    return len(query)
+
+
+def _paged_query(query: str, limit: int, offset: int = 0) -> str:
+    """Add LIMIT/OFFSET to a query that does not use them already."""
+    position = _paging_position(query)
+    return "%s\nLIMIT %d\nOFFSET %d\n%s" % (
+        query[:position],
+        limit,
+        offset,
+        query[position:],
+    )
+
+
+def _stream_select(
+    endpoint: str, query: Union[str, bytes]
+) -> Tuple[List[str], Iterator[Dict[str, Dict[str, str]]]]:
+    sparql = SPARQLWrapper(endpoint)
+    sparql.setQuery(query)
+    if sparql.queryType != SELECT:
+        raise QueryException("Only SPARQL SELECT queries are supported.")
+    sparql.setReturnFormat(JSON)
+    reader = sparql.query()._streamJSON()
+    return reader.head.get("vars", []), iter(reader)
+
+
+def _iter_select_bindings(
+    endpoint: str, query: Union[str, bytes], page_size: Optional[int] = None
+) -> Tuple[List[str], Iterator[Dict[str, Dict[str, str]]]]:
+    """Stream the solutions of a SELECT query, optionally fetching them page by page."""
+    if page_size is None:
+        return _stream_select(endpoint, query)
+
+    size = page_size
+    text = query.decode("utf-8") if isinstance(query, bytes) else query
+    variables, first = _stream_select(endpoint, _paged_query(text, size))
+
+    def _pages() -> Iterator[Dict[str, Dict[str, str]]]:
+        bindings, offset = first, 0
+        while True:
+            count = 0
+            for binding in bindings:
+                count += 1
+                yield binding
+            if count < size:
+                return
+            offset += size
+            bindings = _stream_select(endpoint, _paged_query(text, size, offset))[1]
+
+    return variables, _pages()
+
+
+def _iter_typed_columns(
+    variables: List[str],
+    bindings: Iterable[Dict[str, Dict[str, str]]],
+    chunk_rows: int,
+) -> Iterator[Dict[str, List[Any]]]:
+    """Group the solutions into chunks of at most ``chunk_rows`` rows, converted to typed columns."""
+    chunk: List[Dict[str, Dict[str, str]]] = []
+    for binding in bindings:
+        chunk.append(binding)
+        if len(chunk) >= chunk_rows:
+            yield _typed_columns(variables, chunk)
+            chunk = []
+    if chunk:
+        yield _typed_columns(variables, chunk)
+
+
+_INT64_MIN, _INT64_MAX = -(2**63), 2**63 - 1
+
+
+def _uniform_column(values: List[Any]) -> List[Any]:
+    """Make sure that a column holds values of one Python type (or ints and floats), turning them into strings
+    otherwise, as columnar formats cannot store mixed types (nor integers beyond 64 bits)."""
+    types = set(type(v) for v in values if v is not None)
+    if len(types) <= 1 or types <= {int, float}:
+        if int not in types or all(
+            _INT64_MIN <= v <= _INT64_MAX for v in values if type(v) is int
+        ):
+            return values
+    return [None if v is None else str(v) for v in values]
+
+
+def _concat_arrow_tables(tables: List["pa.Table"]) -> "pa.Table":
+    """Concatenate the tables of the chunks, whose columns may have different types from one chunk to the next:
+    numeric types are promoted, and the columns whose types cannot be unified are turned into strings."""
+    import pyarrow as pa
+
+    for i, name in enumerate(tables[0].column_names):
+        try:
+            pa.unify_schemas(
+                [pa.schema([table.schema.field(i)]) for table in tables],
+                promote_options="permissive",
+            )
+        except (pa.ArrowTypeError, pa.ArrowInvalid):
+            tables = [
+                table.set_column(i, name, table.column(i).cast(pa.string()))
+                for table in tables
+            ]
+    return pa.concat_tables(tables, promote_options="permissive")
+
+
+def _concat_polars_frames(frames: List["pl.DataFrame"]) -> "pl.DataFrame":
+    """Concatenate the dataframes of the chunks, whose columns may have different types from one chunk to the next:
+    numeric types are promoted, and the columns of other different types are turned into strings (as
+    :func:`_concat_arrow_tables` does)."""
+    import polars as pl
+
+    for name in frames[0].columns:
+        dtypes = set(frame[name].dtype for frame in frames) - {pl.Null}
+        if len(dtypes) > 1 and not all(dtype.is_numeric() for dtype in dtypes):
+            frames = [frame.with_columns(pl.col(name).cast(pl.Utf8)) for frame in frames]
+    return pl.concat(frames, how="vertical_relaxed", rechunk=False)
+
+
+def _column_dtype(values: List[Any]) -> Any:
+    """Pick a dtype able to hold the values of a column as well as missing values in later chunks."""
+    import pandas as pd
+
+    inferred = pd.api.types.infer_dtype(values, skipna=True)
+    if inferred == "integer":
+        # xsd:integer is unbounded: larger values are kept as Python ints
+        if all(v is None or _INT64_MIN <= v <= _INT64_MAX for v in values):
+            return "Int64"
+        return object
+    elif inferred == "boolean":
+        return "boolean"
+    elif inferred in ("floating", "mixed-integer-float"):
+        return "float64"
+    elif inferred == "datetime":
+        return pd.Series([v for v in values if v is not None]).dtype
+    return object
+
+
+_CSV_DTYPES: Dict[str, str] = {
+    _XSD + "decimal": "float64",
+    _XSD + "double": "float64",
+    _XSD + "float": "float64",
+    _XSD + "boolean": "boolean",
+}
+_CSV_DTYPES.update((_XSD + t, "Int64") for t in _INTEGER_TYPES)
+_CSV_DATES = [_XSD + "dateTime", _XSD + "date"]
+
+
+def _probe_csv_types(
     endpoint: str, query: Union[str, bytes]
+) -> Tuple[Dict[str, str], List[str]]:
+    """Learn the column types of a SELECT query from the first solution, fetched as JSON.
+
+    :return: the dtypes of the numeric and boolean columns, and the names of the date columns, suitable
+        for the ``dtype`` and ``parse_dates`` arguments of ``pandas.read_csv``.
+    """
+    text = query.decode("utf-8") if isinstance(query, bytes) else query
+    results = _select_json(endpoint, _paged_query(text, 1))
+    dtype: Dict[str, str] = {}
+    parse_dates: List[str] = []
+    for binding in results["results"]["bindings"]:
+        for var, cell in binding.items():
+            datatype = cell.get("datatype")
+            if datatype in _CSV_DTYPES:
+                dtype[var] = _CSV_DTYPES[datatype]
+            elif datatype in _CSV_DATES:
+                parse_dates.append(var)
+    return dtype, parse_dates
+
+
+def get_sparql_dataframe_orig(
+    endpoint: str,
+    query: Union[str, bytes],
+    dtype: Optional[Dict[str, Any]] = None,
+    parse_dates: Optional[List[str]] = None,
+    engine: Optional[str] = None,
+    probe_types: bool = False,
 ) -> "pd.DataFrame":
-    """copy paste from: https://github.com/lawlesst/sparql-dataframe"""
+    """copy paste from: https://github.com/lawlesst/sparql-dataframe
+
+    The CSV response is parsed by ``pandas.read_csv`` straight from the HTTP response. ``dtype``,
+    ``parse_dates`` and ``engine`` (for instance ``"pyarrow"``) are passed on to it. As CSV results
+    carry no datatypes, ``probe_types`` can be set to first fetch a single solution as JSON and
+    derive ``dtype`` and ``parse_dates`` from its literals (explicit values take precedence).
+    """
     # pandas inside to avoid requiring it
     import pandas as pd
 
@@ -27,38 +373,47 @@ def get_sparql_dataframe_orig(
     if sparql.queryType != SELECT:
         raise QueryException("Only SPARQL SELECT queries are supported.")
     sparql.setReturnFormat(CSV)
-    results = sparql.query().convert()
-    if isinstance(results, bytes):
-        _csv = io.StringIO(results.decode("utf-8"))
-        return pd.read_csv(_csv, sep=",")
+
+    if probe_types:
+        try:
+            probed_dtype, probed_dates = _probe_csv_types(endpoint, query)
+        except QueryException as e:
+            warnings.warn("column types not probed: %s" % e, RuntimeWarning)
+        else:
+            probed_dtype.update(dtype or {})
+            dtype = probed_dtype
+            if parse_dates is None:
+                parse_dates = probed_dates
+
+    result = sparql.query()
+    if result._get_responseFormat() == CSV:
+        source: Any = result._getBody()
     else:
-        raise TypeError(type(results))
+        results = result.convert()
+        if not isinstance(results, bytes):
+            raise TypeError(type(results))
+        source = io.BytesIO(results)
+    return pd.read_csv(
+        source,
+        sep=",",
+        encoding="utf-8",
+        dtype=dtype,
+        parse_dates=parse_dates or False,
+        engine=engine,  # type: ignore[arg-type]
+    )
 
 
 def get_sparql_typed_dict(
     endpoint: str, query: Union[str, bytes]
-) -> List[Dict[str, Value]]:
-    """modified from: https://github.com/lawlesst/sparql-dataframe"""
-    # rdflib in here because there is some meta stuff in the setup.py and Travis fails because rdflib is installed later
-    import rdflib.term
-    sparql = SPARQLWrapper2(endpoint)
-    sparql.setQuery(query)
-    if sparql.queryType != SELECT:
-        raise QueryException("Only SPARQL SELECT queries are supported.")
-    # sparql.setReturnFormat(JSON)
-    results = sparql.query()
-    if not isinstance(results, Bindings):
-        raise TypeError(type(results))
-    # consider perf hacking later, probably slow
-    # convert list of dicts to python types
+) -> List[Dict[str, Any]]:
+    """modified from: https://github.com/lawlesst/sparql-dataframe
+
+    Unbound variables are left out of the rows.
+    """
+    variables, columns = _get_sparql_typed_columns(endpoint, query)
     d = []
-    for x in results.bindings:
-        row = {}
-        for k in x:
-            v = x[k]
-            vv = rdflib.term.Literal(v.value, datatype=v.datatype).toPython()
-            row[k] = vv
-        d.append(row)
+    for values in zip(*(columns[var] for var in variables)):
+        d.append({var: v for var, v in zip(variables, values) if v is not None})
     return d
 
 
@@ -66,7 +421,137 @@ def get_sparql_dataframe(endpoint: str, query: Union[str, bytes]) -> "pd.DataFra
     # pandas inside to avoid requiring it
     import pandas as pd
 
-    d = get_sparql_typed_dict(endpoint, query)
-    # TODO: will nan fill somehow, make more strict if there is way of getting the nan types from rdflib
-    df = pd.DataFrame(d)
+    variables, columns = _get_sparql_typed_columns(endpoint, query)
+    df = pd.DataFrame(columns, columns=variables)
     return df
+
+
+def iter_sparql_dataframes(
+    endpoint: str,
+    query: Union[str, bytes],
+    chunk_rows: int = 10000,
+    page_size: Optional[int] = None,
+    dtypes: Optional[Dict[str, Any]] = None,
+) -> Iterator["pd.DataFrame"]:
+    """Stream the results of a SELECT query as a sequence of dataframes of at most ``chunk_rows`` rows.
+
+    The JSON response is decoded while it is read, so only one chunk is held in memory at a time. All the chunks
+    have one column per SELECT variable, in the same order, and the same dtypes: they are decided by the first chunk
+    (using nullable dtypes, so that later chunks with unbound values keep them), unless given in ``dtypes``. The
+    columns of the variables not bound in the first chunk cannot be typed from it: they are of ``object`` dtype (with
+    a warning), so give the dtypes of such sparse columns in ``dtypes``. Values of later chunks that do not fit the
+    dtype of their column are kept as objects, with a warning. When there are no solutions, a single empty dataframe
+    is yielded.
+
+    If ``page_size`` is set, the query is sent several times with a LIMIT/OFFSET clause added, fetching
+    ``page_size`` solutions each time, until a page comes back incomplete. The query must not use LIMIT or OFFSET
+    itself, and should have an ORDER BY clause so that the pages are consistent.
+    """
+    # pandas inside to avoid requiring it
+    import pandas as pd
+
+    variables, bindings = _iter_select_bindings(endpoint, query, page_size)
+    schema: Optional[Dict[str, Any]] = None
+    for columns in _iter_typed_columns(variables, bindings, chunk_rows):
+        if schema is None:
+            schema = dict(dtypes or {})
+            unbound = []
+            for var in variables:
+                if var in schema:
+                    continue
+                if any(v is not None for v in columns[var]):
+                    schema[var] = _column_dtype(columns[var])
+                else:
+                    schema[var] = object
+                    unbound.append(var)
+            if unbound:
+                warnings.warn(
+                    "%s not bound in the first chunk; their columns are of object dtype, unless given in dtypes"
+                    % ", ".join("'%s'" % var for var in unbound),
+                    RuntimeWarning,
+                )
+        df = pd.DataFrame(columns, columns=variables)
+        for var in variables:
+            try:
+                df[var] = df[var].astype(schema[var])
+            except (TypeError, ValueError, OverflowError):
+                warnings.warn(
+                    "values of '%s' do not fit dtype %s; keeping them as objects"
+                    % (var, schema[var]),
+                    RuntimeWarning,
+                )
+                df[var] = df[var].astype(object)
+        yield df
+    if schema is None:
+        # no solutions: a single empty dataframe, with the columns
+        yield pd.DataFrame(
+            {
+                var: pd.Series([], dtype=(dtypes or {}).get(var, object))
+                for var in variables
+            },
+            columns=variables,
+        )
+
+
+def get_sparql_polars(
+    endpoint: str,
+    query: Union[str, bytes],
+    chunk_rows: int = 10000,
+    page_size: Optional[int] = None,
+) -> "pl.DataFrame":
+    """Query a SPARQL endpoint and return the results of a SELECT query as a Polars dataframe.
+
+    The results are streamed and converted ``chunk_rows`` solutions at a time (see
+    :func:`iter_sparql_dataframes` for ``page_size``), without going through pandas, so that only one chunk is held
+    as Python values. The dataframe holds the whole result: the dataframes of the chunks are concatenated without
+    copying them, except the columns whose types differ between chunks (turned into strings, or promoted).
+    """
+    # polars inside to avoid requiring it
+    import polars as pl
+
+    variables, bindings = _iter_select_bindings(endpoint, query, page_size)
+    frames = [
+        pl.DataFrame({var: _uniform_column(columns[var]) for var in variables})
+        for columns in _iter_typed_columns(variables, bindings, chunk_rows)
+    ]
+    if not frames:
+        return pl.DataFrame({var: [] for var in variables})
+    return _concat_polars_frames(frames)
+
+
+def register_sparql_duckdb(
+    connection: "duckdb.DuckDBPyConnection",
+    name: str,
+    endpoint: str,
+    query: Union[str, bytes],
+    chunk_rows: int = 10000,
+    page_size: Optional[int] = None,
+) -> "duckdb.DuckDBPyRelation":
+    """Register the results of a SELECT query as the DuckDB view ``name`` of ``connection``, so that they can be
+    queried with SQL.
+
+    The results are streamed and converted ``chunk_rows`` solutions at a time (see
+    :func:`iter_sparql_dataframes` for ``page_size``), without going through pandas, so that only one chunk is held
+    as Python values. The view is an Arrow table holding the whole result (so that it can be queried more than
+    once): the tables of the chunks are concatenated without copying them, except the columns whose types differ
+    between chunks. The columns holding values of different types, in one chunk or across chunks, and the integers
+    beyond 64 bits are stored as strings.
+
+    :return: the relation of the registered view.
+    """
+    # pyarrow inside to avoid requiring it
+    import pyarrow as pa
+
+    variables, bindings = _iter_select_bindings(endpoint, query, page_size)
+    tables = [
+        pa.Table.from_pydict(
+            {var: _uniform_column(columns[var]) for var in variables}
+        )
+        for columns in _iter_typed_columns(variables, bindings, chunk_rows)
+    ]
+    if tables:
+        table = _concat_arrow_tables(tables)
+    else:
+        table = pa.table({var: pa.array([], pa.string()) for var in variables})
+    connection.register(name, table)
+    return connection.table(name)
@@ -0,0 +1,230 @@
+# -*- coding: utf-8 -*-
+
+"""
+`OpenTelemetry <https://opentelemetry.io/>`_ instrumentation of the SPARQL requests, as a middleware (see
+:mod:`SPARQLWrapper.middleware`):
+
+* a client span per request, named after the query form (like ``SPARQL SELECT``), with the endpoint, the query form,
+  the return format, the HTTP status code and the request and response sizes, whose context is propagated to the
+  endpoint in the request headers (like the W3C ``traceparent`` header);
+* a child span per conversion of the results, with their number of rows (solutions, or triples);
+* the ``sparql.client.duration``, ``sparql.client.request.size`` and ``sparql.client.response.size`` histograms.
+
+The request span ends when the response headers are received, as the response body may be read much later (or
+not at all); the size of the body read and the number of rows are set on the conversion span. The response size
+is recorded once the query is complete (see :meth:`SPARQLWrapper.middleware.Middleware.on_complete`).
+
+OpenTelemetry is only imported by :func:`instrument` (and :class:`TelemetryMiddleware`); when it is not installed,
+:func:`instrument` has no effect.
+
+.. versionadded:: 2.0.1
+"""
+
+import time
+import urllib.parse
+import urllib.request
+import warnings
+import weakref
+from typing import Any, Dict, Optional, Tuple
+
+from SPARQLWrapper import __version__
+from SPARQLWrapper.middleware import Middleware
+from SPARQLWrapper.timing import QueryTiming
+from SPARQLWrapper.Wrapper import QueryResult, SPARQLWrapper
+
+_middleware: Optional["TelemetryMiddleware"] = None
+
+
+def _url(url: str) -> str:
+    """The URL without its query string (which may hold the query)."""
+    return urllib.parse.urlsplit(url)._replace(query="", fragment="").geturl()
+
+
+def _request_size(request: urllib.request.Request) -> Optional[int]:
+    data = request.data
+    if data is None:
+        return len(urllib.parse.urlsplit(request.full_url).query)
+    if isinstance(data, (bytes, bytearray)):
+        return len(data)
+    return None
+
+
+def _row_count(converted: Any) -> Optional[int]:
+    """The number of solutions of converted SELECT results, or of triples of a converted graph."""
+    if isinstance(converted, dict):
+        if isinstance(converted.get("results"), dict):
+            return len(converted["results"].get("bindings", []))
+        if "boolean" in converted:
+            return 1
+        return None
+    if hasattr(converted, "triples") and hasattr(converted, "__len__"):
+        return len(converted)
+    return None
+
+
+class TelemetryMiddleware(Middleware):
+    """Middleware creating the OpenTelemetry spans and recording the metrics of the requests.
+
+    :raises ImportError: if OpenTelemetry is not installed.
+    """
+
+    def __init__(self, tracer_provider: Any = None, meter_provider: Any = None) -> None:
+        """
+        :param tracer_provider: the tracer provider; the **default** value is the global one.
+        :param meter_provider: the meter provider; the **default** value is the global one.
+        """
+        from opentelemetry import metrics, trace
+
+        self._tracer = trace.get_tracer(__name__, __version__, tracer_provider)
+        meter = metrics.get_meter(__name__, __version__, meter_provider)
+        self._duration = meter.create_histogram(
+            "sparql.client.duration", unit="s", description="Duration of the SPARQL requests, up to the response headers"
+        )
+        self._request_size = meter.create_histogram(
+            "sparql.client.request.size", unit="By", description="Size of the SPARQL request bodies (or query strings)"
+        )
+        self._response_size = meter.create_histogram(
+            "sparql.client.response.size", unit="By", description="Size of the SPARQL response bodies read"
+        )
+        # request -> (span, start, metric attributes); the start is None once the duration is recorded
+        self._spans: (
+            "weakref.WeakKeyDictionary[urllib.request.Request, Tuple[Any, Optional[float], Dict[str, Any]]]"
+        ) = weakref.WeakKeyDictionary()
+
+    def before_request(self, sparql: SPARQLWrapper, request: urllib.request.Request) -> None:
+        from opentelemetry import propagate, trace
+
+        url = _url(request.full_url)
+        method = request.get_method()
+        if url in (_url(sparql.endpoint), _url(sparql.updateEndpoint)):
+            operation = sparql.queryType
+        else:
+            # like a request of the Graph Store HTTP Protocol
+            operation = method
+        parts = urllib.parse.urlsplit(url)
+        attributes: Dict[str, Any] = {
+            "db.system": "sparql",
+            "db.operation.name": operation,
+            "server.address": parts.hostname or "",
+            "server.port": parts.port or (443 if parts.scheme == "https" else 80),
+        }
+        span = self._tracer.start_span(
+            "SPARQL %s" % operation,
+            kind=trace.SpanKind.CLIENT,
+            attributes=dict(
+                attributes,
+                **{
+                    "url.full": url,
+                    "http.request.method": method,
+                    "sparql.return_format": sparql.returnFormat,
+                }
+            ),
+        )
+        size = _request_size(request)
+        if size is not None:
+            if span.is_recording():
+                span.set_attribute("http.request.body.size", size)
+            self._request_size.record(size, attributes)
+        carrier: Dict[str, str] = {}
+        propagate.inject(carrier, context=trace.set_span_in_context(span))
+        for name, value in carrier.items():
+            request.add_header(name, value)
+        self._spans[request] = (span, time.perf_counter(), attributes)
+        return None
+
+    def after_response(self, sparql: SPARQLWrapper, request: urllib.request.Request, response: Any) -> Any:
+        # the metrics are recorded even when the span is not sampled
+        entry = self._spans.get(request)
+        if entry is None:
+            return response
+        span, start, attributes = entry
+        if start is None:
+            return response
+        self._spans[request] = (span, None, attributes)
+        status = getattr(response, "status", None)
+        if status is not None:
+            attributes["http.response.status_code"] = status
+            if span.is_recording():
+                span.set_attribute("http.response.status_code", status)
+        span.end()
+        self._duration.record(time.perf_counter() - start, attributes)
+        return response
+
+    def on_error(self, sparql: SPARQLWrapper, request: urllib.request.Request, error: Exception) -> None:
+        from opentelemetry.trace import Status, StatusCode
+
+        entry = self._spans.get(request)
+        if entry is None:
+            return None
+        span, start, attributes = entry
+        if start is None:
+            return None
+        self._spans[request] = (span, None, attributes)
+        attributes["error.type"] = type(error).__qualname__
+        code = getattr(error, "code", None)
+        if isinstance(code, int):
+            attributes["http.response.status_code"] = code
+        if span.is_recording():
+            if isinstance(code, int):
+                span.set_attribute("http.response.status_code", code)
+            span.set_attribute("error.type", attributes["error.type"])
+            span.record_exception(error)
+            span.set_status(Status(StatusCode.ERROR, str(error)))
+        span.end()
+        self._duration.record(time.perf_counter() - start, attributes)
+        return None
+
+    def on_convert(self, result: QueryResult, converted: Any) -> Any:
+        from opentelemetry import trace
+
+        entry = self._spans.get(result.request) if result.request is not None else None
+        context = trace.set_span_in_context(entry[0]) if entry is not None else None
+        timing = result.timing
+        end = time.time_ns()
+        start = end - int((timing.convert or 0.0) * 1e9) if timing is not None else end
+        span = self._tracer.start_span("SPARQL convert", context=context, start_time=start)
+        rows = _row_count(converted)
+        if rows is not None:
+            span.set_attribute("sparql.result.rows", rows)
+        if timing is not None:
+            span.set_attribute("http.response.body.size", timing.responseBytes)
+        span.end(end_time=end)
+        return converted
+
+    def on_complete(self, timing: QueryTiming) -> None:
+        # once per request, however many times its results are converted (or not at all)
+        if timing.error is not None:
+            return None
+        entry = self._spans.get(timing._request) if timing._request is not None else None
+        self._response_size.record(timing.responseBytes, entry[2] if entry is not None else {})
+        return None
+
+
+def instrument(tracer_provider: Any = None, meter_provider: Any = None) -> Optional[TelemetryMiddleware]:
+    """Instrument all the wrappers (see :meth:`SPARQLWrapper.Wrapper.SPARQLWrapper.registerMiddleware`); calling it
+    again has no effect.
+
+    :param tracer_provider: the tracer provider; the **default** value is the global one.
+    :param meter_provider: the meter provider; the **default** value is the global one.
+    :return: the middleware registered, or ``None`` if OpenTelemetry is not installed.
+    """
+    global _middleware
+    if _middleware is None:
+        try:
+            _middleware = TelemetryMiddleware(tracer_provider, meter_provider)
+        except ImportError:
+            warnings.warn(
+                "OpenTelemetry is not available, so the execution of this function has no effect",
+                RuntimeWarning,
+            )
+            return None
+        SPARQLWrapper.registerMiddleware(_middleware)
+    return _middleware
+
+
+def uninstrument() -> None:
+    """Remove the instrumentation added by :func:`instrument`."""
+    global _middleware
+    if _middleware is not None:
+        SPARQLWrapper.unregisterMiddleware(_middleware)
+        _middleware = None
@@ -0,0 +1,276 @@
+# -*- coding: utf-8 -*-
+
+"""
+Timing of the queries: each :class:`SPARQLWrapper.Wrapper.QueryResult` returned by
+:meth:`SPARQLWrapper.Wrapper.SPARQLWrapper.query` holds a :class:`QueryTiming` record (its ``timing`` attribute) with
+the duration of each phase of the query, to tell whether the time goes into the network, the endpoint or the parsing
+of the results.
+
+The connection phases (DNS resolution, TCP connection, TLS handshake) are only measured when the opener of this
+module is installed, see :meth:`SPARQLWrapper.Wrapper.SPARQLWrapper.setUseDetailedTiming`.
+
+.. versionadded:: 2.0.1
+"""
+
+import http.client
+import socket
+import ssl
+import threading
+import time
+import urllib.request
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+# the timing record of the request being sent by the current thread, for the connections of the timing opener
+_state = threading.local()
+
+
+class QueryTiming(object):
+    """
+    Timing record of a query. The durations are in seconds, and ``None`` when the phase has not been measured (or
+    has not happened, like the connection phases when an open connection is reused).
+
+    :ivar endpoint: the URL of the endpoint.
+    :vartype endpoint: string
+    :ivar queryType: the query form, like ``SELECT`` or ``INSERT``.
+    :vartype queryType: string
+    :ivar method: the HTTP method of the request.
+    :vartype method: string
+    :ivar requestedFormat: the requested return format.
+    :vartype requestedFormat: string
+    :ivar query: the query (only its beginning, for a query streamed from a file or a generator).
+    :vartype query: string
+    :ivar started: the time (as returned by :func:`time.time`) at which the query started.
+    :vartype started: float
+    :ivar build: the time spent building the request.
+    :vartype build: float
+    :ivar dns: the time spent resolving the host name (only with the timing opener).
+    :vartype dns: float
+    :ivar connect: the time spent opening the TCP connection (only with the timing opener).
+    :vartype connect: float
+    :ivar tls: the time spent in the TLS handshake (only with the timing opener).
+    :vartype tls: float
+    :ivar ttfb: the time to first byte: from the start of the request, including the connection phases, to the
+      reception of the response headers.
+    :vartype ttfb: float
+    :ivar download: the time spent reading the response body.
+    :vartype download: float
+    :ivar convert: the time spent in :meth:`SPARQLWrapper.Wrapper.QueryResult.convert`, without the time spent
+      reading the response body.
+    :vartype convert: float
+    :ivar requestBytes: the size of the request body (of the query string of the URL for ``GET`` requests), in
+      bytes; ``None`` if the body is a file.
+    :vartype requestBytes: int
+    :ivar responseBytes: the number of bytes of the response body read so far.
+    :vartype responseBytes: int
+    :ivar status: the HTTP status code of the response.
+    :vartype status: int
+    :ivar error: the name of the class of the exception raised, if the request failed.
+    :vartype error: string
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        queryType: Optional[str] = None,
+        method: Optional[str] = None,
+        requestedFormat: Optional[str] = None,
+        hook: Optional[Callable[["QueryTiming"], None]] = None,
+        query: Optional[str] = None,
+    ) -> None:
+        """
+        :param endpoint: the URL of the endpoint.
+        :param queryType: the query form.
+        :param method: the HTTP method of the request.
+        :param requestedFormat: the requested return format.
+        :param hook: called with the record once it is complete, see
+          :meth:`SPARQLWrapper.Wrapper.SPARQLWrapper.setTimingHook`.
+        :param query: the query.
+        """
+        self.endpoint = endpoint
+        self.queryType = queryType
+        self.method = method
+        self.requestedFormat = requestedFormat
+        self.query = query
+        self.started = time.time()
+        self.build: Optional[float] = None
+        self.dns: Optional[float] = None
+        self.connect: Optional[float] = None
+        self.tls: Optional[float] = None
+        self.ttfb: Optional[float] = None
+        self.download: Optional[float] = None
+        self.convert: Optional[float] = None
+        self.requestBytes: Optional[int] = None
+        self.responseBytes = 0
+        self.status: Optional[int] = None
+        self.error: Optional[str] = None
+        # the request sent, for the ``request`` of the result
+        self._request: Optional[urllib.request.Request] = None
+        self._hook = hook
+        self._busy = 0
+        self._finished = False
+
+    @property
+    def total(self) -> float:
+        """The total time measured: the sum of :attr:`build`, :attr:`ttfb`, :attr:`download` and :attr:`convert`."""
+        return sum(phase or 0.0 for phase in (self.build, self.ttfb, self.download, self.convert))
+
+    def toDict(self) -> Dict[str, Any]:
+        """Return the record as a dictionary (of JSON serializable values), for instance to export it.
+
+        :rtype: dict
+        """
+        record = {name: value for name, value in self.__dict__.items() if not name.startswith("_")}
+        record["total"] = self.total
+        return record
+
+    def _finish(self) -> None:
+        """Internal method called when the record is complete: call the hook, once."""
+        if self._finished or self._busy:
+            return
+        self._finished = True
+        if self._hook is not None:
+            self._hook(self)
+
+    def __repr__(self) -> str:
+        phases = ", ".join(
+            "%s=%.6f" % (name, value)
+            for name, value in self.toDict().items()
+            if isinstance(value, float) and name != "started"
+        )
+        return "<QueryTiming %s %s>" % (self.endpoint, phases)
+
+
+def _countBytes(timing: QueryTiming, data: Iterable[Any]) -> Iterator[Any]:
+    """Internal generator counting the bytes of a request body sent from an iterable."""
+    timing.requestBytes = 0
+    for chunk in data:
+        timing.requestBytes += len(chunk)
+        yield chunk
+
+
+class _TimedResponse(object):
+    """Proxy of an HTTP response, adding the time spent reading the body and the number of bytes read to a timing
+    record. The record is complete when the body has been read to its end (unless it is being converted)."""
+
+    def __init__(self, response: Any, timing: QueryTiming) -> None:
+        self._response = response
+        self._timing = timing
+        # an HTTP response closes itself once its body has been read (when its length is known)
+        self._isclosed = getattr(response, "isclosed", None)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._response, name)
+
+    def _count(self, start: float, size: int, end: bool) -> None:
+        timing = self._timing
+        timing.download = (timing.download or 0.0) + time.perf_counter() - start
+        timing.responseBytes += size
+        if end or (self._isclosed is not None and self._isclosed()):
+            timing._finish()
+
+    def read(self, amt: Optional[int] = None) -> bytes:
+        start = time.perf_counter()
+        data: bytes = self._response.read() if amt is None or amt < 0 else self._response.read(amt)
+        self._count(start, len(data), amt is None or amt < 0 or (not data and amt != 0))
+        return data
+
+    def read1(self, amt: int = -1) -> bytes:
+        start = time.perf_counter()
+        data: bytes = self._response.read1(amt)
+        self._count(start, len(data), not data and amt != 0)
+        return data
+
+    def readinto(self, buffer: Any) -> int:
+        start = time.perf_counter()
+        size: int = self._response.readinto(buffer)
+        self._count(start, size or 0, not size and len(buffer) != 0)
+        return size
+
+    def readline(self, limit: int = -1) -> bytes:
+        start = time.perf_counter()
+        line: bytes = self._response.readline(limit)
+        self._count(start, len(line), not line and limit != 0)
+        return line
+
+    def readlines(self, hint: int = -1) -> List[bytes]:
+        return list(iter(self.readline, b""))
+
+    def __iter__(self) -> "_TimedResponse":
+        return self
+
+    def __next__(self) -> bytes:
+        line = self.readline()
+        if not line:
+            raise StopIteration
+        return line
+
+    def __enter__(self) -> "_TimedResponse":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self._response.close()
+
+
+def _createConnection(address: Any, timeout: Any = None, source_address: Any = None) -> socket.socket:
+    """Internal replacement of :func:`socket.create_connection` timing the DNS resolution and the TCP connection
+    for the record of the current thread."""
+    timing: Optional[QueryTiming] = getattr(_state, "timing", None)
+    start = time.perf_counter()
+    host, port = address
+    addresses = socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM)
+    resolved = time.perf_counter()
+    error: Optional[OSError] = None
+    for family, socketType, proto, _, socketAddress in addresses:
+        sock = socket.socket(family, socketType, proto)
+        try:
+            if timeout is None or isinstance(timeout, (int, float)):
+                sock.settimeout(timeout)
+            if source_address:
+                sock.bind(source_address)
+            sock.connect(socketAddress)
+        except OSError as e:
+            error = e
+            sock.close()
+            continue
+        if timing is not None:
+            timing.dns = resolved - start
+            timing.connect = time.perf_counter() - resolved
+        return sock
+    raise error if error is not None else OSError("getaddrinfo returns an empty list")
+
+
+class _TimingHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super(_TimingHTTPConnection, self).__init__(*args, **kwargs)
+        self._create_connection = _createConnection
+
+
+class _TimingHTTPSConnection(http.client.HTTPSConnection):
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super(_TimingHTTPSConnection, self).__init__(*args, **kwargs)
+        self._create_connection = _createConnection
+
+    def connect(self) -> None:
+        http.client.HTTPConnection.connect(self)
+        start = time.perf_counter()
+        serverHostname = self._tunnel_host if self._tunnel_host else self.host  # type: ignore[attr-defined]
+        context: ssl.SSLContext = self._context  # type: ignore[attr-defined]
+        self.sock = context.wrap_socket(self.sock, server_hostname=serverHostname)
+        timing: Optional[QueryTiming] = getattr(_state, "timing", None)
+        if timing is not None:
+            timing.tls = time.perf_counter() - start
+
+
+class TimingHTTPHandler(urllib.request.HTTPHandler):
+    """:mod:`urllib` handler of the ``http`` URLs measuring the DNS resolution and the TCP connection."""
+
+    def http_open(self, req: urllib.request.Request) -> http.client.HTTPResponse:
+        return self.do_open(_TimingHTTPConnection, req)
+
+
+class TimingHTTPSHandler(urllib.request.HTTPSHandler):
+    """:mod:`urllib` handler of the ``https`` URLs measuring the DNS resolution, the TCP connection and the TLS
+    handshake."""
+
+    def https_open(self, req: urllib.request.Request) -> http.client.HTTPResponse:
+        return self.do_open(_TimingHTTPSConnection, req, context=self._context)  # type: ignore[attr-defined]
@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark of the conversion of a large SPARQL JSON result (:meth:`QueryResult._convertJSON`), with the standard
+library and with the faster JSON library picked when one is installed (orjson, simdjson or ujson). Reports the
+time and the peak of memory allocated while converting.
+
+Usage: ``python benchmarks/bench_json.py [size in MB]`` (the **default** size is 100 MB)
+"""
+
+import gc
+import io
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import SPARQLWrapper.Wrapper as Wrapper  # noqa: E402
+from SPARQLWrapper.Wrapper import JSON, QueryResult  # noqa: E402
+
+
+class FakeResponse(io.BytesIO):
+    def info(self):
+        return {"content-type": "application/sparql-results+json"}
+
+
+def generateResult(size):
+    """Generate a SPARQL JSON result of about ``size`` bytes."""
+    binding = {
+        "s": {"type": "uri", "value": "http://example.org/resource/%08d"},
+        "label": {"type": "literal", "xml:lang": "en", "value": "Label number %08d"},
+        "n": {
+            "type": "literal",
+            "datatype": "http://www.w3.org/2001/XMLSchema#integer",
+            "value": "%d",
+        },
+    }
+    template = json.dumps(binding)
+    count = size // len(template % (0, 0, 0)) + 1
+    bindings = ",".join(template % (i, i, i) for i in range(count))
+    return (
+        '{"head": {"vars": ["s", "label", "n"]}, "results": {"bindings": [%s]}}' % bindings
+    ).encode("utf-8")
+
+
+def measure(loader, content):
+    Wrapper._jsonLoader = loader
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = QueryResult((FakeResponse(content), JSON)).convert()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return elapsed, peak
+
+
+def main(size=100):
+    content = generateResult(size * 2**20)
+    loader = Wrapper._findJSONLoader()
+    print("%d MB of SPARQL JSON results" % (len(content) // 2**20))
+    baseline, baselinePeak = measure(json.loads, content)
+    print("%-8s %7.2f s, peak %7.1f MB" % ("json", baseline, baselinePeak / 2**20))
+    elapsed, peak = measure(loader, content)
+    print(
+        "%-8s %7.2f s, peak %7.1f MB (x%.1f faster, %+.1f MB)"
+        % (
+            loader.__module__,
+            elapsed,
+            peak / 2**20,
+            baseline / elapsed,
+            (peak - baselinePeak) / 2**20,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
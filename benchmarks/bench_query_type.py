@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Micro-benchmark of the query type detection done by :meth:`SPARQLWrapper.setQuery`, comparing the single-pass
+scanner (:attr:`SPARQLWrapper.tokens_pattern`) with the previous comments/prefixes/keyword regular expressions, on
+generated queries with large prologues.
+
+Usage: ``python benchmarks/bench_query_type.py [repeat]``
+"""
+
+import os
+import re
+import sys
+import timeit
+import warnings
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from SPARQLWrapper import SPARQLWrapper  # noqa: E402
+
+
+def regexQueryType(sparql, query):
+    """The query type detection based on three regular expressions, as it was before the scanner."""
+    query = sparql._cleanComments(query)
+    query_for_queryType = re.sub(sparql.prefix_pattern, "", query.strip())
+    return sparql.pattern.search(query_for_queryType).group("queryType").upper()
+
+
+def generateQuery(size):
+    """Generate a SELECT query of about ``size`` bytes: mostly prefixes and comments, then a long VALUES block."""
+    lines = []
+    length = 0
+    i = 0
+    while length < size // 2:
+        lines.append("# namespace number %d\n" % i)
+        lines.append("PREFIX ns%d: <http://example.org/vocabulary/%d/terms#>\n" % (i, i))
+        length += len(lines[-2]) + len(lines[-1])
+        i += 1
+    lines.append("SELECT ?s ?label WHERE {\n  VALUES ?s {\n")
+    while length < size:
+        lines.append('    ns%d:item "a literal with SELECT in it" \n' % (i % 100))
+        length += len(lines[-1])
+        i += 1
+    lines.append("  }\n  ?s rdfs:label ?label\n}\n")
+    return "".join(lines)
+
+
+def main(repeat=5):
+    sparql = SPARQLWrapper("http://example.org/sparql")
+    warnings.simplefilter("ignore")
+    for size in [1000, 10000, 100000, 1000000]:
+        query = generateQuery(size)
+        assert sparql._parseQueryType(query) == regexQueryType(sparql, query) == "SELECT"
+        number = max(1, 100000 // size)
+        scanner = min(
+            timeit.repeat(lambda: sparql._parseQueryType(query), number=number, repeat=repeat)
+        )
+        regexes = min(
+            timeit.repeat(lambda: regexQueryType(sparql, query), number=number, repeat=repeat)
+        )
+        print(
+            "%8d bytes: scanner %9.3f ms, regexes %9.3f ms (x%.1f)"
+            % (
+                len(query),
+                1000 * scanner / number,
+                1000 * regexes / number,
+                regexes / scanner,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
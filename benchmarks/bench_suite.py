@@ -0,0 +1,358 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark suite, run offline against the local endpoint of ``mock_endpoint.py``:
+
+* ``request/*``: building the HTTP request of a query (:meth:`SPARQLWrapper._createRequest`), with and without
+  setting the query again;
+* ``convert/*`` and ``stream/*``: :meth:`QueryResult.convert` and :meth:`QueryResult.stream` for each format of SELECT
+  and CONSTRUCT results, from bodies held in memory;
+* ``bindings/*``: :class:`SPARQLWrapper.SmartWrapper.Bindings`;
+* ``dataframe/*``: the typed columns of :mod:`SPARQLWrapper.sparql_dataframe`, and ``get_sparql_typed_dict`` and
+  ``get_sparql_dataframe`` through the endpoint (when pandas is installed);
+* ``qps/*``: end-to-end queries per second (``queryAndConvert`` of small SELECT results), with one and with several
+  threads.
+
+Each benchmark is repeated, and reported with the minimum, median and mean time of one call; with ``--memory``, it
+is also run once more with :mod:`tracemalloc` to report the peak of memory allocated by one call. The ``--json``
+output also holds the times of all the repeats and a description of the environment, to compare runs (see
+``regression_gate.py``).
+
+Usage: ``python benchmarks/bench_suite.py [--rows N] [--repeat N] [--duration S] [--threads N] [--memory]
+[--interleave] [--json FILE] [pattern ...]``, where the patterns (like ``convert/select-*``) select the benchmarks to
+run.
+"""
+
+import argparse
+import fnmatch
+import gc
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import threading
+import time
+import timeit
+import tracemalloc
+import urllib.request
+import warnings
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import SPARQLWrapper.Wrapper as Wrapper  # noqa: E402
+from mock_endpoint import MockEndpoint  # noqa: E402
+from SPARQLWrapper import __version__  # noqa: E402
+from SPARQLWrapper.SmartWrapper import Bindings  # noqa: E402
+from SPARQLWrapper.Wrapper import (  # noqa: E402
+    BINARY,
+    BINDINGS,
+    CSV,
+    DOM,
+    ELEMENTTREE,
+    JSON,
+    JSONLD,
+    POST,
+    PROTOBUF,
+    RDFXML,
+    THRIFT,
+    TSV,
+    TURTLE,
+    XML,
+    QueryResult,
+    SPARQLWrapper,
+)
+
+QUERY = """
+PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
+PREFIX ex: <http://example.org/>
+# synthetic results: the query is not evaluated by the mock endpoint
+SELECT ?s ?label ?n WHERE {
+    ?s a ex:Resource ; ex:value ?n .
+    OPTIONAL { ?s rdfs:label ?label FILTER (lang(?label) = "en") }
+}
+"""
+
+# (name, query form, media type, return format, XML result type or None)
+CONVERSIONS = [
+    ("select-json", "SELECT", "application/sparql-results+json", JSON, None),
+    ("select-xml-dom", "SELECT", "application/sparql-results+xml", XML, DOM),
+    ("select-xml-etree", "SELECT", "application/sparql-results+xml", XML, ELEMENTTREE),
+    ("select-xml-bindings", "SELECT", "application/sparql-results+xml", XML, BINDINGS),
+    ("select-csv", "SELECT", "text/csv", CSV, None),
+    ("select-tsv", "SELECT", "text/tab-separated-values", TSV, None),
+    ("select-binary", "SELECT", "application/x-binary-rdf-results-table", BINARY, None),
+    ("select-thrift", "SELECT", "application/sparql-results+thrift", THRIFT, None),
+    ("select-protobuf", "SELECT", "application/sparql-results+protobuf", PROTOBUF, None),
+    ("construct-turtle", "CONSTRUCT", "text/turtle", TURTLE, None),
+    ("construct-rdfxml", "CONSTRUCT", "application/rdf+xml", RDFXML, None),
+    ("construct-jsonld", "CONSTRUCT", "application/ld+json", JSONLD, None),
+]
+
+
+class FakeResponse(io.BytesIO):
+    def __init__(self, content, contentType):
+        super(FakeResponse, self).__init__(content)
+        self.contentType = contentType
+
+    def info(self):
+        return {"content-type": self.contentType}
+
+
+def queryResult(body, mediaType, returnFormat, xmlResultType=None):
+    result = QueryResult((FakeResponse(body, mediaType), returnFormat))
+    if xmlResultType is not None:
+        result.xmlResultType = xmlResultType
+    return result
+
+
+def requestBenchmarks(endpoint, rows):
+    sparql = SPARQLWrapper(endpoint.url)
+    sparql.setQuery(QUERY)
+    yield "request/get", sparql._createRequest, 0
+
+    post = SPARQLWrapper(endpoint.url)
+    post.setMethod(POST)
+    post.setQuery(QUERY)
+    yield "request/post", post._createRequest, 0
+
+    def setQuery():
+        sparql.setQuery(QUERY)
+        return sparql._createRequest()
+
+    yield "request/setquery-get", setQuery, 0
+
+
+def convertBenchmarks(endpoint, rows):
+    from rdflib import Graph
+
+    for name, form, mediaType, returnFormat, xmlResultType in CONVERSIONS:
+        body = endpoint.results(form, mediaType, rows)[1]
+
+        def convert(body=body, mediaType=mediaType, returnFormat=returnFormat, xmlResultType=xmlResultType):
+            return queryResult(body, mediaType, returnFormat, xmlResultType).convert()
+
+        yield "convert/" + name, convert, len(body)
+
+        if returnFormat == TURTLE:
+
+            def load(body=body, mediaType=mediaType):
+                return queryResult(body, mediaType, TURTLE).convert(graph=Graph())
+
+            yield "convert/construct-turtle-graph", load, len(body)
+
+        if xmlResultType in (None, BINDINGS) and Wrapper._FORMAT_STREAMERS.get(returnFormat):
+
+            def stream(body=body, mediaType=mediaType, returnFormat=returnFormat):
+                return sum(1 for _ in queryResult(body, mediaType, returnFormat).stream())
+
+            yield "stream/" + name.replace("-bindings", ""), stream, len(body)
+
+
+def bindingsBenchmarks(endpoint, rows):
+    mediaType, body = endpoint.results("SELECT", "application/sparql-results+json", rows)
+    yield "bindings/json", lambda: Bindings(queryResult(body, mediaType, JSON)), len(body)
+
+
+def dataframeBenchmarks(endpoint, rows):
+    from SPARQLWrapper import sparql_dataframe
+
+    mediaType, body = endpoint.results("SELECT", "application/sparql-results+json", rows)
+    results = queryResult(body, mediaType, JSON).convert()
+    variables, bindings = results["head"]["vars"], results["results"]["bindings"]
+    yield "dataframe/columns", lambda: sparql_dataframe._typed_columns(variables, bindings), len(body)
+    yield "dataframe/typed-dict", lambda: sparql_dataframe.get_sparql_typed_dict(endpoint.url, QUERY), len(body)
+    try:
+        import pandas  # noqa: F401
+    except ImportError:
+        print("dataframe/pandas skipped: pandas is not installed", file=sys.stderr)
+    else:
+        yield "dataframe/pandas", lambda: sparql_dataframe.get_sparql_dataframe(endpoint.url, QUERY), len(body)
+
+
+BENCHMARKS = [requestBenchmarks, convertBenchmarks, bindingsBenchmarks, dataframeBenchmarks]
+
+
+def selected(name, patterns):
+    return not patterns or any(fnmatch.fnmatchcase(name, pattern) for pattern in patterns)
+
+
+def measure(func, repeat):
+    """Time one call of ``func``, repeated: each repeat runs it as many times as needed to last at least 0.2 s."""
+    timer = timeit.Timer(func)
+    number = timer.autorange()[0]
+    return summarize(number, [elapsed / number for elapsed in timer.repeat(repeat, number)])
+
+
+def measureInterleaved(funcs, repeat):
+    """Time one call of each function like :func:`measure`, but with the repeats run in rounds over all the functions,
+    so that a slowdown of the machine during the run spreads over all their times instead of shifting a few of
+    them."""
+    timers = [timeit.Timer(func) for func in funcs]
+    numbers = [timer.autorange()[0] for timer in timers]
+    times = [[] for _ in funcs]
+    for _ in range(repeat):
+        for timer, number, elapsed in zip(timers, numbers, times):
+            elapsed.append(timer.timeit(number) / number)
+    return [summarize(number, elapsed) for number, elapsed in zip(numbers, times)]
+
+
+def summarize(number, times):
+    return {
+        "number": number,
+        "times": times,
+        "min": min(times),
+        "median": statistics.median(times),
+        "mean": statistics.mean(times),
+        "stdev": statistics.stdev(times) if len(times) > 1 else 0.0,
+    }
+
+
+def measureMemory(func):
+    """Return the peak of memory allocated by one call of ``func`` (tracing the allocations slows it down, so it is
+    not timed)."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def measureQPS(endpoint, threads, duration, rows=10):
+    """Run ``queryAndConvert`` from ``threads`` threads for ``duration`` seconds; return the number of queries per
+    second and the latency percentiles."""
+    latencies = [[] for _ in range(threads)]
+    deadline = time.perf_counter() + duration
+
+    def worker(latencies):
+        sparql = SPARQLWrapper(endpoint.url, returnFormat=JSON)
+        sparql.setQuery(QUERY + "LIMIT %d" % rows)
+        while True:
+            start = time.perf_counter()
+            if start >= deadline:
+                return
+            sparql.queryAndConvert()
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    workers = [threading.Thread(target=worker, args=(latencies[i],)) for i in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    samples = sorted(latency for thread in latencies for latency in thread)
+    return {
+        "threads": threads,
+        "queries": len(samples),
+        "qps": len(samples) / elapsed,
+        "p50": samples[len(samples) // 2],
+        "p99": samples[min(len(samples) - 1, len(samples) * 99 // 100)],
+    }
+
+
+def environment():
+    return {
+        "sparqlwrapper": __version__,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "json": Wrapper._findJSONLoader().__module__,
+        "elementtree": Wrapper._getElementTree().__name__,
+        "date": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+
+
+def run(patterns=(), rows=10000, repeat=5, duration=2.0, threads=4, memory=False, interleave=False, report=None):
+    """Run the benchmarks whose names match one of the patterns (all of them by default) and return the results, as
+    a list of dictionaries, with the peak of memory allocated when ``memory`` is true, and with the repeats run in
+    rounds (see :func:`measureInterleaved`) when ``interleave`` is true; ``report`` is called with each result as it
+    is measured."""
+    # the local endpoint must not be reached through a proxy
+    urllib.request.install_opener(urllib.request.build_opener(urllib.request.ProxyHandler({})))
+    results = []
+    with MockEndpoint(rows) as endpoint, warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        benchmarks = [
+            (name, func, size)
+            for benchmarks in BENCHMARKS
+            for name, func, size in benchmarks(endpoint, rows)
+            if selected(name, patterns)
+        ]
+        if interleave:
+            timings = measureInterleaved([func for _, func, _ in benchmarks], repeat)
+        for i, (name, func, size) in enumerate(benchmarks):
+            result = dict(name=name, rows=rows, bytes=size, **(timings[i] if interleave else measure(func, repeat)))
+            if memory:
+                result["peak"] = measureMemory(func)
+            results.append(result)
+            if report is not None:
+                report(result)
+        for count in sorted({1, threads}):
+            name = "qps/select-json-%dthread%s" % (count, "s" if count > 1 else "")
+            if selected(name, patterns):
+                result = dict(name=name, **measureQPS(endpoint, count, duration))
+                results.append(result)
+                if report is not None:
+                    report(result)
+    return results
+
+
+def printResult(result):
+    if "qps" in result:
+        print(
+            "%-34s %9.0f queries/s  p50 %7.3f ms  p99 %7.3f ms"
+            % (result["name"], result["qps"], 1000 * result["p50"], 1000 * result["p99"])
+        )
+        return
+    line = "%-34s %10.3f ms  median %10.3f ms  ±%5.1f%%" % (
+        result["name"],
+        1000 * result["min"],
+        1000 * result["median"],
+        100 * result["stdev"] / result["mean"] if result["mean"] else 0.0,
+    )
+    if result["bytes"]:
+        line += "  %7.1f MB/s" % (result["bytes"] / result["min"] / 2**20)
+    if "peak" in result:
+        line += "  peak %7.1f MB" % (result["peak"] / 2**20)
+    print(line)
+
+
+def document(results, rows, repeat):
+    """The JSON document of the results of a run."""
+    return {"environment": environment(), "rows": rows, "repeat": repeat, "results": results}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="SPARQLWrapper benchmark suite, against a local mock endpoint")
+    parser.add_argument("patterns", nargs="*", help="patterns of the names of the benchmarks to run (like convert/*)")
+    parser.add_argument("--rows", type=int, default=10000, help="number of solutions of the results (10000)")
+    parser.add_argument("--repeat", type=int, default=5, help="number of repeats of each benchmark (5)")
+    parser.add_argument("--duration", type=float, default=2.0, help="duration of the QPS benchmarks, in seconds (2)")
+    parser.add_argument("--threads", type=int, default=4, help="number of threads of the QPS benchmark (4)")
+    parser.add_argument("--memory", action="store_true", help="also measure the peak of memory allocated")
+    parser.add_argument("--interleave", action="store_true", help="run the repeats in rounds over the benchmarks")
+    parser.add_argument("--json", metavar="FILE", help="write the results as JSON to FILE ('-' for the output)")
+    args = parser.parse_args(argv)
+
+    # with --json -, the output is the JSON document
+    report = None if args.json == "-" else printResult
+    results = run(
+        args.patterns, args.rows, args.repeat, args.duration, args.threads, args.memory, args.interleave, report
+    )
+    if args.json == "-":
+        json.dump(document(results, args.rows, args.repeat), sys.stdout, indent=2)
+        print()
+    elif args.json:
+        with open(args.json, "w") as f:
+            json.dump(document(results, args.rows, args.repeat), f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
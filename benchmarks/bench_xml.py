@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark of the conversion of a large SPARQL XML result with each XML result type (see
+:meth:`SPARQLWrapper.setXMLResultType`) and with the streaming reader (:meth:`QueryResult.stream`). Reports the time
+and the peak of memory allocated while converting (as seen by :mod:`tracemalloc`, which does not see the memory
+allocated by lxml itself). lxml is used when it is installed.
+
+Usage: ``python benchmarks/bench_xml.py [size in MB]`` (the **default** size is 20 MB)
+"""
+
+import gc
+import io
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from SPARQLWrapper.Wrapper import (  # noqa: E402
+    BINDINGS,
+    DOM,
+    ELEMENTTREE,
+    XML,
+    QueryResult,
+    _getElementTree,
+)
+
+
+class FakeResponse(io.BytesIO):
+    def info(self):
+        return {"content-type": "application/sparql-results+xml"}
+
+
+def generateResult(size):
+    """Generate a SPARQL XML result of about ``size`` bytes."""
+    template = (
+        "<result>"
+        '<binding name="s"><uri>http://example.org/resource/%08d</uri></binding>'
+        '<binding name="label"><literal xml:lang="en">Label number %08d</literal></binding>'
+        '<binding name="n"><literal datatype="http://www.w3.org/2001/XMLSchema#integer">%d</literal></binding>'
+        "</result>\n"
+    )
+    count = size // len(template % (0, 0, 0)) + 1
+    return (
+        '<?xml version="1.0"?>\n<sparql xmlns="http://www.w3.org/2005/sparql-results#">\n'
+        '<head><variable name="s"/><variable name="label"/><variable name="n"/></head>\n<results>\n'
+        + "".join(template % (i, i, i) for i in range(count))
+        + "</results>\n</sparql>\n"
+    ).encode("utf-8")
+
+
+def measure(convert, content):
+    """Time a conversion, then run it again to measure its memory (tracing the allocations slows it down)."""
+    gc.collect()
+    start = time.perf_counter()
+    result = convert(QueryResult((FakeResponse(content), XML)))
+    elapsed = time.perf_counter() - start
+    del result
+    gc.collect()
+    tracemalloc.start()
+    result = convert(QueryResult((FakeResponse(content), XML)))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return elapsed, peak
+
+
+def convertAs(xmlResultType):
+    def convert(result):
+        result.xmlResultType = xmlResultType
+        return result.convert()
+
+    return convert
+
+
+def main(size=20):
+    content = generateResult(size * 2**20)
+    print(
+        "%d MB of SPARQL XML results, with %s"
+        % (len(content) // 2**20, _getElementTree().__name__)
+    )
+    baseline = None
+    for name, convert in [
+        (DOM, convertAs(DOM)),
+        (ELEMENTTREE, convertAs(ELEMENTTREE)),
+        (BINDINGS, convertAs(BINDINGS)),
+        ("stream", lambda result: sum(1 for _ in result.stream())),
+    ]:
+        elapsed, peak = measure(convert, content)
+        if baseline is None:
+            baseline = elapsed
+        print(
+            "%-8s %7.2f s (x%4.1f), peak %7.1f MB"
+            % (name, elapsed, baseline / elapsed, peak / 2**20)
+        )
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
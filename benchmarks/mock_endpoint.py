@@ -0,0 +1,372 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Local SPARQL endpoint serving synthetic results, to run the benchmarks offline and reproducibly (see
+``bench_suite.py``).
+
+The endpoint answers the queries sent with GET or POST (URL-encoded or directly) without evaluating them: a SELECT
+query gets solutions of ``?s`` (an IRI), ``?label`` (a language-tagged literal, unbound in one solution out of ten)
+and ``?n`` (an integer), an ASK query gets ``true``, and a CONSTRUCT or DESCRIBE query gets two triples per resource.
+The number of solutions (or resources) is the LIMIT of the query, or the ``rows`` of the endpoint. The format is
+negotiated with the Accept header, among all the formats supported by :class:`SPARQLWrapper.Wrapper.QueryResult`:
+
+* SELECT: SPARQL JSON, XML, CSV and TSV, RDF4J binary, Jena Thrift and Protobuf (JSON by default);
+* ASK: SPARQL JSON and XML (JSON by default);
+* CONSTRUCT and DESCRIBE: Turtle (written as N-Triples), RDF/XML and JSON-LD (Turtle by default).
+
+The results are generated once per format and size, and then served from memory.
+
+Usage: ``python benchmarks/mock_endpoint.py [port] [rows]``, or in-process::
+
+    with MockEndpoint(rows=1000) as endpoint:
+        sparql = SPARQLWrapper(endpoint.url)
+"""
+
+import json
+import re
+import struct
+import sys
+import threading
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+EX = "http://example.org/"
+RDFS_LABEL = "http://www.w3.org/2000/01/rdf-schema#label"
+XSD = "http://www.w3.org/2001/XMLSchema#"
+VARIABLES = ["s", "label", "n"]
+
+
+def solutions(rows):
+    """Generate the synthetic solutions, as ``(s, label, n)`` tuples; ``label`` is ``None`` when unbound."""
+    for i in range(rows):
+        yield (
+            "%sresource/%d" % (EX, i),
+            None if i % 10 == 9 else "Label number %d" % i,
+            i,
+        )
+
+
+def selectJSON(rows):
+    bindings = []
+    for s, label, n in solutions(rows):
+        binding = {"s": {"type": "uri", "value": s}}
+        if label is not None:
+            binding["label"] = {"type": "literal", "xml:lang": "en", "value": label}
+        binding["n"] = {"type": "literal", "datatype": XSD + "integer", "value": str(n)}
+        bindings.append(json.dumps(binding))
+    return ('{"head": {"vars": %s}, "results": {"bindings": [\n%s\n]}}' % (
+        json.dumps(VARIABLES), ",\n".join(bindings)
+    )).encode("utf-8")
+
+
+def selectXML(rows):
+    results = []
+    for s, label, n in solutions(rows):
+        results.append(
+            '<result><binding name="s"><uri>%s</uri></binding>%s'
+            '<binding name="n"><literal datatype="%sinteger">%d</literal></binding></result>\n'
+            % (
+                s,
+                "" if label is None else '<binding name="label"><literal xml:lang="en">%s</literal></binding>' % label,
+                XSD,
+                n,
+            )
+        )
+    return (
+        '<?xml version="1.0"?>\n<sparql xmlns="http://www.w3.org/2005/sparql-results#">\n<head>%s</head>\n'
+        "<results>\n%s</results>\n</sparql>\n"
+        % ("".join('<variable name="%s"/>' % var for var in VARIABLES), "".join(results))
+    ).encode("utf-8")
+
+
+def selectCSV(rows):
+    lines = [",".join(VARIABLES)]
+    for s, label, n in solutions(rows):
+        lines.append("%s,%s,%d" % (s, label or "", n))
+    return ("\r\n".join(lines) + "\r\n").encode("utf-8")
+
+
+def selectTSV(rows):
+    lines = ["\t".join("?" + var for var in VARIABLES)]
+    for s, label, n in solutions(rows):
+        lines.append("<%s>\t%s\t%d" % (s, "" if label is None else '"%s"@en' % label, n))
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def _brtrString(s):
+    data = s.encode("utf-8")
+    return struct.pack(">i", len(data)) + data
+
+
+def selectBinary(rows):
+    # the resources and the datatype are written as prefixed names, with two namespaces declared up front
+    parts = [b"BRTR", struct.pack(">i", 4), struct.pack(">i", len(VARIABLES))]
+    parts.extend(_brtrString(var) for var in VARIABLES)
+    parts.append(b"\x02" + struct.pack(">i", 0) + _brtrString(EX + "resource/"))
+    parts.append(b"\x02" + struct.pack(">i", 1) + _brtrString(XSD))
+    integer = b"\x03" + struct.pack(">i", 1) + _brtrString("integer")
+    for s, label, n in solutions(rows):
+        parts.append(b"\x03" + struct.pack(">i", 0) + _brtrString(s[len(EX) + 9:]))
+        parts.append(b"\x00" if label is None else b"\x07" + _brtrString(label) + _brtrString("en"))
+        parts.append(b"\x08" + _brtrString(str(n)) + integer)
+    parts.append(b"\x7f")
+    return b"".join(parts)
+
+
+def _varint(n):
+    data = bytearray()
+    while n > 0x7F:
+        data.append(n & 0x7F | 0x80)
+        n >>= 7
+    data.append(n)
+    return bytes(data)
+
+
+def _zigzag(n):
+    return (n << 1) ^ (n >> 63)
+
+
+def _thriftStruct(*fields):
+    # fields: (id, type, encoded value), in increasing id order, less than 16 apart
+    data = bytearray()
+    last = 0
+    for fieldID, fieldType, value in fields:
+        data.append((fieldID - last) << 4 | fieldType)
+        data += value
+        last = fieldID
+    return bytes(data) + b"\x00"
+
+
+def _thriftString(s):
+    data = s.encode("utf-8")
+    return _varint(len(data)) + data
+
+
+def _thriftList(elementType, items):
+    return bytes([len(items) << 4 | elementType]) + b"".join(items)
+
+
+def selectThrift(rows):
+    variables = _thriftList(12, [_thriftStruct((1, 8, _thriftString(var))) for var in VARIABLES])
+    unbound = _thriftStruct((7, 12, _thriftStruct()))
+    parts = [_thriftStruct((1, 9, variables))]
+    for s, label, n in solutions(rows):
+        row = [
+            _thriftStruct((1, 12, _thriftStruct((1, 8, _thriftString(s))))),
+            unbound
+            if label is None
+            else _thriftStruct((3, 12, _thriftStruct((1, 8, _thriftString(label)), (2, 8, _thriftString("en"))))),
+            _thriftStruct((10, 6, _varint(_zigzag(n)))),
+        ]
+        parts.append(_thriftStruct((1, 9, _thriftList(12, row))))
+    return b"".join(parts)
+
+
+def _protobufField(fieldID, value):
+    if isinstance(value, int):
+        return _varint(fieldID << 3) + _varint(value)
+    if isinstance(value, str):
+        value = value.encode("utf-8")
+    return _varint(fieldID << 3 | 2) + _varint(len(value)) + value
+
+
+def _protobufDelimited(message):
+    return _varint(len(message)) + message
+
+
+def selectProtobuf(rows):
+    field = _protobufField
+    parts = [_protobufDelimited(b"".join(field(1, field(1, var)) for var in VARIABLES))]
+    for s, label, n in solutions(rows):
+        row = [
+            field(1, field(1, s)),
+            field(8, b"") if label is None else field(3, field(1, label) + field(2, "en")),
+            field(20, _zigzag(n)),
+        ]
+        parts.append(_protobufDelimited(b"".join(field(1, term) for term in row)))
+    return b"".join(parts)
+
+
+def askJSON(rows):
+    return b'{"head": {}, "boolean": true}'
+
+
+def askXML(rows):
+    return (
+        b'<?xml version="1.0"?>\n<sparql xmlns="http://www.w3.org/2005/sparql-results#">'
+        b"<head/><boolean>true</boolean></sparql>\n"
+    )
+
+
+def constructNTriples(rows):
+    lines = []
+    for s, label, n in solutions(rows):
+        lines.append('<%s> <%s> "%s"@en .\n' % (s, RDFS_LABEL, label or "Unlabelled"))
+        lines.append('<%s> <%svalue> "%d"^^<%sinteger> .\n' % (s, EX, n, XSD))
+    return "".join(lines).encode("utf-8")
+
+
+def constructRDFXML(rows):
+    descriptions = []
+    for s, label, n in solutions(rows):
+        descriptions.append(
+            '<rdf:Description rdf:about="%s"><rdfs:label xml:lang="en">%s</rdfs:label>'
+            '<ex:value rdf:datatype="%sinteger">%d</ex:value></rdf:Description>\n' % (s, label or "Unlabelled", XSD, n)
+        )
+    return (
+        '<?xml version="1.0"?>\n<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#" '
+        'xmlns:rdfs="http://www.w3.org/2000/01/rdf-schema#" xmlns:ex="%s">\n%s</rdf:RDF>\n'
+        % (EX, "".join(descriptions))
+    ).encode("utf-8")
+
+
+def constructJSONLD(rows):
+    nodes = [
+        {
+            "@id": s,
+            RDFS_LABEL: [{"@value": label or "Unlabelled", "@language": "en"}],
+            EX + "value": [{"@value": str(n), "@type": XSD + "integer"}],
+        }
+        for s, label, n in solutions(rows)
+    ]
+    return json.dumps(nodes).encode("utf-8")
+
+
+# Generator of the results of each query form, by media type; the first one is the default
+RESULTS = {
+    "SELECT": [
+        ("application/sparql-results+json", selectJSON),
+        ("application/sparql-results+xml", selectXML),
+        ("text/csv", selectCSV),
+        ("text/tab-separated-values", selectTSV),
+        ("application/x-binary-rdf-results-table", selectBinary),
+        ("application/sparql-results+thrift", selectThrift),
+        ("application/sparql-results+protobuf", selectProtobuf),
+    ],
+    "ASK": [
+        ("application/sparql-results+json", askJSON),
+        ("application/sparql-results+xml", askXML),
+    ],
+    "CONSTRUCT": [
+        ("text/turtle", constructNTriples),
+        ("application/turtle", constructNTriples),
+        ("application/n-triples", constructNTriples),
+        ("text/n3", constructNTriples),
+        ("application/rdf+xml", constructRDFXML),
+        ("application/ld+json", constructJSONLD),
+    ],
+}
+RESULTS["DESCRIBE"] = RESULTS["CONSTRUCT"]
+
+_QUERY_FORM = re.compile(r"\b(SELECT|ASK|CONSTRUCT|DESCRIBE)\b", re.IGNORECASE)
+_LIMIT = re.compile(r"\bLIMIT\s+(\d+)", re.IGNORECASE)
+
+
+def negotiate(form, accept):
+    """Return the media type and the generator of the results of a query form for an Accept header."""
+    generators = RESULTS[form]
+    available = dict(generators)
+    for mediaType in (accept or "").split(","):
+        mediaType = mediaType.split(";")[0].strip().lower()
+        if mediaType in available:
+            return mediaType, available[mediaType]
+        if mediaType == "application/json" and form in ("SELECT", "ASK"):
+            return generators[0]
+    return generators[0]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "MockSPARQL/1.0"
+
+    def do_GET(self):
+        self._answer(urllib.parse.parse_qs(urllib.parse.urlsplit(self.path).query))
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length).decode("utf-8")
+        contentType = (self.headers.get("Content-Type") or "").split(";")[0].strip()
+        if contentType == "application/sparql-query":
+            params = urllib.parse.parse_qs(urllib.parse.urlsplit(self.path).query)
+            params["query"] = [body]
+        else:
+            params = urllib.parse.parse_qs(body)
+        self._answer(params)
+
+    def _answer(self, params):
+        query = (params.get("query") or [""])[0]
+        form = _QUERY_FORM.search(query)
+        if form is None:
+            self.send_error(400, "Only SELECT, ASK, CONSTRUCT and DESCRIBE queries are served")
+            return
+        limit = _LIMIT.search(query)
+        rows = int(limit.group(1)) if limit else self.server.endpoint.rows
+        mediaType, body = self.server.endpoint.results(form.group(1).upper(), self.headers.get("Accept"), rows)
+        self.send_response(200)
+        self.send_header("Content-Type", mediaType + ("; charset=utf-8" if mediaType.startswith("text/") else ""))
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        self.server.endpoint.requests += 1
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MockEndpoint(object):
+    """SPARQL endpoint serving synthetic results from a thread of the current process.
+
+    :ivar url: the URL of the endpoint.
+    :ivar rows: the number of solutions (or resources) of the queries without a LIMIT.
+    :ivar requests: the number of requests answered.
+    """
+
+    def __init__(self, rows=1000, host="127.0.0.1", port=0):
+        self.rows = rows
+        self.requests = 0
+        self._cache = {}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._server.endpoint = self
+        self.url = "http://%s:%d/sparql" % self._server.server_address[:2]
+        self._thread = None
+
+    def results(self, form, accept, rows):
+        """Return the media type and the body of the results of a query form, generated once per format and size."""
+        mediaType, generate = negotiate(form, accept)
+        key = (generate, rows)
+        with self._lock:
+            body = self._cache.get(key)
+            if body is None:
+                body = self._cache[key] = generate(rows)
+        return mediaType, body
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main(port=8890, rows=1000):
+    endpoint = MockEndpoint(rows, port=port)
+    print("Serving synthetic SPARQL results on %s" % endpoint.url)
+    try:
+        endpoint._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,238 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Performance regression gate: runs the benchmarks of the hot paths (see ``GATES``) of ``bench_suite.py``, with their
+peak of memory allocated, and compares them with a baseline run saved as JSON. It fails (exit status 1) when one of
+them regresses beyond its threshold:
+
+* in time, when the minimum time of one call grows by more than the threshold **and** the times of the run are
+  significantly above those of the baseline, by an exact one-sided Mann-Whitney U test over the repeats (with 5
+  repeats on both sides, p is at least 1/252, so that the noise of a single repeat cannot fail the gate);
+* in memory, when the peak of memory allocated grows by more than the memory threshold (and by more than 64 kB, as
+  the small peaks vary with the state of the allocator).
+
+It also fails when a benchmark of the baseline is missing from the run (renamed, or skipped as an optional library
+is not installed), and it refuses (exit status 2) too few repeats for the test to reach ``--alpha`` (like 3 repeats
+on both sides, whose smallest p is 1/20).
+
+The baselines depend on the machine and on the optional libraries installed (a warning is printed when the
+environment of the baseline differs): save one on the machine running the gate, from the reference revision. The
+repeats are run in rounds over the benchmarks, so that the test sees the slowdowns of the machine during a run, but
+not those between runs: on a shared or throttled machine, raise ``--threshold`` above the variation of the times
+between runs of the same revision.
+
+Usage::
+
+    python benchmarks/regression_gate.py --save     # on the reference revision
+    python benchmarks/regression_gate.py            # on the revision to check
+
+``--current FILE`` compares a run saved by ``bench_suite.py --memory --json FILE`` instead of running the benchmarks,
+and patterns (like ``convert/*``) gate other benchmarks than the default ones.
+"""
+
+import argparse
+import functools
+import itertools
+import json
+import math
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import bench_suite  # noqa: E402
+
+# Benchmarks gated by default: the code they cover, and their time threshold (None for the default one)
+GATES = {
+    "request/setquery-get": ("SPARQLWrapper.setQuery, _createRequest", None),
+    "convert/select-json": ("QueryResult._convertJSON", None),
+    "stream/select-json": ("QueryResult._streamJSON", None),
+    "convert/select-xml-bindings": ("QueryResult._convertXMLBindings", None),
+    "convert/select-binary": ("QueryResult._convertBinary", None),
+    "bindings/json": ("Bindings.__init__", None),
+    "dataframe/columns": ("sparql_dataframe._typed_columns", None),
+    # through the local endpoint, so noisier
+    "dataframe/pandas": ("get_sparql_dataframe", 0.2),
+}
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+MEMORY_SLACK = 64 * 1024
+
+
+@functools.lru_cache(maxsize=None)
+def _uCounts(n, m):
+    """The number of orderings of ``n`` baseline and ``m`` current values, by number of (baseline, current) pairs
+    where the current value is the greater one."""
+    if n == 0 or m == 0:
+        return (1,)
+    counts = [0] * (n * m + 1)
+    # the greatest value is either a current one, greater than the n baseline values, or a baseline one
+    for u, count in enumerate(_uCounts(n, m - 1)):
+        counts[u + n] += count
+    for u, count in enumerate(_uCounts(n - 1, m)):
+        counts[u] += count
+    return tuple(counts)
+
+
+def mannWhitneyP(baseline, current):
+    """The p-value of the exact one-sided Mann-Whitney U test that the ``current`` values are greater than the
+    ``baseline`` ones."""
+    u = sum(1.0 if c > b else 0.5 if c == b else 0.0 for b in baseline for c in current)
+    counts = _uCounts(len(baseline), len(current))
+    # all the orderings: the binomial coefficient (n + m, n)
+    return sum(counts[math.ceil(u):]) / sum(counts)
+
+
+def minimumP(n, m):
+    """The smallest p-value of :func:`mannWhitneyP` with ``n`` baseline and ``m`` current values, when all the
+    current values are greater: with too few values, it is not below the significance level, and the time test can
+    never fail."""
+    return 1 / sum(_uCounts(n, m))
+
+
+def missing(baseline, current, patterns):
+    """The names of the benchmarks gated by default or run in the baseline, matching the patterns, which are not in
+    the current run (renamed, or skipped as an optional library is not installed): those in the baseline, and
+    those in neither run."""
+    currentNames = {result["name"] for result in current["results"]}
+    baselineNames = {result["name"] for result in baseline["results"]}
+    expected = [name for name in GATES if bench_suite.selected(name, patterns)]
+    expected += sorted(name for name in baselineNames - set(expected) if bench_suite.selected(name, patterns))
+    absent = [name for name in expected if name not in currentNames]
+    return [name for name in absent if name in baselineNames], [name for name in absent if name not in baselineNames]
+
+
+def compare(baseline, current, gates, threshold=0.1, memoryThreshold=0.1, alpha=0.05):
+    """Compare the results of two runs (documents of ``bench_suite.py``) for the gated benchmarks; return a list of
+    dictionaries, whose ``status`` is ``"REGRESSION"`` for the regressions."""
+    baselineResults = {result["name"]: result for result in baseline["results"] if "times" in result}
+    comparisons = []
+    for result in current["results"]:
+        name = result["name"]
+        if name not in gates or "times" not in result:
+            continue
+        hotPath, gateThreshold = gates[name]
+        gateThreshold = threshold if gateThreshold is None else gateThreshold
+        comparison = {"name": name, "hotPath": hotPath, "current": result["min"], "status": "ok"}
+        comparisons.append(comparison)
+        reference = baselineResults.get(name)
+        if reference is None:
+            comparison["status"] = "no baseline"
+            continue
+        change = result["min"] / reference["min"] - 1
+        p = mannWhitneyP(reference["times"], result["times"])
+        comparison.update(baseline=reference["min"], change=change, p=p)
+        if change > gateThreshold:
+            comparison["status"] = "REGRESSION" if p < alpha else "slower (noise)"
+        elif change < -gateThreshold and mannWhitneyP(result["times"], reference["times"]) < alpha:
+            comparison["status"] = "faster"
+        if "peak" in result and "peak" in reference:
+            growth = result["peak"] - reference["peak"]
+            comparison.update(baselinePeak=reference["peak"], peak=result["peak"])
+            if growth > max(memoryThreshold * reference["peak"], MEMORY_SLACK):
+                comparison["status"] = "REGRESSION"
+                comparison["memoryRegression"] = True
+    return comparisons
+
+
+def printComparison(comparison):
+    line = "%-28s %-38s" % (comparison["name"], comparison["hotPath"])
+    if "baseline" in comparison:
+        line += " %9.3f -> %9.3f ms %+6.1f%% (p=%.3f)" % (
+            1000 * comparison["baseline"],
+            1000 * comparison["current"],
+            100 * comparison["change"],
+            comparison["p"],
+        )
+    else:
+        line += " %22s %9.3f ms %18s" % ("", 1000 * comparison["current"], "")
+    if "peak" in comparison:
+        line += "  peak %6.1f -> %6.1f MB" % (comparison["baselinePeak"] / 2**20, comparison["peak"] / 2**20)
+    print("%s  %s" % (line, comparison["status"]))
+
+
+def environmentChanges(baseline, current):
+    ignored = {"date", "sparqlwrapper"}
+    return [
+        "%s: %s -> %s" % (key, baseline["environment"].get(key), value)
+        for key, value in sorted(current["environment"].items())
+        if key not in ignored and baseline["environment"].get(key) != value
+    ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="SPARQLWrapper performance regression gate")
+    parser.add_argument("patterns", nargs="*", help="patterns of the names of the benchmarks to gate (like convert/*)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline file (benchmarks/baseline.json)")
+    parser.add_argument("--save", action="store_true", help="run the benchmarks and save them as the baseline")
+    parser.add_argument("--current", metavar="FILE", help="compare this run instead of running the benchmarks")
+    parser.add_argument("--threshold", type=float, default=0.1, help="time regression threshold (0.1 for 10%%)")
+    parser.add_argument("--memory-threshold", type=float, default=0.1, help="memory regression threshold (0.1)")
+    parser.add_argument("--alpha", type=float, default=0.05, help="significance level of the time test (0.05)")
+    parser.add_argument("--rows", type=int, default=10000, help="number of solutions of the results (10000)")
+    parser.add_argument("--repeat", type=int, default=5, help="number of repeats of each benchmark (5)")
+    args = parser.parse_args(argv)
+    if not args.current and minimumP(args.repeat, args.repeat) >= args.alpha:
+        repeat = next(n for n in itertools.count(1) if minimumP(n, n) < args.alpha)
+        message = "--repeat %d cannot detect time regressions at --alpha %g, use at least %d"
+        parser.error(message % (args.repeat, args.alpha, repeat))
+
+    patterns = args.patterns or list(GATES)
+    if args.current:
+        with open(args.current) as f:
+            current = json.load(f)
+    else:
+        results = bench_suite.run(patterns, args.rows, args.repeat, memory=True, interleave=True)
+        current = bench_suite.document(results, args.rows, args.repeat)
+    gates = {
+        result["name"]: GATES.get(result["name"], ("", None))
+        for result in current["results"]
+        if bench_suite.selected(result["name"], patterns)
+    }
+
+    if args.save:
+        for name in missing(current, current, patterns)[1]:
+            print("Warning: %s was not run, so it is not gated" % name, file=sys.stderr)
+        with open(args.baseline, "w") as f:
+            json.dump(current, f, indent=2)
+        print("Baseline of %d benchmarks saved in %s" % (len(current["results"]), args.baseline))
+        return 0
+
+    try:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    except FileNotFoundError:
+        print("No baseline in %s: run with --save on the reference revision first" % args.baseline, file=sys.stderr)
+        return 2
+    if baseline["rows"] != current["rows"]:
+        print("The baseline has %d rows, not %d" % (baseline["rows"], current["rows"]), file=sys.stderr)
+        return 2
+    if minimumP(baseline["repeat"], current["repeat"]) >= args.alpha:
+        print(
+            "%d baseline and %d current repeats cannot detect time regressions at --alpha %g"
+            % (baseline["repeat"], current["repeat"], args.alpha),
+            file=sys.stderr,
+        )
+        return 2
+    for change in environmentChanges(baseline, current):
+        print("Warning: the environment differs from the baseline, %s" % change, file=sys.stderr)
+
+    comparisons = compare(baseline, current, gates, args.threshold, args.memory_threshold, args.alpha)
+    for comparison in comparisons:
+        printComparison(comparison)
+    regressions = [comparison["name"] for comparison in comparisons if comparison["status"] == "REGRESSION"]
+    dropped, notRun = missing(baseline, current, patterns)
+    for name in notRun:
+        print("Warning: %s is in neither the baseline nor the current run" % name, file=sys.stderr)
+    for name in dropped:
+        print("%-28s %-38s %s" % (name, GATES.get(name, ("", None))[0], "MISSING from the current run"))
+    regressions += dropped
+    if regressions:
+        print("%d regression(s): %s" % (len(regressions), ", ".join(regressions)))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
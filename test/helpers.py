@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+
+from io import BytesIO
+
+
+class FakeResponse(BytesIO):
+    """An HTTP response with the given body and content type (SPARQL JSON results by default)."""
+
+    def __init__(self, content=b"", content_type="application/sparql-results+json", status=None):
+        super(FakeResponse, self).__init__(content)
+        self.content_type = content_type
+        self.status = status
+
+    def read(self, size=-1):
+        # a copy, like the data read from a socket (BytesIO shares its initial buffer)
+        return bytes(bytearray(super(FakeResponse, self).read(size)))
+
+    def info(self):
+        return {"content-type": self.content_type}
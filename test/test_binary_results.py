@@ -0,0 +1,207 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import inspect
+import os
+import struct
+import sys
+import unittest
+from io import BytesIO
+
+# prefer local copy to the one which is installed
+# hack from http://stackoverflow.com/a/6098238/280539
+_top_level_path = os.path.realpath(
+    os.path.abspath(
+        os.path.join(os.path.split(inspect.getfile(inspect.currentframe()))[0], "..")
+    )
+)
+if _top_level_path not in sys.path:
+    sys.path.insert(0, _top_level_path)
+# end of hack
+
+from SPARQLWrapper import BINARY, PROTOBUF, SELECT, THRIFT, QueryResult, SPARQLWrapper
+from SPARQLWrapper.binary_results import (
+    ProtobufResultsReader,
+    RDF4JBinaryResultsReader,
+    ThriftResultsReader,
+)
+from test.helpers import FakeResponse
+
+XSD = "http://www.w3.org/2001/XMLSchema#"
+EX = "http://example.org/"
+
+# the solutions encoded in each format by the tests
+EXPECTED = [
+    {
+        "s": {"type": "uri", "value": EX + "a"},
+        "o": {"type": "literal", "value": "chat", "xml:lang": "fr"},
+    },
+    {
+        "s": {"type": "uri", "value": EX + "b"},
+        "o": {"type": "literal", "value": "42", "datatype": XSD + "integer"},
+    },
+    {"s": {"type": "uri", "value": EX + "b"}, "o": {"type": "bnode", "value": "b0"}},
+    {"o": {"type": "literal", "value": "été"}},
+]
+
+
+def varint(n):
+    data = bytearray()
+    while n > 0x7F:
+        data.append(n & 0x7F | 0x80)
+        n >>= 7
+    data.append(n)
+    return bytes(data)
+
+
+def zigzag(n):
+    return (n << 1) ^ (n >> 63)
+
+
+def brtr():
+    def string(s):
+        data = s.encode("utf-8")
+        return struct.pack(">i", len(data)) + data
+
+    return b"".join(
+        [
+            b"BRTR",
+            struct.pack(">i", 4),
+            struct.pack(">i", 2),
+            string("s"),
+            string("o"),
+            # namespace 0, then ex:a and "chat"@fr
+            b"\x02" + struct.pack(">i", 0) + string(EX),
+            b"\x03" + struct.pack(">i", 0) + string("a"),
+            b"\x07" + string("chat") + string("fr"),
+            # ex:b and 42, with a new namespace for the datatype
+            b"\x03" + struct.pack(">i", 0) + string("b"),
+            b"\x02" + struct.pack(">i", 1) + string(XSD),
+            b"\x08" + string("42") + b"\x03" + struct.pack(">i", 1) + string("integer"),
+            # repeated ex:b and a blank node
+            b"\x01",
+            b"\x05" + string("b0"),
+            # unbound, then a plain literal
+            b"\x00",
+            b"\x06" + string("été"),
+            b"\x7f",
+        ]
+    )
+
+
+def thrift():
+    def struct_(*fields):
+        # fields: (id, type, encoded value), in increasing id order
+        data = bytearray()
+        last = 0
+        for fieldID, fieldType, value in fields:
+            data.append((fieldID - last) << 4 | fieldType)
+            data += value
+            last = fieldID
+        return bytes(data) + b"\x00"
+
+    def string(s):
+        data = s.encode("utf-8")
+        return varint(len(data)) + data
+
+    def list_(elementType, items):
+        return bytes([len(items) << 4 | elementType]) + b"".join(items)
+
+    def term(fieldID, *fields):
+        return struct_((fieldID, 12, struct_(*fields)))
+
+    variables = list_(12, [struct_((1, 8, string("s"))), struct_((1, 8, string("o")))])
+    rows = [
+        [term(1, (1, 8, string(EX + "a"))), term(3, (1, 8, string("chat")), (2, 8, string("fr")))],
+        [term(1, (1, 8, string(EX + "b"))), struct_((10, 6, varint(zigzag(42))))],
+        [term(8), term(2, (1, 8, string("b0")))],
+        [term(7), term(3, (1, 8, string("été")))],
+    ]
+    return struct_((1, 9, variables)) + b"".join(struct_((1, 9, list_(12, row))) for row in rows)
+
+
+def protobuf():
+    def field(fieldID, value):
+        if isinstance(value, int):
+            return varint(fieldID << 3) + varint(value)
+        if isinstance(value, str):
+            value = value.encode("utf-8")
+        return varint(fieldID << 3 | 2) + varint(len(value)) + value
+
+    def delimited(message):
+        return varint(len(message)) + message
+
+    variables = field(1, field(1, "s")) + field(1, field(1, "o"))
+    rows = [
+        [field(1, field(1, EX + "a")), field(3, field(1, "chat") + field(2, "fr"))],
+        [field(1, field(1, EX + "b")), field(20, zigzag(42))],
+        [field(9, b""), field(2, field(1, "b0"))],
+        [field(8, b""), field(3, field(1, "été") + field(9, 1))],
+    ]
+    return delimited(variables) + b"".join(
+        delimited(b"".join(field(1, term) for term in row)) for row in rows
+    )
+
+
+class BinaryResults_Test(unittest.TestCase):
+    def assertReads(self, readerClass, content):
+        for chunkSize in [1, 5, 65536]:
+            reader = readerClass(BytesIO(content), chunkSize).start()
+            self.assertEqual({"vars": ["s", "o"]}, reader.head)
+            self.assertEqual(EXPECTED, list(reader))
+
+    def testRDF4JBinary(self):
+        self.assertReads(RDF4JBinaryResultsReader, brtr())
+        self.assertRaises(ValueError, RDF4JBinaryResultsReader(BytesIO(b"RDF4J")).start)
+        self.assertRaises(ValueError, list, RDF4JBinaryResultsReader(BytesIO(brtr()[:-3])))
+        error = brtr()[:-1] + b"\x7e\x02" + struct.pack(">i", 4) + b"oops"
+        self.assertRaises(ValueError, list, RDF4JBinaryResultsReader(BytesIO(error)))
+
+        # no variables: a namespace record is not a solution
+        ask = b"".join(
+            [
+                b"BRTR",
+                struct.pack(">i", 4),
+                struct.pack(">i", 0),
+                b"\x02" + struct.pack(">i", 0) + struct.pack(">i", len(EX)) + EX.encode("utf-8"),
+                b"\x09",
+                b"\x7f",
+            ]
+        )
+        for chunkSize in [1, 65536]:
+            reader = RDF4JBinaryResultsReader(BytesIO(ask), chunkSize).start()
+            self.assertEqual({"vars": []}, reader.head)
+            self.assertEqual([{}], list(reader))
+
+    def testThrift(self):
+        self.assertReads(ThriftResultsReader, thrift())
+        self.assertRaises(ValueError, list, ThriftResultsReader(BytesIO(thrift()[:-3])))
+
+    def testProtobuf(self):
+        self.assertReads(ProtobufResultsReader, protobuf())
+        self.assertRaises(ValueError, list, ProtobufResultsReader(BytesIO(protobuf()[:-3])))
+
+    def testQueryResult(self):
+        for format, content_type, content in [
+            (BINARY, "application/x-binary-rdf-results-table", brtr()),
+            (THRIFT, "application/sparql-results+thrift", thrift()),
+            (PROTOBUF, "application/sparql-results+protobuf", protobuf()),
+        ]:
+            result = QueryResult((FakeResponse(content, content_type), format))
+            self.assertEqual(format, result._get_responseFormat())
+            self.assertEqual(
+                {"head": {"vars": ["s", "o"]}, "results": {"bindings": EXPECTED}},
+                result.convert(),
+            )
+            result = QueryResult((FakeResponse(content, content_type), format))
+            self.assertEqual(EXPECTED, list(result.stream()))
+
+            sparql = SPARQLWrapper("http://example.org/sparql")
+            sparql.setQuery("SELECT * WHERE { ?s ?p ?o }")
+            sparql.setReturnFormat(format)
+            self.assertEqual(SELECT, sparql.queryType)
+            self.assertEqual(content_type, sparql._getAcceptHeader())
+
+
+if __name__ == "__main__":
+    unittest.main()
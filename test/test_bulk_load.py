@@ -0,0 +1,131 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import inspect
+import os
+import sys
+import threading
+import unittest
+from io import BytesIO, StringIO
+from urllib.error import HTTPError
+
+# prefer local copy to the one which is installed
+# hack from http://stackoverflow.com/a/6098238/280539
+_top_level_path = os.path.realpath(
+    os.path.abspath(
+        os.path.join(os.path.split(inspect.getfile(inspect.currentframe()))[0], "..")
+    )
+)
+if _top_level_path not in sys.path:
+    sys.path.insert(0, _top_level_path)
+# end of hack
+
+from rdflib import Dataset, Graph, Literal, URIRef
+
+import SPARQLWrapper.Wrapper as _victim
+from SPARQLWrapper import SPARQLWrapper
+from SPARQLWrapper.bulk_load import BulkLoadResult, insert_data
+from SPARQLWrapper.SPARQLExceptions import QueryBadFormed
+
+EX = "http://example.org/"
+
+
+class FakeEndpoint(object):
+    """Record the updates received, failing with the given HTTP status codes first."""
+
+    def __init__(self, *codes):
+        self.codes = list(codes)
+        self.updates = []
+        self.lock = threading.Lock()
+
+    def __call__(self, request, timeout=None):
+        with self.lock:
+            if self.codes:
+                raise HTTPError(request.get_full_url(), self.codes.pop(0), "", {}, StringIO(""))
+            self.updates.append((request.get_full_url(), request.get_header("Content-type"), request.data))
+        return BytesIO(b"")
+
+
+def triples(count):
+    return [(URIRef(EX + "s%d" % i), URIRef(EX + "p"), Literal("value\n%d" % i)) for i in range(count)]
+
+
+class BulkLoad_Test(unittest.TestCase):
+    def setUp(self):
+        self.urlopener = _victim.urlopener
+        self.sparql = SPARQLWrapper("http://example.org/sparql", "http://example.org/update")
+
+    def tearDown(self):
+        _victim.urlopener = self.urlopener
+
+    def load(self, endpoint, data, **kwargs):
+        _victim.urlopener = endpoint
+        loaded = Dataset()
+        result = insert_data(self.sparql, data, retry_delay=0, **kwargs)
+        for _, _, body in endpoint.updates:
+            loaded.update(body.decode("utf-8"))
+        return result, loaded
+
+    def testChunks(self):
+        endpoint = FakeEndpoint()
+        progress = []
+        result, loaded = self.load(endpoint, triples(100), chunk_size=1000, progress=progress.append)
+        self.assertGreater(len(endpoint.updates), 5)
+        self.assertEqual(BulkLoadResult(len(endpoint.updates), 100, result.size, 0), result)
+        self.assertEqual(result, progress[-1])
+        self.assertEqual(list(range(1, len(endpoint.updates) + 1)), [p.chunks for p in progress])
+        for url, content_type, body in endpoint.updates:
+            self.assertTrue(url.startswith("http://example.org/update"))
+            self.assertEqual("application/sparql-update", content_type)
+            self.assertLess(len(body), 1000 + 200)
+        self.assertEqual(set(triples(100)), {quad[:3] for quad in loaded.quads()})
+        # the wrapper is not changed
+        self.assertEqual("SELECT", self.sparql.queryType)
+
+    def testGraphs(self):
+        endpoint = FakeEndpoint()
+        dataset = Dataset()
+        dataset.add(triples(1)[0])
+        dataset.graph(URIRef(EX + "g")).add(triples(2)[1])
+        _, loaded = self.load(endpoint, dataset)
+        self.assertEqual(1, len(endpoint.updates))
+        self.assertEqual(set(triples(2)), {quad[:3] for quad in loaded.quads()})
+        self.assertEqual({triples(2)[1]}, set(loaded.graph(URIRef(EX + "g"))))
+
+        endpoint = FakeEndpoint()
+        graph = Graph()
+        for triple in triples(3):
+            graph.add(triple)
+        _, loaded = self.load(endpoint, graph, graph=EX + "h")
+        self.assertEqual(set(triples(3)), set(loaded.graph(URIRef(EX + "h"))))
+
+        # the identifier of a plain graph is not a named graph, even if the graph has quads (as in some versions of
+        # RDFLib)
+        class QuadsGraph(Graph):
+            def quads(self, triple=(None, None, None)):
+                for s, p, o in self.triples(triple):
+                    yield s, p, o, self
+
+        endpoint = FakeEndpoint()
+        graph = QuadsGraph(identifier=URIRef(EX + "i"))
+        for triple in triples(3):
+            graph.add(triple)
+        _, loaded = self.load(endpoint, graph)
+        self.assertNotIn(b"GRAPH", endpoint.updates[0][2])
+        self.assertEqual(set(triples(3)), {quad[:3] for quad in loaded.quads()})
+
+    def testRetries(self):
+        endpoint = FakeEndpoint(503, 500)
+        result, loaded = self.load(endpoint, triples(10), max_workers=1)
+        self.assertEqual(2, result.retries)
+        self.assertEqual(set(triples(10)), {quad[:3] for quad in loaded.quads()})
+
+        endpoint = FakeEndpoint(503, 503)
+        self.assertRaises(HTTPError, self.load, endpoint, triples(10), retries=1)
+
+        endpoint = FakeEndpoint(400)
+        self.assertRaises(QueryBadFormed, self.load, endpoint, triples(10))
+
+
+if __name__ == "__main__":
+    unittest.main()
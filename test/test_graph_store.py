@@ -0,0 +1,155 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import inspect
+import os
+import sys
+import threading
+import unittest
+import urllib.request
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from io import BytesIO
+from urllib.parse import parse_qs, urlparse
+
+# prefer local copy to the one which is installed
+# hack from http://stackoverflow.com/a/6098238/280539
+_top_level_path = os.path.realpath(
+    os.path.abspath(
+        os.path.join(os.path.split(inspect.getfile(inspect.currentframe()))[0], "..")
+    )
+)
+if _top_level_path not in sys.path:
+    sys.path.insert(0, _top_level_path)
+# end of hack
+
+import SPARQLWrapper.Wrapper as _victim
+from SPARQLWrapper import N3, SPARQLWrapper
+from SPARQLWrapper.GraphStore import GraphStore
+from SPARQLWrapper.SPARQLExceptions import EndPointNotFound
+
+TRIPLE = b'<http://example.org/s> <http://example.org/p> "%d" .\n'
+
+
+class GraphStoreHandler(BaseHTTPRequestHandler):
+    """A graph store keeping the N-Triples documents received, by graph."""
+
+    graphs = {}
+    requests = []
+
+    def log_message(self, *args):
+        pass
+
+    def _graph(self):
+        query = parse_qs(urlparse(self.path).query, keep_blank_values=True)
+        return query["graph"][0] if "graph" in query else None
+
+    def _body(self):
+        if self.headers.get("Transfer-Encoding") == "chunked":
+            chunks = []
+            while True:
+                size = int(self.rfile.readline().strip(), 16)
+                chunks.append(self.rfile.read(size))
+                self.rfile.readline()
+                if not size:
+                    return b"".join(chunks)
+        return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+    def _reply(self, code, body=b"", contentType=None):
+        self.send_response(code)
+        if contentType:
+            self.send_header("Content-Type", contentType)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self.requests.append(("GET", self._graph(), dict(self.headers)))
+        if self._graph() not in self.graphs:
+            self._reply(404)
+        else:
+            self._reply(200, self.graphs[self._graph()], "application/n-triples")
+
+    def _store(self, replace):
+        self.requests.append((self.command, self._graph(), dict(self.headers)))
+        body = self._body()
+        created = self._graph() not in self.graphs
+        if replace or created:
+            self.graphs[self._graph()] = body
+        else:
+            self.graphs[self._graph()] += body
+        self._reply(201 if created else 204)
+
+    def do_PUT(self):
+        self._store(True)
+
+    def do_POST(self):
+        self._store(False)
+
+    def do_DELETE(self):
+        self.requests.append(("DELETE", self._graph(), dict(self.headers)))
+        self._reply(204 if self.graphs.pop(self._graph(), None) is not None else 404)
+
+
+class GraphStore_Test(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        urllib.request._opener = None
+        # other tests replace it with fakes
+        cls.urlopener = _victim.urlopener
+        _victim.urlopener = urllib.request.urlopen
+        cls.server = HTTPServer(("127.0.0.1", 0), GraphStoreHandler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        _victim.urlopener = cls.urlopener
+
+    def setUp(self):
+        GraphStoreHandler.graphs.clear()
+        GraphStoreHandler.requests.clear()
+        endpoint = "http://127.0.0.1:%d/store" % self.server.server_port
+        self.sparql = SPARQLWrapper(endpoint)
+        self.sparql.setCredentials("user", "secret")
+        self.sparql.addCustomHttpHeader("X-Test", "yes")
+        self.store = GraphStore(endpoint, self.sparql)
+
+    def testUploadAndDownload(self):
+        graph = "http://example.org/graph"
+        generator = (TRIPLE % i for i in range(1000))
+        self.assertEqual(201, self.store.put(generator, graph))
+        self.assertEqual("chunked", GraphStoreHandler.requests[-1][2]["Transfer-Encoding"])
+        self.assertEqual("yes", GraphStoreHandler.requests[-1][2]["X-Test"])
+        self.assertTrue(GraphStoreHandler.requests[-1][2]["Authorization"].startswith("Basic "))
+
+        self.assertEqual(204, self.store.post(BytesIO(TRIPLE % 1000), graph))
+        self.assertEqual(204, self.store.post((TRIPLE % 1001).decode("ascii"), graph))
+
+        result = self.store.get(graph, N3)
+        self.assertEqual(1002, len(list(result.stream())))
+        self.assertIn("application/n-triples", GraphStoreHandler.requests[-1][2]["Accept"])
+
+        self.assertEqual(201, self.store.put(TRIPLE % 0))
+        self.assertEqual(TRIPLE % 0, GraphStoreHandler.graphs[None])
+        self.assertEqual(TRIPLE % 0, self.store.get().response.read())
+
+        self.assertEqual(204, self.store.delete(graph))
+        self.assertRaises(EndPointNotFound, self.store.get, graph)
+        self.assertRaises(ValueError, self.store.get, graph, "csv")
+
+    def testGraphURL(self):
+        self.assertEqual(self.store.endpoint + "?default", self.store._graphURL(None))
+        self.assertEqual(
+            self.store.endpoint + "?graph=http%3A%2F%2Fexample.org%2Fg%3Fa%3Db",
+            self.store._graphURL("http://example.org/g?a=b"),
+        )
+        self.assertEqual(
+            "http://example.org/store?key=1&default",
+            GraphStore("http://example.org/store?key=1")._graphURL(None),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import inspect
+import os
+import subprocess
+import sys
+import unittest
+
+# prefer local copy to the one which is installed
+# hack from http://stackoverflow.com/a/6098238/280539
+_top_level_path = os.path.realpath(
+    os.path.abspath(
+        os.path.join(os.path.split(inspect.getfile(inspect.currentframe()))[0], "..")
+    )
+)
+if _top_level_path not in sys.path:
+    sys.path.insert(0, _top_level_path)
+# end of hack
+
+# modules that must only be loaded when a feature needing them is used
+HEAVY_MODULES = [
+    "rdflib",
+    "pandas",
+    "lxml",
+    "opentelemetry",
+    "xml.dom.minidom",
+    "SPARQLWrapper.SmartWrapper",
+    "SPARQLWrapper.binary_results",
+    "SPARQLWrapper.GraphStore",
+    "tracemalloc",
+]
+
+
+def importtime(statement):
+    """Run ``statement`` in a fresh interpreter with ``-X importtime``.
+
+    :return: the imported modules, mapped to their cumulative import time in microseconds.
+    """
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=_top_level_path,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    modules = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        if cumulative.strip().isdigit():
+            modules[name.strip()] = int(cumulative)
+    return modules
+
+
+class ImportTime_Test(unittest.TestCase):
+    def assertNotImported(self, statement):
+        modules = importtime(statement)
+        loaded = [m for m in HEAVY_MODULES if m in modules]
+        self.assertEqual(
+            [],
+            loaded,
+            "'%s' took %d us and imported %s"
+            % (statement, max(modules.values()), ", ".join(loaded)),
+        )
+
+    def testImportPackage(self):
+        self.assertNotImported("import SPARQLWrapper")
+
+    def testImportCLI(self):
+        self.assertNotImported("import SPARQLWrapper.main")
+
+    def testLazyAttributes(self):
+        import SPARQLWrapper
+        from SPARQLWrapper.SmartWrapper import SPARQLWrapper2
+        from SPARQLWrapper.sparql_dataframe import get_sparql_dataframe
+
+        self.assertIs(SPARQLWrapper2, SPARQLWrapper.SPARQLWrapper2)
+        self.assertIs(get_sparql_dataframe, SPARQLWrapper.get_sparql_dataframe)
+        self.assertIn("SPARQLWrapper2", dir(SPARQLWrapper))
+        self.assertRaises(AttributeError, getattr, SPARQLWrapper, "nonexistent")
+
+
+if __name__ == "__main__":
+    unittest.main()
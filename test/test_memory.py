@@ -0,0 +1,141 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import inspect
+import json
+import os
+import sys
+import tracemalloc
+import unittest
+
+# prefer local copy to the one which is installed
+# hack from http://stackoverflow.com/a/6098238/280539
+_top_level_path = os.path.realpath(
+    os.path.abspath(
+        os.path.join(os.path.split(inspect.getfile(inspect.currentframe()))[0], "..")
+    )
+)
+if _top_level_path not in sys.path:
+    sys.path.insert(0, _top_level_path)
+# end of hack
+
+import SPARQLWrapper.Wrapper as _victim
+from SPARQLWrapper import JSON, SPARQLWrapper, SPARQLWrapper2
+from SPARQLWrapper.memory import MemoryProfile
+from SPARQLWrapper.Wrapper import QueryResult
+from test.helpers import FakeResponse
+
+RESULTS = json.dumps(
+    {
+        "head": {"vars": ["s", "n"]},
+        "results": {
+            "bindings": [
+                {
+                    "s": {"type": "uri", "value": "http://example.org/%d" % i},
+                    "n": {"type": "literal", "value": str(i)},
+                }
+                for i in range(2000)
+            ]
+        },
+    }
+).encode("utf-8")
+
+
+def urlopener(request, timeout=None):
+    return FakeResponse(RESULTS)
+
+
+class Memory_Test(unittest.TestCase):
+    def setUp(self):
+        self.urlopener = _victim.urlopener
+        _victim.urlopener = urlopener
+        self.sparql = SPARQLWrapper("http://example.org/sparql", returnFormat=JSON)
+        self.sparql.setQuery("SELECT * WHERE { ?s ?p ?n }")
+
+    def tearDown(self):
+        _victim.urlopener = self.urlopener
+
+    def testDisabled(self):
+        result = self.sparql.query()
+        self.assertIsNone(result.memory)
+        self.assertEqual(2000, len(result.convert()["results"]["bindings"]))
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def testConvert(self):
+        self.sparql.setMemoryProfiling()
+        result = self.sparql.query()
+        converted = result.convert()
+        self.assertFalse(tracemalloc.is_tracing())
+
+        memory = result.memory
+        self.assertEqual(["convert", "read"], list(memory.steps))
+        read, convert = memory.steps["read"], memory.steps["convert"]
+        self.assertEqual(1, convert.calls)
+        self.assertGreaterEqual(read.calls, 1)
+        # the body is read at once, and freed once parsed
+        self.assertGreaterEqual(read.retained, len(RESULTS))
+        self.assertEqual(memory.retained, read.retained + convert.retained)
+        self.assertGreater(convert.blocks, 2000)
+        self.assertGreater(memory.retained, 0)
+        self.assertGreaterEqual(memory.peak, max(memory.retained, read.peak))
+        self.assertEqual(memory.peak, memory.toDict()["peak"])
+        self.assertEqual(4, len(memory.toDict()["steps"]["read"]))
+        del converted
+
+    def testAlreadyTracing(self):
+        tracemalloc.start()
+        try:
+            result = QueryResult((FakeResponse(RESULTS), JSON))
+            result.memory = MemoryProfile()
+            result.convert()
+            self.assertTrue(tracemalloc.is_tracing())
+            self.assertGreater(result.memory.peak, 0)
+        finally:
+            tracemalloc.stop()
+
+    def testConcurrentProfiles(self):
+        # like conversions profiled by two threads, the first one still converting when the second one ends
+        first, second = MemoryProfile(), MemoryProfile()
+        with first._profile():
+            with self.assertWarns(RuntimeWarning):
+                with second._profile(), second._step("convert"):
+                    data = [bytes(bytearray(1000)) for _ in range(100)]
+            del data
+            self.assertTrue(tracemalloc.is_tracing())
+            with first._step("convert"):
+                data = [bytes(bytearray(1000)) for _ in range(100)]
+        self.assertFalse(tracemalloc.is_tracing())
+        self.assertGreater(second.steps["convert"].retained, 100 * 1000)
+        self.assertGreater(first.steps["convert"].retained, 100 * 1000)
+        self.assertGreaterEqual(first.steps["convert"].peak, first.steps["convert"].retained)
+        self.assertGreater(first.steps["convert"].blocks, 0)
+
+    def testSpool(self):
+        self.sparql.setMemoryProfiling()
+        self.sparql.setSpoolThreshold(len(RESULTS))
+        result = self.sparql.query()
+        self.assertEqual(["read"], list(result.memory.steps))
+        self.assertGreaterEqual(result.memory.steps["read"].retained, len(RESULTS))
+        result.convert()
+        result.convert()
+        self.assertEqual(2, result.memory.steps["convert"].calls)
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def testBindings(self):
+        sparql = SPARQLWrapper2("http://example.org/sparql")
+        sparql.setQuery("SELECT * WHERE { ?s ?p ?n }")
+        sparql.setMemoryProfiling()
+        bindings = sparql.query()
+        self.assertEqual(2000, len(bindings.bindings))
+        self.assertEqual(["convert", "read", "bindings"], list(bindings.memory.steps))
+        # the Value instances, and their dictionaries
+        self.assertGreater(bindings.memory.steps["bindings"].blocks, 2 * 2000)
+        self.assertGreaterEqual(bindings.memory.steps["bindings"].peak, bindings.memory.steps["convert"].peak)
+        self.assertFalse(tracemalloc.is_tracing())
+
+        sparql.setMemoryProfiling(False)
+        self.assertIsNone(sparql.query().memory)
+
+
+if __name__ == "__main__":
+    unittest.main()
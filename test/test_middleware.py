@@ -0,0 +1,164 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import copy
+import inspect
+import os
+import sys
+import unittest
+from io import StringIO
+from urllib.error import HTTPError
+
+# prefer local copy to the one which is installed
+# hack from http://stackoverflow.com/a/6098238/280539
+_top_level_path = os.path.realpath(
+    os.path.abspath(
+        os.path.join(os.path.split(inspect.getfile(inspect.currentframe()))[0], "..")
+    )
+)
+if _top_level_path not in sys.path:
+    sys.path.insert(0, _top_level_path)
+# end of hack
+
+import SPARQLWrapper.Wrapper as _victim
+from SPARQLWrapper import JSON, SPARQLWrapper
+from SPARQLWrapper.middleware import Middleware
+from SPARQLWrapper.SPARQLExceptions import EndPointInternalError
+from test.helpers import FakeResponse
+
+RESULTS = b'{"head": {"vars": []}, "boolean": true}'
+
+
+class FakeEndpoint(object):
+    """Record the requests received, failing with the given HTTP status codes first."""
+
+    def __init__(self, *codes):
+        self.codes = list(codes)
+        self.requests = []
+
+    def __call__(self, request, timeout=None):
+        self.requests.append(request)
+        if self.codes:
+            raise HTTPError(request.get_full_url(), self.codes.pop(0), "", {}, StringIO(""))
+        return FakeResponse(RESULTS)
+
+
+class Recorder(Middleware):
+    def __init__(self, name, calls):
+        self.name = name
+        self.calls = calls
+
+    def before_request(self, sparql, request):
+        request.add_header("X-" + self.name, "1")
+        self.calls.append((self.name, "before_request"))
+        return None
+
+    def after_response(self, sparql, request, response):
+        self.calls.append((self.name, "after_response"))
+        return response
+
+    def on_error(self, sparql, request, error):
+        self.calls.append((self.name, "on_error", type(error)))
+        return None
+
+    def on_convert(self, result, converted):
+        self.calls.append((self.name, "on_convert"))
+        return dict(converted, **{self.name: result.request.get_header("X-" + self.name.lower())})
+
+
+class Cache(Middleware):
+    def before_request(self, sparql, request):
+        return FakeResponse(b'{"head": {"vars": []}, "boolean": false}')
+
+
+class Retry(Middleware):
+    def on_error(self, sparql, request, error):
+        if isinstance(error, EndPointInternalError):
+            return _victim.urlopener(request)
+        return None
+
+
+class Middleware_Test(unittest.TestCase):
+    def setUp(self):
+        self.urlopener = _victim.urlopener
+        self.endpoint = _victim.urlopener = FakeEndpoint()
+        self.sparql = SPARQLWrapper("http://example.org/sparql", returnFormat=JSON)
+        self.sparql.setQuery("ASK { ?s ?p ?o }")
+        self.calls = []
+
+    def tearDown(self):
+        _victim.urlopener = self.urlopener
+        SPARQLWrapper._middlewares = ()
+
+    def testOrder(self):
+        SPARQLWrapper.registerMiddleware(Recorder("Global", self.calls))
+        self.sparql.addMiddleware(Recorder("Local", self.calls))
+        converted = self.sparql.queryAndConvert()
+        self.assertEqual({"head": {"vars": []}, "boolean": True, "Global": "1", "Local": "1"}, converted)
+        self.assertEqual(
+            [
+                ("Global", "before_request"),
+                ("Local", "before_request"),
+                ("Local", "after_response"),
+                ("Global", "after_response"),
+                ("Local", "on_convert"),
+                ("Global", "on_convert"),
+            ],
+            self.calls,
+        )
+        self.assertEqual("1", self.endpoint.requests[0].get_header("X-global"))
+
+    def testRegistration(self):
+        global_ = Recorder("Global", self.calls)
+        local = Recorder("Local", self.calls)
+
+        class Subclass(SPARQLWrapper):
+            pass
+
+        Subclass.registerMiddleware(global_)
+        self.assertEqual((), SPARQLWrapper._middlewares)
+        self.assertTrue(Subclass.unregisterMiddleware(global_))
+        self.assertFalse(Subclass.unregisterMiddleware(global_))
+
+        self.sparql.addMiddleware(local)
+        clone = copy.copy(self.sparql)
+        self.assertTrue(clone.removeMiddleware(local))
+        self.assertFalse(clone.removeMiddleware(local))
+        self.assertEqual([local], self.sparql.middlewares)
+
+        # no middleware: the results are left as they are
+        self.sparql.removeMiddleware(local)
+        self.assertEqual((), self.sparql.query()._middlewares)
+        self.assertEqual([], self.calls)
+
+    def testShortCircuit(self):
+        self.sparql.addMiddleware(Recorder("First", self.calls))
+        self.sparql.addMiddleware(Cache())
+        self.sparql.addMiddleware(Recorder("Skipped", self.calls))
+        self.assertEqual(False, self.sparql.queryAndConvert()["boolean"])
+        self.assertEqual([], self.endpoint.requests)
+        self.assertEqual(
+            [
+                ("First", "before_request"),
+                ("First", "after_response"),
+                ("Skipped", "on_convert"),
+                ("First", "on_convert"),
+            ],
+            self.calls,
+        )
+
+    def testErrors(self):
+        self.endpoint.codes = [500]
+        self.sparql.addMiddleware(Recorder("Outer", self.calls))
+        self.sparql.addMiddleware(Retry())
+        self.assertEqual(True, self.sparql.queryAndConvert()["boolean"])
+        self.assertEqual(2, len(self.endpoint.requests))
+        self.assertNotIn(("Outer", "on_error", EndPointInternalError), self.calls)
+
+        self.endpoint.codes = [503]
+        self.assertRaises(HTTPError, self.sparql.query)
+        self.assertIn(("Outer", "on_error", HTTPError), self.calls)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import inspect
+import os
+import sys
+import unittest
+from io import StringIO
+from urllib.error import HTTPError
+
+# prefer local copy to the one which is installed
+# hack from http://stackoverflow.com/a/6098238/280539
+_top_level_path = os.path.realpath(
+    os.path.abspath(
+        os.path.join(os.path.split(inspect.getfile(inspect.currentframe()))[0], "..")
+    )
+)
+if _top_level_path not in sys.path:
+    sys.path.insert(0, _top_level_path)
+# end of hack
+
+import SPARQLWrapper.Wrapper as _victim
+from SPARQLWrapper import JSON, SPARQLWrapper, slow_queries
+from SPARQLWrapper.slow_queries import SlowQueryLog, _percentile, fingerprint, normalize
+from SPARQLWrapper.SPARQLExceptions import EndPointNotFound
+from SPARQLWrapper.timing import QueryTiming
+from test.helpers import FakeResponse
+
+RESULTS = b'{"head": {"vars": ["s"]}, "results": {"bindings": []}}'
+
+
+def urlopener(request, timeout=None):
+    if "missing" in request.get_full_url():
+        raise HTTPError(request.get_full_url(), 404, "", {}, StringIO(""))
+    return FakeResponse(RESULTS)
+
+
+class SlowQueries_Test(unittest.TestCase):
+    def setUp(self):
+        self.urlopener = _victim.urlopener
+        _victim.urlopener = urlopener
+
+    def tearDown(self):
+        _victim.urlopener = self.urlopener
+        slow_queries.disable()
+
+    def testNormalize(self):
+        query = """
+            PREFIX ex: <http://example.org/>  # people
+            SELECT ?name WHERE {
+                ?s a ex:Person ; ex:name ?name ; ex:age 42 ; ex:nick "bob"@en, 'b'^^xsd:string .
+                FILTER (?name != "Alice" && ?age > 3.5e1)
+                VALUES (?s ?t) { (<http://example.org/a> 1) (UNDEF "x") }
+            } LIMIT 10
+        """
+        self.assertEqual(
+            "PREFIX ex: <?> SELECT ?name WHERE { ?s a ex:Person ; ex:name ?name ; ex:age ? ; ex:nick ? , ? . "
+            "FILTER ( ?name ! = ? & & ?age > ? ) VALUES ( ?s ?t ) { ... } } LIMIT ?",
+            normalize(query),
+        )
+        other = query.replace("42", "7").replace("Alice", "Bob").replace("(UNDEF \"x\")", "").replace("example.org/a", "example.org/b")
+        self.assertEqual(fingerprint(query), fingerprint(other))
+        self.assertNotEqual(fingerprint(query), fingerprint(query.replace("?age > ", "?age < ")))
+        self.assertEqual(16, len(fingerprint(query)))
+
+    def testPercentile(self):
+        samples = [float(i) for i in range(1, 101)]
+        self.assertEqual(50.0, _percentile(samples, 50))
+        self.assertEqual(95.0, _percentile(samples, 95))
+        self.assertEqual(99.0, _percentile(samples, 99))
+        self.assertEqual(1.0, _percentile([1.0], 99))
+        self.assertEqual(0.0, _percentile([], 50))
+
+    def testAggregates(self):
+        log = SlowQueryLog(latency=None, size=len(RESULTS) - 1)
+        for i in range(3):
+            timing = QueryTiming("http://example.org/sparql", query="SELECT * { ?s ?p %d }" % i)
+            timing.ttfb = 0.25 * (i + 1)
+            timing.responseBytes = len(RESULTS) + i - 1
+            log.on_complete(timing)
+        (stats,) = log.stats()
+        self.assertEqual((3, 2, 0), (stats.calls, stats.slow, stats.errors))
+        self.assertEqual("SELECT * { ?s ?p ? }", stats.query)
+        self.assertEqual(1.5, stats.total)
+        self.assertEqual((0.5, 0.75, 0.75), (stats.p50, stats.p95, stats.p99))
+        self.assertEqual(3 * len(RESULTS), stats.bytes)
+        log.reset()
+        self.assertEqual([], log.stats())
+
+    def testEnable(self):
+        log = slow_queries.enable(latency=0)
+        self.assertIs(log, slow_queries.enable(latency=0))
+        self.assertIs(log, slow_queries.get_log())
+
+        sparql = SPARQLWrapper("http://example.org/sparql", returnFormat=JSON)
+        with self.assertLogs("SPARQLWrapper.slow_queries", "WARNING") as logs:
+            for i in range(2):
+                sparql.setQuery("SELECT * WHERE { ?s ?p %d }" % i)
+                sparql.queryAndConvert()
+            sparql.setQuery("ASK { ?s ?p ?o }")
+            sparql.query().response.read()
+            sparql.endpoint += "/missing"
+            self.assertRaises(EndPointNotFound, sparql.query)
+        self.assertEqual(4, len(logs.records))
+        self.assertEqual(fingerprint("SELECT * WHERE { ?s ?p 0 }"), logs.records[0].fingerprint)
+
+        stats = {s.query: s for s in log.stats()}
+        self.assertEqual(2, stats["SELECT * WHERE { ?s ?p ? }"].calls)
+        self.assertEqual(2 * len(RESULTS), stats["SELECT * WHERE { ?s ?p ? }"].bytes)
+        self.assertEqual((2, 1), (stats["ASK { ?s ?p ?o }"].calls, stats["ASK { ?s ?p ?o }"].errors))
+
+        slow_queries.disable()
+        self.assertIsNone(slow_queries.get_log())
+        self.assertEqual((), SPARQLWrapper._middlewares)
+
+
+if __name__ == "__main__":
+    unittest.main()
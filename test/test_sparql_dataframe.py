@@ -0,0 +1,401 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import datetime
+import inspect
+import json
+import os
+import re
+import sys
+import unittest
+from urllib.parse import parse_qs, urlparse
+
+# prefer local copy to the one which is installed
+# hack from http://stackoverflow.com/a/6098238/280539
+_top_level_path = os.path.realpath(
+    os.path.abspath(
+        os.path.join(os.path.split(inspect.getfile(inspect.currentframe()))[0], "..")
+    )
+)
+if _top_level_path not in sys.path:
+    sys.path.insert(0, _top_level_path)
+# end of hack
+
+import pandas as pd
+import rdflib.term
+
+import SPARQLWrapper.Wrapper as _victim
+from SPARQLWrapper.sparql_dataframe import (
+    QueryException,
+    _convert_column,
+    get_sparql_dataframe,
+    get_sparql_dataframe_orig,
+    get_sparql_polars,
+    get_sparql_typed_dict,
+    iter_sparql_dataframes,
+    register_sparql_duckdb,
+)
+from test.helpers import FakeResponse
+
+try:
+    import polars
+except ImportError:
+    polars = None
+
+try:
+    import duckdb
+    import pyarrow
+except ImportError:
+    duckdb = None
+
+XSD = "http://www.w3.org/2001/XMLSchema#"
+
+RESULTS = {
+    "head": {"vars": ["s", "n", "d"]},
+    "results": {
+        "bindings": [
+            {
+                "s": {"type": "uri", "value": "http://example.org/a"},
+                "n": {"type": "literal", "datatype": XSD + "integer", "value": "1"},
+                "d": {"type": "literal", "datatype": XSD + "date", "value": "2020-01-02"},
+            },
+            {
+                "s": {"type": "bnode", "value": "b0"},
+                "n": {"type": "literal", "datatype": XSD + "integer", "value": "2"},
+            },
+        ]
+    },
+}
+
+
+def urlopener(request):
+    return FakeResponse(
+        json.dumps(RESULTS).encode("utf-8"), "application/sparql-results+json"
+    )
+
+
+CSV_RESULTS = b"""s,n,d
+http://example.org/a,1,2020-01-02
+b0,2,
+"""
+
+
+def csv_urlopener(request):
+    if "text/csv" in request.get_header("Accept"):
+        return FakeResponse(CSV_RESULTS, "text/csv; charset=utf-8")
+    return urlopener(request)
+
+
+def _paging_urlopener(total):
+    """Serve ``total`` solutions, honouring the LIMIT/OFFSET appended to the query."""
+    requests = []
+
+    def _urlopener(request):
+        query = parse_qs(urlparse(request.get_full_url()).query)["query"][0]
+        requests.append(query)
+        limit = int(re.search(r"LIMIT (\d+)", query).group(1))
+        offset = int(re.search(r"OFFSET (\d+)", query).group(1))
+        bindings = [
+            {"n": {"type": "literal", "datatype": XSD + "integer", "value": str(i)}}
+            for i in range(offset, min(offset + limit, total))
+        ]
+        results = {"head": {"vars": ["n"]}, "results": {"bindings": bindings}}
+        return FakeResponse(
+            json.dumps(results).encode("utf-8"), "application/sparql-results+json"
+        )
+
+    return _urlopener, requests
+
+
+class ConvertColumn_Test(unittest.TestCase):
+    def _literals(self, datatype, lexicals):
+        return [{"type": "literal", "datatype": datatype, "value": v} for v in lexicals]
+
+    def assertSameAsRdflib(self, datatype, lexicals):
+        expected = [
+            rdflib.term.Literal(v, datatype=datatype).toPython() for v in lexicals
+        ]
+        converted = _convert_column(self._literals(datatype, lexicals))
+        self.assertEqual(expected, converted)
+        self.assertEqual([type(v) for v in expected], [type(v) for v in converted])
+
+    def testFastPaths(self):
+        self.assertSameAsRdflib(XSD + "integer", ["1", "-2", "+3"])
+        self.assertSameAsRdflib(XSD + "int", ["1", "2"])
+        self.assertSameAsRdflib(XSD + "decimal", ["1.5", "-0.25"])
+        self.assertSameAsRdflib(XSD + "double", ["1e3", "INF", "0.5"])
+        self.assertSameAsRdflib(XSD + "boolean", ["true", "false", "1", "0"])
+        self.assertSameAsRdflib(XSD + "date", ["2020-01-01"])
+        self.assertSameAsRdflib(
+            XSD + "dateTime",
+            ["2020-01-01T00:00:00", "2020-01-01T10:00:00Z", "2020-01-01T10:00:00+02:00"],
+        )
+
+    def testFallback(self):
+        self.assertSameAsRdflib(XSD + "gYear", ["2020"])
+        self.assertSameAsRdflib(XSD + "date", ["2020-01-01", "2020-01-01Z"])
+        converted = _convert_column(self._literals(XSD + "integer", ["1", "one"]))
+        self.assertEqual(1, converted[0])
+        self.assertIsInstance(converted[1], rdflib.term.Literal)
+
+    def testMixedColumn(self):
+        cells = [
+            {"type": "uri", "value": "http://example.org/a"},
+            None,
+            {"type": "literal", "datatype": XSD + "integer", "value": "7"},
+            {"type": "literal", "xml:lang": "en", "value": "seven"},
+            {"type": "bnode", "value": "b0"},
+        ]
+        self.assertEqual(
+            ["http://example.org/a", None, 7, "seven", "b0"], _convert_column(cells)
+        )
+
+
+class SPARQLDataframe_Test(unittest.TestCase):
+    def setUp(self):
+        self._urlopener = _victim.urlopener
+        _victim.urlopener = urlopener
+
+    def tearDown(self):
+        _victim.urlopener = self._urlopener
+
+    def testTypedDict(self):
+        d = get_sparql_typed_dict("http://example.org/sparql", "SELECT * WHERE {}")
+        self.assertEqual(
+            [
+                {"s": "http://example.org/a", "n": 1, "d": datetime.date(2020, 1, 2)},
+                {"s": "b0", "n": 2},
+            ],
+            d,
+        )
+
+    def testDataframe(self):
+        df = get_sparql_dataframe("http://example.org/sparql", "SELECT * WHERE {}")
+        self.assertEqual(["s", "n", "d"], list(df.columns))
+        self.assertEqual([1, 2], list(df["n"]))
+        self.assertTrue(df["d"].isna()[1])
+
+    def testDataframeOrig(self):
+        _victim.urlopener = csv_urlopener
+        df = get_sparql_dataframe_orig(
+            "http://example.org/sparql", "SELECT * WHERE {}", dtype={"n": "float64"}
+        )
+        self.assertEqual(["s", "n", "d"], list(df.columns))
+        self.assertEqual("float64", str(df["n"].dtype))
+        self.assertEqual("2020-01-02", df["d"][0])
+
+        df = get_sparql_dataframe_orig(
+            "http://example.org/sparql", "SELECT * WHERE {}", probe_types=True
+        )
+        self.assertEqual("Int64", str(df["n"].dtype))
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(df["d"]))
+        self.assertTrue(df["d"].isna()[1])
+
+    def testIterDataframes(self):
+        dfs = list(
+            iter_sparql_dataframes(
+                "http://example.org/sparql", "SELECT * WHERE {}", chunk_rows=1
+            )
+        )
+        self.assertEqual(2, len(dfs))
+        for df in dfs:
+            self.assertEqual(["s", "n", "d"], list(df.columns))
+            self.assertEqual("Int64", str(df["n"].dtype))
+        # "d" is only bound in the first chunk
+        self.assertEqual(dfs[0]["d"].dtype, dfs[1]["d"].dtype)
+        self.assertTrue(dfs[1]["d"].isna().all())
+
+    def testIterDataframesPaging(self):
+        _victim.urlopener, requests = _paging_urlopener(25)
+        dfs = list(
+            iter_sparql_dataframes(
+                "http://example.org/sparql",
+                "SELECT ?n WHERE { ?s ?p ?n } ORDER BY ?n",
+                chunk_rows=7,
+                page_size=10,
+            )
+        )
+        self.assertEqual(3, len(requests))
+        self.assertEqual([7, 7, 7, 4], [len(df) for df in dfs])
+        self.assertEqual(list(range(25)), [n for df in dfs for n in df["n"]])
+
+        self.assertRaises(
+            QueryException,
+            list,
+            iter_sparql_dataframes(
+                "http://example.org/sparql",
+                "SELECT ?n WHERE { ?s ?p ?n } LIMIT 5",
+                page_size=10,
+            ),
+        )
+
+    def testIterDataframesEmpty(self):
+        _victim.urlopener, requests = _paging_urlopener(0)
+        dfs = list(
+            iter_sparql_dataframes(
+                "http://example.org/sparql",
+                "SELECT ?n WHERE { ?s ?p ?n }",
+                page_size=10,
+                dtypes={"n": "Int64"},
+            )
+        )
+        self.assertEqual(1, len(dfs))
+        self.assertEqual(["n"], list(dfs[0].columns))
+        self.assertEqual("Int64", str(dfs[0]["n"].dtype))
+        self.assertEqual(0, len(pd.concat(dfs)))
+
+    def testPagedQueryWords(self):
+        _victim.urlopener, requests = _paging_urlopener(3)
+        dfs = list(
+            iter_sparql_dataframes(
+                "http://example.org/sparql",
+                'SELECT ?limit WHERE { ?s <http://ex.org/offset> ?limit ; ex:limit "LIMIT" } # OFFSET',
+                page_size=10,
+            )
+        )
+        self.assertEqual(1, len(requests))
+        self.assertEqual([0, 1, 2], list(dfs[0]["n"]))
+
+        # the solution modifiers go before a trailing VALUES clause
+        _victim.urlopener, requests = _paging_urlopener(3)
+        list(
+            iter_sparql_dataframes(
+                "http://example.org/sparql",
+                "SELECT ?n WHERE { VALUES ?p { ex:p } ?s ?p ?n } VALUES ?s { ex:s }",
+                page_size=10,
+            )
+        )
+        self.assertRegex(requests[0], r"\} \nLIMIT 10\nOFFSET 0\nVALUES \?s \{ ex:s \}$")
+
+    def testIterDataframesSchema(self):
+        global RESULTS
+        results = RESULTS
+        RESULTS = {
+            "head": {"vars": ["n", "big"]},
+            "results": {
+                "bindings": [
+                    {"n": {"type": "literal", "datatype": XSD + "integer", "value": "1"}},
+                    {
+                        "n": {"type": "literal", "datatype": XSD + "integer", "value": "2"},
+                        "big": {"type": "literal", "datatype": XSD + "integer", "value": str(2**64)},
+                    },
+                ]
+            },
+        }
+        try:
+            with self.assertWarns(RuntimeWarning):
+                dfs = list(
+                    iter_sparql_dataframes(
+                        "http://example.org/sparql", "SELECT * WHERE {}", chunk_rows=1
+                    )
+                )
+            # "big" is not bound in the first chunk
+            self.assertEqual([object, object], [df["big"].dtype for df in dfs])
+            self.assertEqual(2**64, dfs[1]["big"][0])
+
+            for dtypes in (None, {"big": "Int64"}):
+                dfs = list(
+                    iter_sparql_dataframes(
+                        "http://example.org/sparql", "SELECT * WHERE {}", dtypes=dtypes
+                    )
+                )
+                self.assertEqual(object, dfs[0]["big"].dtype)
+                self.assertEqual(2**64, dfs[0]["big"][1])
+        finally:
+            RESULTS = results
+
+    @unittest.skipUnless(polars, "polars is not installed")
+    def testPolars(self):
+        df = get_sparql_polars(
+            "http://example.org/sparql", "SELECT * WHERE {}", chunk_rows=1
+        )
+        self.assertEqual(["s", "n", "d"], df.columns)
+        self.assertEqual(polars.Int64, df["n"].dtype)
+        self.assertEqual([datetime.date(2020, 1, 2), None], df["d"].to_list())
+
+    @unittest.skipUnless(duckdb, "duckdb/pyarrow are not installed")
+    def testDuckDB(self):
+        connection = duckdb.connect()
+        relation = register_sparql_duckdb(
+            connection,
+            "results",
+            "http://example.org/sparql",
+            "SELECT * WHERE {}",
+            chunk_rows=1,
+        )
+        self.assertEqual(["s", "n", "d"], relation.columns)
+        self.assertEqual(
+            [(3, 1)], connection.sql("SELECT sum(n), count(d) FROM results").fetchall()
+        )
+
+    @unittest.skipUnless(polars, "polars is not installed")
+    def testPolarsMixedChunks(self):
+        global RESULTS
+        results = RESULTS
+        RESULTS = {
+            "head": {"vars": ["x", "n"]},
+            "results": {
+                "bindings": [
+                    {
+                        "x": {"type": "literal", "datatype": XSD + "integer", "value": "1"},
+                        "n": {"type": "literal", "datatype": XSD + "integer", "value": "1"},
+                    },
+                    {
+                        "x": {"type": "literal", "datatype": XSD + "date", "value": "2020-01-01"},
+                        "n": {"type": "literal", "datatype": XSD + "double", "value": "1.5"},
+                    },
+                ]
+            },
+        }
+        try:
+            df = get_sparql_polars(
+                "http://example.org/sparql", "SELECT * WHERE {}", chunk_rows=1
+            )
+            self.assertEqual(["1", "2020-01-01"], df["x"].to_list())
+            self.assertEqual([1.0, 1.5], df["n"].to_list())
+        finally:
+            RESULTS = results
+
+    @unittest.skipUnless(duckdb, "duckdb/pyarrow are not installed")
+    def testDuckDBMixedChunks(self):
+        global RESULTS
+        results = RESULTS
+        RESULTS = {
+            "head": {"vars": ["x", "big"]},
+            "results": {
+                "bindings": [
+                    {"x": {"type": "literal", "datatype": XSD + "integer", "value": "1"}},
+                    {
+                        "x": {"type": "uri", "value": "http://example.org/a"},
+                        "big": {"type": "literal", "datatype": XSD + "integer", "value": str(2**64)},
+                    },
+                ]
+            },
+        }
+        try:
+            connection = duckdb.connect()
+            register_sparql_duckdb(
+                connection,
+                "results",
+                "http://example.org/sparql",
+                "SELECT * WHERE {}",
+                chunk_rows=1,
+            )
+            self.assertEqual(
+                [("1", None), ("http://example.org/a", str(2**64))],
+                connection.sql("SELECT x, big FROM results").fetchall(),
+            )
+        finally:
+            RESULTS = results
+
+    def testOnlySelect(self):
+        self.assertRaises(
+            QueryException,
+            get_sparql_typed_dict,
+            "http://example.org/sparql",
+            "ASK {}",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,151 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import inspect
+import os
+import sys
+import unittest
+import warnings
+from io import StringIO
+from urllib.error import HTTPError
+
+# prefer local copy to the one which is installed
+# hack from http://stackoverflow.com/a/6098238/280539
+_top_level_path = os.path.realpath(
+    os.path.abspath(
+        os.path.join(os.path.split(inspect.getfile(inspect.currentframe()))[0], "..")
+    )
+)
+if _top_level_path not in sys.path:
+    sys.path.insert(0, _top_level_path)
+# end of hack
+
+import SPARQLWrapper.Wrapper as _victim
+from SPARQLWrapper import JSON, SPARQLWrapper
+from SPARQLWrapper.SPARQLExceptions import QueryBadFormed
+from SPARQLWrapper.telemetry import _row_count, instrument, uninstrument
+from test.helpers import FakeResponse
+
+try:
+    from opentelemetry.sdk.metrics import MeterProvider
+    from opentelemetry.sdk.metrics.export import InMemoryMetricReader
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.sampling import ALWAYS_OFF
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+except ImportError:
+    TracerProvider = None
+
+RESULTS = b'{"head": {"vars": ["s"]}, "results": {"bindings": [{}, {}, {}]}}'
+
+
+class FakeEndpoint(object):
+    def __init__(self):
+        self.requests = []
+
+    def __call__(self, request, timeout=None):
+        self.requests.append(request)
+        if "bad" in request.get_full_url():
+            raise HTTPError(request.get_full_url(), 400, "", {}, StringIO(""))
+        return FakeResponse(RESULTS, status=200)
+
+
+class Telemetry_Test(unittest.TestCase):
+    def setUp(self):
+        self.urlopener = _victim.urlopener
+        self.endpoint = _victim.urlopener = FakeEndpoint()
+        self.sparql = SPARQLWrapper("http://example.org/sparql", returnFormat=JSON)
+
+    def tearDown(self):
+        _victim.urlopener = self.urlopener
+        uninstrument()
+
+    def testRowCount(self):
+        self.assertEqual(2, _row_count({"head": {}, "results": {"bindings": [{}, {}]}}))
+        self.assertEqual(1, _row_count({"head": {}, "boolean": True}))
+        self.assertEqual(None, _row_count(b"s,p,o"))
+
+    @unittest.skipIf(TracerProvider is not None, "OpenTelemetry is installed")
+    def testNotInstalled(self):
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter("always")
+            self.assertIsNone(instrument())
+        self.assertEqual(1, len(w))
+        self.assertEqual((), SPARQLWrapper._middlewares)
+        self.assertEqual(3, len(self.sparql.queryAndConvert()["results"]["bindings"]))
+
+    @unittest.skipUnless(TracerProvider, "OpenTelemetry is not installed")
+    def testSpansAndMetrics(self):
+        exporter = InMemorySpanExporter()
+        tracer_provider = TracerProvider()
+        tracer_provider.add_span_processor(SimpleSpanProcessor(exporter))
+        reader = InMemoryMetricReader()
+        middleware = instrument(tracer_provider, MeterProvider(metric_readers=[reader]))
+        self.assertIs(middleware, instrument())
+
+        self.sparql.queryAndConvert()
+        self.assertIn("Traceparent", self.endpoint.requests[0].headers)
+        request_span, convert_span = exporter.get_finished_spans()
+        self.assertEqual("SPARQL SELECT", request_span.name)
+        self.assertEqual("SELECT", request_span.attributes["db.operation.name"])
+        self.assertEqual("http://example.org/sparql", request_span.attributes["url.full"])
+        self.assertEqual(JSON, request_span.attributes["sparql.return_format"])
+        self.assertEqual(200, request_span.attributes["http.response.status_code"])
+        self.assertEqual("SPARQL convert", convert_span.name)
+        self.assertEqual(request_span.context.span_id, convert_span.parent.span_id)
+        self.assertEqual(3, convert_span.attributes["sparql.result.rows"])
+        self.assertEqual(len(RESULTS), convert_span.attributes["http.response.body.size"])
+
+        self.sparql.endpoint += "/bad"
+        self.assertRaises(QueryBadFormed, self.sparql.query)
+        self.assertEqual("QueryBadFormed", exporter.get_finished_spans()[-1].attributes["error.type"])
+
+        metrics = reader.get_metrics_data().resource_metrics[0].scope_metrics[0].metrics
+        self.assertEqual(
+            {"sparql.client.duration", "sparql.client.request.size", "sparql.client.response.size"},
+            {metric.name for metric in metrics},
+        )
+
+    @unittest.skipUnless(TracerProvider, "OpenTelemetry is not installed")
+    def testResponseSizeOncePerRequest(self):
+        reader = InMemoryMetricReader()
+        instrument(TracerProvider(), MeterProvider(metric_readers=[reader]))
+
+        result = self.sparql.query()
+        result.spool()
+        for _ in range(3):
+            result.convert()
+        self.sparql.query().response.read()
+
+        metrics = reader.get_metrics_data().resource_metrics[0].scope_metrics[0].metrics
+        size = [metric for metric in metrics if metric.name == "sparql.client.response.size"][0]
+        (point,) = size.data.data_points
+        self.assertEqual(2, point.count)
+        self.assertEqual(2 * len(RESULTS), point.sum)
+
+    @unittest.skipUnless(TracerProvider, "OpenTelemetry is not installed")
+    def testMetricsWithoutSampling(self):
+        exporter = InMemorySpanExporter()
+        tracer_provider = TracerProvider(sampler=ALWAYS_OFF)
+        tracer_provider.add_span_processor(SimpleSpanProcessor(exporter))
+        reader = InMemoryMetricReader()
+        instrument(tracer_provider, MeterProvider(metric_readers=[reader]))
+
+        self.sparql.queryAndConvert()
+        self.sparql.endpoint += "/bad"
+        self.assertRaises(QueryBadFormed, self.sparql.query)
+        self.assertEqual((), exporter.get_finished_spans())
+
+        metrics = reader.get_metrics_data().resource_metrics[0].scope_metrics[0].metrics
+        duration = [metric for metric in metrics if metric.name == "sparql.client.duration"][0]
+        self.assertEqual(
+            [(None, 1), ("QueryBadFormed", 1)],
+            sorted(
+                ((point.attributes.get("error.type"), point.count) for point in duration.data.data_points),
+                key=lambda point: point[0] or "",
+            ),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,169 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import inspect
+import json
+import os
+import sys
+import threading
+import unittest
+import urllib.request
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+# prefer local copy to the one which is installed
+# hack from http://stackoverflow.com/a/6098238/280539
+_top_level_path = os.path.realpath(
+    os.path.abspath(
+        os.path.join(os.path.split(inspect.getfile(inspect.currentframe()))[0], "..")
+    )
+)
+if _top_level_path not in sys.path:
+    sys.path.insert(0, _top_level_path)
+# end of hack
+
+import SPARQLWrapper.Wrapper as _victim
+from SPARQLWrapper import JSON, POST, POSTDIRECTLY, SPARQLWrapper
+from SPARQLWrapper.SPARQLExceptions import QueryBadFormed
+from SPARQLWrapper.timing import QueryTiming, TimingHTTPHandler
+
+RESULTS = json.dumps(
+    {
+        "head": {"vars": ["s"]},
+        "results": {"bindings": [{"s": {"type": "uri", "value": "http://example.org/%d" % i}} for i in range(1000)]},
+    }
+).encode("utf-8")
+
+
+class EndpointHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def _reply(self):
+        if "bad" in self.path:
+            self.send_response(400)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/sparql-results+json")
+        self.send_header("Content-Length", str(len(RESULTS)))
+        self.end_headers()
+        self.wfile.write(RESULTS)
+
+    def do_GET(self):
+        self._reply()
+
+    def do_POST(self):
+        if self.headers.get("Transfer-Encoding") == "chunked":
+            while True:
+                size = int(self.rfile.readline().strip(), 16)
+                self.rfile.read(size + 2)
+                if not size:
+                    break
+        else:
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self._reply()
+
+
+class Timing_Test(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        urllib.request._opener = None
+        # other tests replace it with fakes
+        cls.urlopener = _victim.urlopener
+        _victim.urlopener = urllib.request.urlopen
+        cls.server = HTTPServer(("127.0.0.1", 0), EndpointHandler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        _victim.urlopener = cls.urlopener
+        urllib.request._opener = None
+
+    def setUp(self):
+        self.timings = []
+        self.sparql = SPARQLWrapper("http://localhost:%d/sparql" % self.server.server_port)
+        self.sparql.setReturnFormat(JSON)
+        self.sparql.setTimingHook(self.timings.append)
+
+    def testConvert(self):
+        result = self.sparql.query()
+        timing = result.timing
+        self.assertIsInstance(timing, QueryTiming)
+        self.assertEqual(
+            ("SELECT", "GET", JSON, 200),
+            (timing.queryType, timing.method, timing.requestedFormat, timing.status),
+        )
+        self.assertEqual(self.sparql.endpoint, timing.endpoint)
+        self.assertGreater(timing.requestBytes, len("query=SELECT"))
+        self.assertIsNotNone(timing.build)
+        self.assertIsNotNone(timing.ttfb)
+        self.assertIsNone(timing.dns)
+        self.assertEqual([], self.timings)
+
+        self.assertEqual(1000, len(result.convert()["results"]["bindings"]))
+        self.assertEqual([timing], self.timings)
+        self.assertEqual(len(RESULTS), timing.responseBytes)
+        self.assertGreater(timing.download, 0)
+        self.assertGreater(timing.convert, 0)
+        self.assertAlmostEqual(timing.build + timing.ttfb + timing.download + timing.convert, timing.total)
+        self.assertEqual(timing.total, timing.toDict()["total"])
+        json.dumps(timing.toDict())
+
+        # the record is exported once
+        result.response.read()
+        self.assertEqual(1, len(self.timings))
+
+    def testReadAndStream(self):
+        self.assertEqual(RESULTS, self.sparql.query().response.read())
+        self.assertEqual(len(RESULTS), self.timings[-1].responseBytes)
+        self.assertIsNone(self.timings[-1].convert)
+
+        self.assertEqual(1000, len(list(self.sparql.query().stream())))
+        self.assertEqual(2, len(self.timings))
+        self.assertEqual(len(RESULTS), self.timings[-1].responseBytes)
+
+        self.sparql.setSpoolThreshold(0)
+        result = self.sparql.query()
+        self.assertEqual(2, len(self.timings))
+        result.convert()
+        self.assertEqual(3, len(self.timings))
+        self.assertEqual(len(RESULTS), self.timings[-1].responseBytes)
+
+    def testStreamedUpdate(self):
+        self.sparql.setMethod(POST)
+        self.sparql.setRequestMethod(POSTDIRECTLY)
+        update = [b"INSERT DATA {\n"] + [b"<urn:s> <urn:p> <urn:o%d> .\n" % i for i in range(100)] + [b"}"]
+        self.sparql.setQuery(iter(update))
+        self.sparql.query().response.read()
+        self.assertEqual(("INSERT", "POST"), (self.timings[-1].queryType, self.timings[-1].method))
+        self.assertEqual(len(b"".join(update)), self.timings[-1].requestBytes)
+
+    def testError(self):
+        self.sparql.endpoint += "/bad"
+        self.assertRaises(QueryBadFormed, self.sparql.query)
+        self.assertEqual(400, self.timings[-1].status)
+        self.assertIsNotNone(self.timings[-1].ttfb)
+
+    def testDetailedTiming(self):
+        try:
+            self.sparql.setUseDetailedTiming()
+            self.sparql.setUseDetailedTiming()
+            self.assertEqual(
+                1, sum(isinstance(h, TimingHTTPHandler) for h in urllib.request._opener.handlers)
+            )
+            self.sparql.query().convert()
+        finally:
+            urllib.request._opener = None
+        timing = self.timings[-1]
+        self.assertIsNotNone(timing.dns)
+        self.assertIsNotNone(timing.connect)
+        self.assertIsNone(timing.tls)
+        self.assertLessEqual(timing.dns + timing.connect, timing.ttfb)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,9 @@
 #!/usr/bin/python
 # -*- coding: utf-8 -*-
 
+import copy
 import inspect
+import json
 import logging
 import os
 import sys
@@ -27,7 +29,7 @@ if _top_level_path not in sys.path:
 # end of hack
 
 import warnings
-from io import StringIO
+from io import BytesIO, StringIO
 
 # we don't want to let Wrapper do real web-requests. so, we are…
 # constructing a simple Mock!
@@ -37,8 +39,12 @@ warnings.simplefilter("always")
 
 import SPARQLWrapper.Wrapper as _victim
 from SPARQLWrapper import (
+    ASK,
     BASIC,
+    CONSTRUCT,
     CSV,
+    DELETE,
+    DESCRIBE,
     DIGEST,
     GET,
     INSERT,
@@ -57,13 +63,17 @@ from SPARQLWrapper import (
     SPARQLWrapper,
 )
 from SPARQLWrapper.Wrapper import (
+    CLEAR,
     EndPointInternalError,
     EndPointNotFound,
     QueryBadFormed,
     QueryResult,
     Unauthorized,
     URITooLong,
+    _JSONResultsReader,
+    _splitTurtle,
 )
+from test.helpers import FakeResponse
 
 
 class FakeResult(object):
@@ -129,6 +139,17 @@ class SPARQLWrapper_Test(unittest.TestCase):
         self.wrapper = SPARQLWrapper(endpoint="http://example.org/sparql")
         _victim.urlopener = urlopener
 
+    def testCopy(self):
+        self.wrapper.addParameter("key", "value")
+        clone = copy.copy(self.wrapper)
+        clone.addParameter("key", "other")
+        clone.addCustomHttpHeader("X-Test", "1")
+        clone.setQuery("INSERT DATA { <a:a> <a:b> <a:c> }")
+        self.assertEqual(["value"], self.wrapper.parameters["key"])
+        self.assertEqual({}, self.wrapper.customHttpHeaders)
+        self.assertEqual("SELECT", self.wrapper.queryType)
+        self.assertEqual("http://example.org/sparql", clone.updateEndpoint)
+
     def testConstructor(self):
         try:
             SPARQLWrapper()
@@ -348,6 +369,18 @@ class SPARQLWrapper_Test(unittest.TestCase):
         )
         self.assertEqual(SELECT, self.wrapper.queryType)
 
+        # keywords inside IRIs, prefixed names, literals and comments are ignored
+        for query, queryType in [
+            ("PREFIX select: <http://example.org/select#> ask {select:a ?p ?o}", ASK),
+            ("BASE <http://example.org/SELECT/> DESCRIBE <x>", DESCRIBE),
+            ("PREFIX : <http://example.org/> CONSTRUCT {:a :b 'SELECT'} WHERE {}", CONSTRUCT),
+            ('PREFIX p: <http://example.org/> # SELECT\n DELETE DATA {p:a p:b """\nASK"""}', DELETE),
+            ("WITH <http://example.org/ask> DELETE {?s ?p ?o} WHERE {?s ?p ?o}", DELETE),
+            ("PREFIX prefix: <http://example.org/> CLEAR GRAPH prefix:select", CLEAR),
+        ]:
+            self.wrapper.setQuery(query)
+            self.assertEqual(queryType, self.wrapper.queryType, query)
+
         with warnings.catch_warnings(record=True) as w:
             self.wrapper.setQuery("UNKNOWN {e:a e:b e:c}")
             self.assertEqual(
@@ -392,6 +425,34 @@ class SPARQLWrapper_Test(unittest.TestCase):
         except TypeError:
             self.assertTrue(True)
 
+    def testSetQueryStream(self):
+        triples = ['<urn:s> <urn:p> "これは%d" .\n' % i for i in range(10000)]
+        update = "INSERT DATA {\n%s}" % "".join(triples)
+
+        self.wrapper.setRequestMethod(POSTDIRECTLY)
+        self.wrapper.setQuery(iter(["INSERT DATA {\n"] + triples + ["}"]))
+        self.assertEqual(INSERT, self.wrapper.queryType)
+        self.assertTrue(update.startswith(self.wrapper.queryString))
+        request = self._get_request(self.wrapper)
+        self.assertEqual("application/sparql-update", request.get_header("Content-type"))
+        self.assertEqual(update.encode("utf-8"), b"".join(request.data))
+        self.assertRaises(ValueError, self.wrapper.query)
+
+        for data in [BytesIO(update.encode("utf-8")), StringIO(update)]:
+            self.wrapper.setQuery(data)
+            self.assertEqual(INSERT, self.wrapper.queryType)
+            self.assertEqual(update.encode("utf-8"), b"".join(self._get_request(self.wrapper).data))
+
+        self.wrapper.setQuery(BytesIO(b"SELECT * WHERE { ?s ?p ?o }"))
+        self.assertEqual(SELECT, self.wrapper.queryType)
+        self.assertRaises(ValueError, self.wrapper.query)
+        self.wrapper.setMethod(POST)
+        self.assertEqual(b"SELECT * WHERE { ?s ?p ?o }", b"".join(self._get_request(self.wrapper).data))
+
+        self.wrapper.setRequestMethod(URLENCODED)
+        self.wrapper.setQuery(BytesIO(update.encode("utf-8")))
+        self.assertRaises(ValueError, self.wrapper.query)
+
     def testSetTimeout(self):
         self.wrapper.setTimeout(10)
         self.assertEqual(10, self.wrapper.timeout)
@@ -415,6 +476,46 @@ class SPARQLWrapper_Test(unittest.TestCase):
 
         self.assertFalse(self.wrapper.clearParameter("param1"), "already cleaned")
 
+    def testEncodedParametersCache(self):
+        self.wrapper.addParameter("update", "ignored")
+        self.wrapper.addParameter("a", "b c")
+        self.wrapper.setQuery("SELECT * WHERE {?s ?p ?o}")
+        self.assertEqual(
+            "update=ignored&a=b+c&query=SELECT+%2A+WHERE+%7B%3Fs+%3Fp+%3Fo%7D"
+            "&format=xml&output=xml&results=xml",
+            self.wrapper._getRequestEncodedParameters(
+                ("query", self.wrapper.queryString)
+            ),
+        )
+        self.assertEqual(
+            "update=u&a=b+c&format=xml&output=xml&results=xml",
+            self.wrapper._getRequestEncodedParameters(("update", "u")),
+        )
+
+        self.wrapper.setReturnFormat(TSV)
+        self.wrapper.clearParameter("update")
+        self.assertEqual(
+            "a=b+c&query=q&format=tsv&format=text/tab-separated-values"
+            "&output=tsv&output=text/tab-separated-values"
+            "&results=tsv&results=text/tab-separated-values",
+            self.wrapper._getRequestEncodedParameters(("query", "q")),
+        )
+
+        self.wrapper.setOnlyConneg(True)
+        self.wrapper.addParameter("a", "d")
+        self.assertEqual("a=b+c&a=d", self.wrapper._getRequestEncodedParameters())
+
+        # the dictionary can be changed directly too
+        self.wrapper.parameters["foo"] = ["bar"]
+        self.assertEqual("a=b+c&a=d&foo=bar", self.wrapper._getRequestEncodedParameters())
+        self.wrapper.parameters["a"].append("e")
+        self.assertEqual("a=b+c&a=d&a=e&foo=bar", self.wrapper._getRequestEncodedParameters())
+        self.wrapper.parameters = {}
+        self.assertEqual("", self.wrapper._getRequestEncodedParameters())
+
+        self.wrapper.resetQuery()
+        self.assertEqual("", self.wrapper._getRequestEncodedParameters())
+
     def testSetMethod(self):
         self.wrapper.setMethod(POST)
         request = self._get_request(self.wrapper)
@@ -577,6 +678,21 @@ class SPARQLWrapper_Test(unittest.TestCase):
         except:
             self.fail("got wrong exception")
 
+    def testQueryOverride(self):
+        class OverridingWrapper(SPARQLWrapper):
+            def _query(self, timing=None):
+                response, returnFormat = super(OverridingWrapper, self)._query(timing)
+                response.overridden = True
+                return response, returnFormat
+
+        wrapper = OverridingWrapper("http://example.org/sparql")
+        wrapper.setQuery("SELECT * WHERE { ?s ?p ?o }")
+        qr = wrapper.query()
+        self.assertTrue(qr.response.overridden)
+        self.assertIs(qr.request, qr.response.request)
+        self.assertEqual("GET", qr.timing.method)
+        self.assertIsNotNone(qr.timing.build)
+
     def testQueryEncoding(self):
         query = 'INSERT DATA { <urn:michel> <urn:says> "é" }'
 
@@ -901,6 +1017,345 @@ class QueryResult_Test(unittest.TestCase):
         self.assertEqual(1, _mime_vs_type("application/rdf+xml", JSON))  # Warning
         self.assertEqual(1, _mime_vs_type("application/rdf+xml", N3))  # Warning
 
+    def testStreamJSON(self):
+        results = {
+            "head": {"vars": ["s"]},
+            "results": {
+                "bindings": [
+                    {"s": {"type": "literal", "value": "\u00e9 %d ]}" % i}}
+                    for i in range(50)
+                ]
+            },
+        }
+        content = json.dumps(results, ensure_ascii=False).encode("utf-8")
+        for chunkSize in [1, 3, 64, 65536]:
+            reader = _JSONResultsReader(BytesIO(content), chunkSize).start()
+            self.assertEqual(results["head"], reader.head)
+            self.assertEqual(results["results"]["bindings"], list(reader))
+
+        # the head is sent after the results
+        content = b'{"results": {"bindings": [{}]}, "head": {"vars": []}}'
+        reader = _JSONResultsReader(BytesIO(content), 4).start()
+        self.assertEqual([{}], list(reader))
+        self.assertEqual({"vars": []}, reader.head)
+        content = json.dumps(dict(reversed(list(results.items())))).encode("utf-8")
+        for chunkSize in [1, 64]:
+            reader = _JSONResultsReader(BytesIO(content), chunkSize).start()
+            self.assertEqual(results["head"], reader.head)
+            self.assertEqual(results["results"]["bindings"], list(reader))
+
+        reader = _JSONResultsReader(BytesIO(b'{"head": {}, "boolean": true}')).start()
+        self.assertEqual([], list(reader))
+        self.assertTrue(reader.boolean)
+
+        reader = _JSONResultsReader(BytesIO(b'{"head": {}, "results": {"bindings": [{}'))
+        self.assertRaises(ValueError, list, reader)
+
+    def testStreamTriples(self):
+        from rdflib import BNode, Graph, Literal, URIRef
+
+        content = b"".join(
+            b'_:b%d <http://example.org/p> "%d" .\n' % (i % 3, i) for i in range(10)
+        )
+        qr = QueryResult((FakeResponse(content, "application/n-triples"), N3))
+        triples = list(qr._streamNTriples(chunkLines=4))
+        self.assertEqual(10, len(triples))
+        # the blank nodes with the same label are the same across the chunks
+        self.assertEqual(3, len(set(s for s, _, _ in triples)))
+        self.assertEqual(triples[0][0], triples[9][0])
+        self.assertEqual(Literal("9"), triples[9][2])
+
+        content = """@prefix ex: <http://example.org/> .
+ex:a ex:p "a . b", '''long
+ . string''' ; ex:q _:x .
+PREFIX dc: <http://purl.org/dc/terms/>
+_:x dc:title "t\\"."@en ; ex:r [ ex:s 1.5 ] . # comment .
+ex:c ex:p ( 1 2 ), <http://example.org/c.d> .
+""".encode("utf-8")
+        expected = Graph().parse(data=content, format="turtle")
+        for chunkSize, readSize in [(1, 1), (1, 7), (50, 3), (2**20, 65536)]:
+            chunks = list(_splitTurtle(BytesIO(content), chunkSize, readSize))
+            self.assertEqual(2 if chunkSize == 2**20 else 3, len(chunks))
+            graph = Graph()
+            for prologue, chunk in chunks:
+                graph.parse(data=prologue + chunk, format="turtle")
+            self.assertEqual(len(expected), len(graph))
+
+        qr = QueryResult((FakeResponse(content, "text/turtle"), TURTLE))
+        triples = list(qr.stream())
+        self.assertEqual(len(expected), len(triples))
+        x = [s for s, p, _ in triples if p == URIRef("http://purl.org/dc/terms/title")][0]
+        self.assertIsInstance(x, BNode)
+        self.assertIn((URIRef("http://example.org/a"), URIRef("http://example.org/q"), x), triples)
+        self.assertIn((URIRef("http://example.org/a"), URIRef("http://example.org/p"), Literal("long\n . string")), triples)
+
+        qr = QueryResult((FakeResponse(b"<http://example.org/a> <http://example.org/p> .", "text/turtle"), TURTLE))
+        self.assertRaises(Exception, list, qr.stream())
+
+    def testSplitTurtleLongStatement(self):
+        from rdflib import Graph, Literal
+
+        # literals much longer than the reads, cut anywhere (in escape sequences, in quotes which do not close them)
+        value = 'a "b" ""c\\\\ d.\n' * 2000
+        escaped = value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        content = (
+            '<http://example.org/a> <http://example.org/p> """%s""", "%s", <http://example.org/%s> .\n'
+            % (value.replace("\\", "\\\\"), escaped, "x" * 5000)
+        ).encode("utf-8")
+        for readSize in [1, 2, 3, 5, 64]:
+            chunks = list(_splitTurtle(BytesIO(content), 2**20, readSize))
+            self.assertEqual(1, len(chunks))
+            graph = Graph().parse(data=chunks[0][1], format="turtle")
+            # both literals have the same value
+            self.assertEqual(2, len(graph))
+            self.assertEqual({Literal(value)}, set(o for o in graph.objects() if isinstance(o, Literal)))
+
+        # "<" not starting an IRI
+        content = (
+            b"{ <http://example.org/a> <http://example.org/p> 1 } "
+            b"<= { <http://example.org/b> <http://example.org/p> 1 } ."
+        )
+        chunks = list(_splitTurtle(BytesIO(content), 1, 4))
+        self.assertEqual([("", content.decode("utf-8"))], chunks)
+
+    def testConvertIntoGraph(self):
+        from rdflib import Dataset, Graph, Literal, URIRef
+
+        ex = "http://example.org/"
+        existing = (URIRef(ex + "s"), URIRef(ex + "p"), Literal("existing"))
+        nt = b"".join(b'<http://example.org/s> <http://example.org/p> "%d" .\n' % i for i in range(5))
+        ttl = b'@prefix ex: <http://example.org/> .\nex:s ex:p "0", "1" .'
+        rdfxml = (
+            b'<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#" xmlns:ex="http://example.org/">'
+            b'<rdf:Description rdf:about="http://example.org/s"><ex:p>0</ex:p></rdf:Description></rdf:RDF>'
+        )
+        for content, content_type, format, count in [
+            (nt, "application/n-triples", N3, 5),
+            (ttl, "text/turtle", TURTLE, 2),
+            (rdfxml, "application/rdf+xml", RDFXML, 1),
+        ]:
+            graph = Graph()
+            graph.add(existing)
+            qr = QueryResult((FakeResponse(content, content_type), format))
+            self.assertIs(graph, qr.convert(graph=graph))
+            self.assertEqual(count + 1, len(graph))
+            self.assertIn((URIRef(ex + "s"), URIRef(ex + "p"), Literal("0")), graph)
+
+        # the blank nodes of two results are different, even with the same labels
+        for content, content_type, format in [
+            (b"_:b0 <http://example.org/p> _:b1 .", "application/n-triples", N3),
+            (b"_:b0 <http://example.org/p> _:b1 .", "text/turtle", TURTLE),
+        ]:
+            graph = Graph()
+            for i in range(2):
+                QueryResult((FakeResponse(content, content_type), format)).convert(graph=graph)
+            self.assertEqual(2, len(graph))
+            self.assertEqual(4, len(set(graph.subjects()) | set(graph.objects())))
+
+        dataset = Dataset()
+        qr = QueryResult((FakeResponse(nt, "application/n-triples"), N3))
+        qr._loadTriples(dataset, batchSize=2)
+        self.assertEqual(5, len(dataset.default_context))
+
+        qr = QueryResult((FakeResponse(b"{}", "application/sparql-results+json"), JSON))
+        self.assertRaises(ValueError, qr.convert, graph=Graph())
+
+    def testContentType(self):
+        class FakeResponse(object):
+            def __init__(self, content_type):
+                self.content_type = content_type
+                self.calls = 0
+
+            def info(self):
+                self.calls += 1
+                return {"Content-Type": self.content_type}
+
+        response = FakeResponse('Application/SPARQL-Results+JSON; charset="utf-8"')
+        qr = QueryResult((response, JSON))
+        self.assertEqual(
+            (
+                'Application/SPARQL-Results+JSON; charset="utf-8"',
+                "application/sparql-results+json",
+                {"charset": "utf-8"},
+            ),
+            qr._getContentType(),
+        )
+        self.assertEqual(JSON, qr._get_responseFormat())
+        self.assertEqual(1, response.calls)
+
+        # not an exact media type, found as a substring as before
+        qr = QueryResult((FakeResponse("text/turtle-ish"), TURTLE))
+        self.assertEqual(TURTLE, qr._get_responseFormat())
+
+        qr = QueryResult((FakeResponse("application/unknown"), JSON))
+        with warnings.catch_warnings(record=True) as w:
+            self.assertEqual("application/unknown", qr._get_responseFormat())
+            self.assertEqual(1, len(w))
+
+    def testRegisterConverter(self):
+        class UpperQueryResult(QueryResult):
+            pass
+
+        UpperQueryResult.registerConverter(
+            ["text/csv", "text/x-upper"],
+            CSV,
+            lambda result: result.response.read().upper(),
+            lambda result: iter(result.response.read().upper().splitlines()),
+        )
+
+        qr = UpperQueryResult((FakeResponse(b"a\nb", "text/x-upper"), CSV))
+        self.assertEqual(CSV, qr._get_responseFormat())
+        self.assertEqual(b"A\nB", qr.convert())
+        qr = UpperQueryResult((FakeResponse(b"a\nb", "text/csv"), CSV))
+        self.assertEqual([b"A", b"B"], list(qr.stream()))
+        # the parent class is not affected
+        qr = QueryResult((FakeResponse(b"a\nb", "text/csv"), CSV))
+        self.assertEqual(b"a\nb", qr.convert())
+        qr = QueryResult((FakeResponse(b"a\nb", "text/csv"), CSV))
+        self.assertRaises(ValueError, qr.stream)
+
+        content = json.dumps(
+            {"head": {"vars": ["s"]}, "results": {"bindings": [{}, {}]}}
+        ).encode("utf-8")
+        qr = QueryResult((FakeResponse(content, "application/json"), JSON))
+        reader = qr.stream()
+        self.assertEqual({"vars": ["s"]}, reader.head)
+        self.assertEqual([{}, {}], list(reader))
+
+        _oldUrlopener = _victim.urlopener
+        try:
+            _victim.urlopener = lambda request: FakeResponse(b"a", "text/csv")
+            wrapper = SPARQLWrapper(endpoint="http://example.org/sparql")
+            wrapper.setReturnFormat(CSV)
+            wrapper.setResultFactory(UpperQueryResult)
+            self.assertEqual(b"A", wrapper.queryAndConvert())
+            wrapper.setResultFactory(None)
+            self.assertEqual(b"a", wrapper.queryAndConvert())
+        finally:
+            _victim.urlopener = _oldUrlopener
+
+    def testXMLResultTypes(self):
+        contentType = "application/sparql-results+xml"
+        content = b"""<?xml version="1.0"?>
+<sparql xmlns="http://www.w3.org/2005/sparql-results#">
+  <head><variable name="s"/><variable name="o"/><link href="meta.rdf"/></head>
+  <results>
+    <result>
+      <binding name="s"><uri>http://example.org/a</uri></binding>
+      <binding name="o"><literal xml:lang="en">a</literal></binding>
+    </result>
+    <result>
+      <binding name="s"><bnode>b0</bnode></binding>
+      <binding name="o"><literal datatype="http://www.w3.org/2001/XMLSchema#integer">1</literal></binding>
+    </result>
+    <result/>
+  </results>
+</sparql>"""
+        expected = {
+            "head": {"vars": ["s", "o"], "link": ["meta.rdf"]},
+            "results": {
+                "bindings": [
+                    {
+                        "s": {"type": "uri", "value": "http://example.org/a"},
+                        "o": {"type": "literal", "xml:lang": "en", "value": "a"},
+                    },
+                    {
+                        "s": {"type": "bnode", "value": "b0"},
+                        "o": {
+                            "type": "literal",
+                            "datatype": "http://www.w3.org/2001/XMLSchema#integer",
+                            "value": "1",
+                        },
+                    },
+                    {},
+                ]
+            },
+        }
+        ask = b"""<sparql xmlns="http://www.w3.org/2005/sparql-results#">
+  <head/><boolean>true</boolean></sparql>"""
+
+        import xml.etree.ElementTree
+
+        _oldGetElementTree = _victim._getElementTree
+        try:
+            for getElementTree in [_oldGetElementTree, lambda: xml.etree.ElementTree]:
+                _victim._getElementTree = getElementTree
+
+                qr = QueryResult((FakeResponse(content, contentType), XML))
+                self.assertEqual("sparql", qr.convert().documentElement.tagName)
+
+                qr = QueryResult((FakeResponse(content, contentType), XML))
+                qr.xmlResultType = _victim.ELEMENTTREE
+                self.assertEqual(3, len(qr.convert().getroot()[1]))
+
+                qr = QueryResult((FakeResponse(content, contentType), XML))
+                qr.xmlResultType = _victim.BINDINGS
+                self.assertEqual(expected, qr.convert())
+
+                reader = QueryResult((FakeResponse(content, contentType), XML)).stream()
+                self.assertEqual(expected["head"], reader.head)
+                self.assertEqual(expected["results"]["bindings"], list(reader))
+
+                qr = QueryResult((FakeResponse(ask, contentType), XML))
+                qr.xmlResultType = _victim.BINDINGS
+                self.assertEqual({"head": {"vars": []}, "boolean": True}, qr.convert())
+        finally:
+            _victim._getElementTree = _oldGetElementTree
+
+        wrapper = SPARQLWrapper(endpoint="http://example.org/sparql")
+        self.assertRaises(ValueError, wrapper.setXMLResultType, "sax")
+        wrapper.setXMLResultType(_victim.BINDINGS)
+        self.assertEqual(_victim.BINDINGS, wrapper.xmlResultType)
+
+    def testJSONLoads(self):
+        content = '{"head": {"vars": ["s"]}, "boolean": true, "n": 1.5, "\u00e9": "\u00e9"}'
+        expected = json.loads(content)
+        _oldJSONLoader = _victim._jsonLoader
+        try:
+            for loader in [_victim._findJSONLoader(), json.loads]:
+                _victim._jsonLoader = loader
+                self.assertEqual(expected, _victim._jsonLoads(content.encode("utf-8")))
+                self.assertEqual(expected, _victim._jsonLoads(memoryview(content.encode("utf-8"))))
+                self.assertRaises(ValueError, _victim._jsonLoads, b"{")
+                self.assertRaises(ValueError, _victim._jsonLoads, memoryview(b"{"))
+        finally:
+            _victim._jsonLoader = _oldJSONLoader
+
+    def testSpool(self):
+        content = json.dumps({"head": {"vars": []}, "boolean": True}).encode("utf-8")
+        for threshold in [0, len(content), 1024]:
+            qr = QueryResult((FakeResponse(content), JSON))
+            qr.spool(threshold)
+            self.assertEqual(b"", qr.response.read())
+            self.assertEqual(json.loads(content), qr.convert())
+            self.assertEqual(json.loads(content), qr.convert())
+            self.assertEqual([content], list(qr))
+
+        # the spooled body is given to the JSON loader without copying it
+        loaded = []
+        _oldJSONLoader = _victim._jsonLoader
+        try:
+            _victim._jsonLoader = lambda data: loaded.append(data) or json.loads(bytes(data))
+            for threshold in [0, 1024]:
+                qr = QueryResult((FakeResponse(content), JSON))
+                qr.spool(threshold)
+                self.assertEqual(json.loads(content), qr.convert())
+                self.assertIsInstance(loaded.pop(), memoryview)
+        finally:
+            _victim._jsonLoader = _oldJSONLoader
+
+        _oldUrlopener = _victim.urlopener
+        try:
+            _victim.urlopener = lambda request: FakeResponse(content)
+            wrapper = SPARQLWrapper(endpoint="http://example.org/sparql")
+            wrapper.setReturnFormat(JSON)
+            wrapper.setSpoolThreshold(0)
+            qr = wrapper.query()
+            self.assertIsNotNone(qr._spool)
+            self.assertEqual(qr.convert(), qr.convert())
+        finally:
+            _victim.urlopener = _oldUrlopener
+
     def testPrint_results(self):
         """
         print_results() is only allowed for JSON return format.